@@ -0,0 +1,60 @@
+
+# Micro-benchmark biaya pemanggilan fungsi ICE (return, getter, method).
+# Jalankan dari root repo:  python -m benchmarks.call_overhead [--engine tree] [-n 5]
+import argparse, time
+from ice_lang.cache import compile_source
+from ice_lang.cli import ENGINES
+
+PROGRAMS = {
+    "fib(20)": """
+tugas fib(n) { jika (n < 2) { kembalikan n; } kembalikan fib(n - 1) + fib(n - 2); }
+bilangan hasil = fib(20);
+""",
+    "return-awal x50k": """
+tugas tanda(x) {
+    jika (x < 0) { kembalikan -1; }
+    jikalau (x == 0) { kembalikan 0; }
+    kembalikan 1;
+}
+bilangan hasil = 0;
+untuk i dalam rentang(-25000, 25000) { hasil = hasil + tanda(i); }
+""",
+    "getter x20k": """
+kelas Kotak {
+    tugas __init__(v) { ini._v = v; }
+    properti v { get { kembalikan ini._v; } }
+    tugas dua() { kembalikan ini.v * 2; }
+}
+teks k = Kotak(3);
+bilangan hasil = 0;
+untuk i dalam rentang(20000) { hasil = hasil + k.dua(); }
+""",
+    "method-warisan x50k": """
+kelas Dasar { tugas __init__() { ini.n = 0; } tugas naik(d) { ini.n = ini.n + d; } }
+kelas Tengah : Dasar { }
+kelas Anak : Tengah { }
+bilangan o = baru Anak();
+untuk i dalam rentang(50000) { o.naik(1); }
+""",
+}
+
+def run_once(engine: str, source: str) -> float:
+    program = compile_source(source)
+    interp = ENGINES[engine]()
+    t0 = time.perf_counter()
+    interp.interpret(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="Micro-benchmark overhead pemanggilan ICE")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("-n", "--repeat", type=int, default=5, help="jumlah pengulangan (diambil minimum)")
+    args = ap.parse_args()
+    for engine in args.engine or sorted(ENGINES):
+        for name, source in PROGRAMS.items():
+            best = min(run_once(engine, source) for _ in range(args.repeat))
+            print(f"{engine:<8} {name:<18} {best * 1000:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
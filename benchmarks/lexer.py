@@ -0,0 +1,80 @@
+
+# Konformansi dan throughput FastLexer vs Lexer klasik.
+# Jalankan dari root repo:  python -m benchmarks.lexer [--lines 50000]
+# Token FastLexer harus identik (tipe, lexeme, literal, baris, kolom) dengan
+# Lexer pada seluruh korpus, termasuk pesan galat sintaks.
+import argparse, time
+from pathlib import Path
+from ice_lang.lexer import Lexer, FastLexer
+from ice_lang.errors import IceSyntaxError
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "ice_lang" / "examples"
+
+SNIPPETS = [
+    "",
+    "\n\n\n",
+    "// hanya komentar",
+    "bilangan x = 10; desimal y = 3.14; teks t = \"halo\";",
+    "a==b!=c>=d<=e>f<g=h!i",
+    "1.2.3 12. .5 007",
+    "\"tab\\tbaris\\nkutip\\\"miring\\\\ lain\\q\"",
+    "\"string\nbanyak\nbaris\" sesudah",
+    "\t\r x  \t y\r\n z",
+    "_privat __protected nama_1 kelasKu ÄÖü café",
+    "kelas A : B { properti p { get { kembalikan ini._p; } set(v) { ini._p = v; } } }",
+    "untuk i dalam rentang(0, 10, 2) { selagi (bukan salah atau kosong) { } }",
+    "x = 1; // komentar\n// lagi\ny = 2;",
+    "\"tidak tertutup",
+    "a = 3 / 2;",
+    "a # b",
+    "bilangan xs = [1, [2, 3], {\"k\": 4}]; xs[1][0] = xs[2][\"k\"];",
+]
+
+def _tokens(lexer_cls, source: str):
+    try:
+        return [(t.type, t.lexeme, type(t.literal), t.literal, t.line, t.column)
+                for t in lexer_cls(source).scan_tokens()]
+    except IceSyntaxError as e:
+        return ("galat", str(e))
+
+def synthetic(lines: int) -> str:
+    out = []
+    for i in range(lines):
+        out.append(f"tugas f{i}(a, b) {{ desimal c = a * {i}.5 + b; "
+                   f"jika (c >= 10 dan bukan salah) {{ kembalikan \"nilai\\t\" + c; }} "
+                   f"kembalikan c % 7; }} // fungsi ke-{i}")
+    return "\n".join(out) + "\n"
+
+def check_conformance(corpus) -> int:
+    failures = 0
+    for name, source in corpus:
+        if _tokens(Lexer, source) != _tokens(FastLexer, source):
+            print(f"BEDA: {name}")
+            failures += 1
+    return failures
+
+def main():
+    ap = argparse.ArgumentParser(description="Konformansi & benchmark lexer")
+    ap.add_argument("--lines", type=int, default=50000, help="jumlah baris sumber sintetis")
+    args = ap.parse_args()
+
+    corpus = [(p.name, p.read_text(encoding="utf-8")) for p in sorted(EXAMPLES.glob("*.ice"))]
+    corpus += [(f"snippet-{i}", s) for i, s in enumerate(SNIPPETS)]
+    corpus.append(("sintetis-200", synthetic(200)))
+    failures = check_conformance(corpus)
+    print(f"konformansi: {len(corpus) - failures}/{len(corpus)} identik")
+
+    source = synthetic(args.lines)
+    print(f"sumber sintetis: {len(source) / 1e6:.1f} MB, {args.lines} baris")
+    for name, run in [
+        ("Lexer.scan_tokens", lambda: Lexer(source).scan_tokens()),
+        ("FastLexer.scan_tokens", lambda: FastLexer(source).scan_tokens()),
+        ("FastLexer.iter_tokens", lambda: sum(1 for _ in FastLexer(source).iter_tokens())),
+    ]:
+        t0 = time.perf_counter()
+        run()
+        print(f"  {name:<24} {time.perf_counter() - t0:7.3f} s")
+    raise SystemExit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+
+# Benchmark loop 'untuk ... dalam rentang' bersarang, sebelum/sesudah jalur cepat.
+# Jalankan dari root repo:  python -m benchmarks.loops [--engine vm] [-n 3] [--size 300]
+# "sebelum" memakai Resolver(elide_scopes=False): setiap iterasi membuat
+# Environment baru untuk badan loop, seperti sebelum jalur cepat ada.
+import argparse, time
+from ice_lang.lexer import FastLexer
+from ice_lang.parser import Parser
+from ice_lang.resolver import Resolver
+from ice_lang.cli import ENGINES
+
+PROGRAMS = {
+    "tanpa-deklarasi": """
+bilangan s = 0;
+untuk i dalam rentang({n}) {{ untuk j dalam rentang({n}) {{ s = s + i * j; }} }}
+""",
+    "dengan-deklarasi": """
+bilangan s = 0;
+untuk i dalam rentang({n}) {{ untuk j dalam rentang({n}) {{ bilangan t = i * j; s = s + t; }} }}
+""",
+    "dalam-fungsi": """
+tugas jumlah(n) {{
+    bilangan s = 0;
+    untuk i dalam rentang(n) {{ untuk j dalam rentang(n) {{ jika (j % 2 == 0) {{ s = s + i; }} }} }}
+    kembalikan s;
+}}
+bilangan hasil = jumlah({n});
+""",
+}
+
+def run_once(engine: str, source: str, elide: bool) -> float:
+    program = Resolver(elide_scopes=elide).resolve(Parser(FastLexer(source).iter_tokens()).parse())
+    interp = ENGINES[engine]()
+    t0 = time.perf_counter()
+    interp.interpret(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark loop bersarang ICE")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("-n", "--repeat", type=int, default=3, help="jumlah pengulangan (diambil minimum)")
+    ap.add_argument("--size", type=int, default=300, help="panjang tiap loop (iterasi = size^2)")
+    args = ap.parse_args()
+    for engine in args.engine or sorted(ENGINES):
+        for name, template in PROGRAMS.items():
+            source = template.format(n=args.size)
+            before = min(run_once(engine, source, False) for _ in range(args.repeat))
+            after = min(run_once(engine, source, True) for _ in range(args.repeat))
+            print(f"{engine:<8} {name:<18} sebelum {before * 1000:8.1f} ms  "
+                  f"sesudah {after * 1000:8.1f} ms  ({before / after:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+
+# Memori per node AST/Token: representasi __slots__ sekarang vs dataclass
+# biasa (dengan __dict__ per instance) seperti sebelumnya.
+# Jalankan dari root repo:  python -m benchmarks.memory [--lines 20000]
+# Kedua varian dibangun dengan menyalin pohon yang sama, jadi list/tuple/str
+# yang dipakai bersama terhitung sama di keduanya.
+import argparse, gc, tracemalloc
+from dataclasses import fields, is_dataclass, make_dataclass
+from ice_lang.lexer import FastLexer
+from ice_lang.parser import Parser
+from ice_lang.resolver import Resolver
+from benchmarks.lexer import synthetic
+
+_DICT_CLASSES: dict[type, type] = {}
+
+def _dict_class(cls: type) -> type:
+    # kembaran cls tanpa slots: dataclass biasa dengan field yang sama
+    mirror = _DICT_CLASSES.get(cls)
+    if mirror is None:
+        mirror = make_dataclass(cls.__name__, [f.name for f in fields(cls)])
+        _DICT_CLASSES[cls] = mirror
+    return mirror
+
+def copy_tree(obj, with_slots: bool, counter: list):
+    if is_dataclass(obj) and not isinstance(obj, type):
+        counter[0] += 1
+        cls = type(obj) if with_slots else _dict_class(type(obj))
+        return cls(*[copy_tree(getattr(obj, f.name), with_slots, counter) for f in fields(obj)])
+    if isinstance(obj, list):
+        return [copy_tree(x, with_slots, counter) for x in obj]
+    if isinstance(obj, tuple):
+        return tuple(copy_tree(x, with_slots, counter) for x in obj)
+    return obj
+
+def measure(tree, with_slots: bool) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    counter = [0]
+    copy = copy_tree(tree, with_slots, counter)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copy
+    return counter[0], size
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark memori AST/Token")
+    ap.add_argument("--lines", type=int, default=20000, help="jumlah baris sumber sintetis")
+    args = ap.parse_args()
+
+    source = synthetic(args.lines)
+    tokens = FastLexer(source).scan_tokens()
+    program = Resolver().resolve(Parser(iter(tokens)).parse())
+    print(f"sumber sintetis: {args.lines} baris, {len(tokens)} token")
+    for label, tree in [("token", tokens), ("AST", program)]:
+        n, before = measure(tree, False)
+        _, after = measure(tree, True)
+        print(f"  {label:<6} {n:>9} node  sebelum {before / n:6.1f} B/node  "
+              f"sesudah {after / n:6.1f} B/node  ({100 * (1 - after / before):.0f}% lebih kecil)")
+
+if __name__ == "__main__":
+    main()
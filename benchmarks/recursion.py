@@ -0,0 +1,90 @@
+
+# Benchmark rekursi dalam: engine vm menumpuk frame ICE di list (tumpukan
+# eksplisit) sehingga kedalamannya dibatasi memori, sedangkan tree/closure
+# memakai rekursi Python dan berhenti di sekitar 100 panggilan (DepthLimitError).
+# Jalankan dari root repo:
+#   python -m benchmarks.recursion                          # kedalaman 100000 dan 300000
+#   python -m benchmarks.recursion --depth 1000000 --engine vm
+# Baris "dangkal" membandingkan biaya per panggilan di kedalaman yang masih bisa
+# dijalankan semua engine. Panggilan ekor dimatikan agar "genap-ganjil" tetap
+# menumpuk frame (lihat benchmarks/tailcall.py untuk versi ekornya).
+import argparse, time
+from ice_lang.cache import compile_source
+from ice_lang.cli import ENGINES
+from ice_lang.errors import IceRuntimeError
+
+PROGRAMS = {
+    # satu panggilan per tingkat
+    "jumlah": """
+tugas jumlah(n) {{ jika (n < 1) {{ kembalikan 0; }} kembalikan n + jumlah(n - 1); }}
+bilangan hasil = jumlah({n});
+""",
+    # rekursi bersama
+    "genap-ganjil": """
+tugas genap(n) {{ jika (n == 0) {{ kembalikan benar; }} kembalikan ganjil(n - 1); }}
+tugas ganjil(n) {{ jika (n == 0) {{ kembalikan salah; }} kembalikan genap(n - 1); }}
+bilangan hasil = genap({n});
+""",
+    # konstruktor membuat rantai simpul, lalu getter menjumlahkannya secara rekursif
+    "simpul": """
+kelas Simpul {{
+    tugas __init__(n) {{
+        ini.n = n;
+        jika (n > 0) {{ ini.berikut = baru Simpul(n - 1); }} kalau {{ ini.berikut = 0; }}
+    }}
+    properti total {{
+        get {{ jika (ini.n < 1) {{ kembalikan 0; }} kembalikan ini.n + ini.berikut.total; }}
+    }}
+}}
+bilangan hasil = baru Simpul({n}).total;
+""",
+    # ekspresi '+' sepanjang n (kode hasil generator)
+    "rantai-plus": "bilangan hasil = {chain};\n",
+}
+
+SHALLOW = 80
+
+def source_for(name: str, n: int) -> str:
+    template = PROGRAMS[name]
+    if name == "rantai-plus":
+        return template.format(chain=" + ".join(["1"] * n))
+    return template.format(n=n)
+
+def run_once(engine: str, source: str) -> tuple[float, str | None]:
+    # waktu eksekusi saja; kompilasi (termasuk rantai '+') di luar pengukuran
+    try:
+        program = compile_source(source, tail_calls=False)
+    except RecursionError as e:
+        return 0.0, f"{type(e).__name__} (kompilasi)"
+    interp = ENGINES[engine]()
+    t0 = time.perf_counter()
+    try:
+        interp.interpret(program)
+    except IceRuntimeError as e:
+        return time.perf_counter() - t0, type(e).__name__
+    return time.perf_counter() - t0, None
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark rekursi dalam ICE")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("--depth", action="append", type=int,
+                    help="kedalaman rekursi (boleh berulang; default: 100000 dan 300000)")
+    ap.add_argument("-n", "--repeat", type=int, default=1, help="jumlah pengulangan (diambil minimum)")
+    args = ap.parse_args()
+    depths = [SHALLOW] + (args.depth or [100_000, 300_000])
+    print(f"{'engine':<8} {'program':<14} {'kedalaman':>10} {'waktu':>11} {'per tingkat':>12}")
+    for engine in args.engine or sorted(ENGINES):
+        for name in PROGRAMS:
+            for n in depths:
+                source = source_for(name, n)
+                runs = [run_once(engine, source) for _ in range(max(args.repeat, 20) if n == SHALLOW else args.repeat)]
+                elapsed, error = min(runs)
+                label = "dangkal" if n == SHALLOW else f"{n}"
+                if error is not None:
+                    print(f"{engine:<8} {name:<14} {label:>10}      gagal: {error}")
+                    continue
+                print(f"{engine:<8} {name:<14} {label:>10} {elapsed * 1000:9.1f}ms {elapsed / n * 1e6:9.2f} µs")
+
+if __name__ == "__main__":
+    main()
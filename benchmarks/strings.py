@@ -0,0 +1,52 @@
+
+# Membangun teks besar dengan `s = s + potongan`, sebelum/sesudah Rope.
+# Jalankan dari root repo:  python -m benchmarks.strings [--engine tree] [--mb 10]
+# "sebelum" mematikan Rope (ops.ROPE_MIN tak hingga) sehingga setiap `+` menyalin
+# seluruh teks; karena kuadratik, hanya diukur sampai --before-mb.
+import argparse, time
+from ice_lang import ops
+from ice_lang.cache import compile_source
+from ice_lang.cli import ENGINES
+
+CHUNK = 100
+PROGRAM = """
+teks potongan = "{chunk}";
+teks s = "";
+untuk i dalam rentang({n}) {{ s = s + potongan; }}
+bilangan hasil = panjang(s);
+"""
+
+def run_once(engine: str, mb: float, rope: bool) -> float:
+    n = int(mb * 1_000_000) // CHUNK
+    program = compile_source(PROGRAM.format(chunk="x" * CHUNK, n=n))
+    saved = ops.ROPE_MIN
+    ops.ROPE_MIN = ops.ROPE_MIN if rope else float("inf")
+    try:
+        interp = ENGINES[engine]()
+        t0 = time.perf_counter()
+        interp.interpret(program)
+        elapsed = time.perf_counter() - t0
+    finally:
+        ops.ROPE_MIN = saved
+    assert interp.globals.get("hasil") == n * CHUNK
+    return elapsed
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark penyambungan teks ICE")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("--mb", type=float, default=10, help="ukuran teks terbesar (MB)")
+    ap.add_argument("--before-mb", type=float, default=2.5, help="ukuran terbesar untuk varian tanpa Rope")
+    args = ap.parse_args()
+    sizes = [args.mb / 8, args.mb / 4, args.mb / 2, args.mb]
+    for engine in args.engine or sorted(ENGINES):
+        for mb in sizes:
+            after = run_once(engine, mb, True)
+            line = f"{engine:<8} {mb:6.2f} MB  sesudah {after * 1000:8.1f} ms ({after / mb * 1000:6.1f} ms/MB)"
+            if mb <= args.before_mb:
+                before = run_once(engine, mb, False)
+                line += f"  sebelum {before * 1000:9.1f} ms  ({before / after:.1f}x)"
+            print(line)
+
+if __name__ == "__main__":
+    main()
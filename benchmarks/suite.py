@@ -0,0 +1,129 @@
+
+# Suite benchmark dengan pelacakan regresi: waktu per fase (lex, parse, resolve,
+# run) dan memori puncak untuk korpus benchmarks/corpus/*.ice di setiap engine,
+# ditambah sumber sintetis besar untuk Lexer/Parser.
+# Jalankan dari root repo:
+#   python -m benchmarks.suite                    # ukur + bandingkan dgn baseline
+#   python -m benchmarks.suite --save-baseline    # simpan hasil sebagai baseline
+#   python -m benchmarks.suite --json hasil.json --engine tree -n 5
+# Keluar dengan kode 1 bila ada fase yang lebih lambat dari baseline melebihi
+# --threshold (default 20%). Baseline bergantung mesin, jadi simpan per mesin.
+import argparse, contextlib, io, json, platform, sys, time, tracemalloc
+from pathlib import Path
+from ice_lang import __version__
+from ice_lang.lexer import FastLexer
+from ice_lang.parser import Parser
+from ice_lang.resolver import Resolver
+from ice_lang.typecheck import infer
+from ice_lang.cli import ENGINES
+from benchmarks.lexer import synthetic
+
+HERE = Path(__file__).resolve().parent
+CORPUS = HERE / "corpus"
+BASELINE = HERE / "baseline.json"
+PHASES = ("lex", "parse", "resolve", "run")
+# fase di bawah batas ini (detik) terlalu berisik untuk dinilai regresi
+MIN_SECONDS = 0.005
+
+def run_phases(source: str, engine: str | None) -> dict[str, float]:
+    times = {}
+    t0 = time.perf_counter()
+    tokens = FastLexer(source).scan_tokens()
+    t1 = time.perf_counter()
+    program = Parser(iter(tokens)).parse()
+    t2 = time.perf_counter()
+    Resolver().resolve(program)
+    infer(program)  # bagian dari front-end (cache.compile_source), diukur sebagai resolve
+    t3 = time.perf_counter()
+    times.update(lex=t1 - t0, parse=t2 - t1, resolve=t3 - t2)
+    if engine is not None:
+        interp = ENGINES[engine]()
+        with contextlib.redirect_stdout(io.StringIO()):
+            interp.interpret(program)
+        times["run"] = time.perf_counter() - t3
+    return times
+
+def peak_memory(source: str, engine: str | None) -> int:
+    tracemalloc.start()
+    try:
+        run_phases(source, engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(source: str, engine: str | None, repeat: int) -> dict:
+    runs = [run_phases(source, engine) for _ in range(repeat)]
+    result = {phase: min(r[phase] for r in runs) for phase in runs[0]}
+    result["peak_kb"] = peak_memory(source, engine) // 1024
+    return result
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for case, phases in current.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for phase, value in phases.items():
+            old = base.get(phase)
+            if old is None or phase == "peak_kb" and old < 64:
+                continue
+            if phase != "peak_kb" and max(old, value) < MIN_SECONDS:
+                continue
+            if value > old * (1 + threshold):
+                regressions.append(f"{case} {phase}: {_fmt(phase, old)} -> {_fmt(phase, value)} "
+                                   f"(+{100 * (value / old - 1):.0f}%)")
+    return regressions
+
+def _fmt(phase: str, value) -> str:
+    return f"{value} KB" if phase == "peak_kb" else f"{value * 1000:.1f} ms"
+
+def main():
+    ap = argparse.ArgumentParser(description="Suite benchmark ICE dengan deteksi regresi")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("-n", "--repeat", type=int, default=3, help="jumlah pengulangan (diambil minimum)")
+    ap.add_argument("--lines", type=int, default=10000, help="panjang sumber sintetis untuk lexer/parser")
+    ap.add_argument("--json", metavar="FILE", help="simpan hasil ke berkas JSON")
+    ap.add_argument("--baseline", metavar="FILE", default=str(BASELINE),
+                    help=f"baseline pembanding (default: {BASELINE.relative_to(HERE.parent)})")
+    ap.add_argument("--save-baseline", action="store_true", help="tulis hasil ke berkas baseline")
+    ap.add_argument("--threshold", type=float, default=0.20, help="toleransi perlambatan (0.20 = 20%%)")
+    args = ap.parse_args()
+
+    cases = [(f"sintetis-{args.lines}", synthetic(args.lines), None)]
+    for path in sorted(CORPUS.glob("*.ice")):
+        source = path.read_text(encoding="utf-8")
+        cases += [(f"{path.stem}/{engine}", source, engine) for engine in args.engine or sorted(ENGINES)]
+
+    results = {}
+    print(f"{'kasus':<22}" + "".join(f"{p:>10}" for p in PHASES) + f"{'puncak':>12}")
+    for name, source, engine in cases:
+        r = results[name] = measure(source, engine, args.repeat)
+        cols = "".join(f"{r[p] * 1000:8.1f}ms" if p in r else f"{'-':>10}" for p in PHASES)
+        print(f"{name:<22}{cols}{r['peak_kb']:>9} KB")
+
+    data = {"meta": {"ice": __version__, "python": platform.python_version(),
+                     "repeat": args.repeat, "lines": args.lines},
+            "results": results}
+    if args.json:
+        Path(args.json).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"baseline disimpan ke {args.baseline}")
+        return
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print("baseline belum ada; jalankan dengan --save-baseline untuk membuatnya")
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"REGRESI (> {args.threshold:.0%} lebih lambat dari baseline):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"tidak ada regresi dibanding {baseline_path}")
+
+if __name__ == "__main__":
+    main()
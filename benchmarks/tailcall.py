@@ -0,0 +1,71 @@
+
+# Benchmark panggilan ekor: `kembalikan f(...)` sejuta langkah, dibandingkan
+# dengan perilaku lama (Resolver tanpa penanda Call.tail) di setiap engine.
+# Perilaku lama gagal dengan DepthLimitError: tree/closure di sekitar 100
+# panggilan, vm setelah menumpuk frame sampai batas default 1000000.
+# Jalankan dari root repo:
+#   python -m benchmarks.tailcall
+#   python -m benchmarks.tailcall --steps 3000000 --engine closure
+# Baris "dangkal" membandingkan biaya per panggilan di kedalaman yang masih bisa
+# dijalankan perilaku lama di semua engine.
+import argparse, time
+from ice_lang.cache import compile_source
+from ice_lang.cli import ENGINES
+from ice_lang.errors import IceRuntimeError
+
+PROGRAMS = {
+    # akumulator
+    "hitung": """
+tugas hitung(n, acc) {{ jika (n == 0) {{ kembalikan acc; }} kembalikan hitung(n - 1, acc + n); }}
+bilangan hasil = hitung({n}, 0);
+""",
+    # rekursi bersama
+    "genap-ganjil": """
+tugas genap(n) {{ jika (n == 0) {{ kembalikan benar; }} kembalikan ganjil(n - 1); }}
+tugas ganjil(n) {{ jika (n == 0) {{ kembalikan salah; }} kembalikan genap(n - 1); }}
+bilangan hasil = genap({n});
+""",
+    # method memanggil dirinya lewat `ini`
+    "method": """
+kelas Pencacah {{
+    tugas jalan(n, acc) {{ jika (n == 0) {{ kembalikan acc; }} kembalikan ini.jalan(n - 1, acc + 1); }}
+}}
+bilangan hasil = baru Pencacah().jalan({n}, 0);
+""",
+}
+
+SHALLOW = 80
+
+def run_once(engine: str, source: str, tail_calls: bool) -> tuple[float, str | None]:
+    program = compile_source(source, tail_calls=tail_calls)
+    interp = ENGINES[engine]()
+    t0 = time.perf_counter()
+    try:
+        interp.interpret(program)
+    except IceRuntimeError as e:
+        return time.perf_counter() - t0, type(e).__name__
+    return time.perf_counter() - t0, None
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark panggilan ekor ICE")
+    ap.add_argument("--engine", action="append", choices=sorted(ENGINES),
+                    help="backend yang diukur (boleh berulang; default: semua)")
+    ap.add_argument("--steps", type=int, default=1_000_000, help="jumlah langkah rekursi (default: 1000000)")
+    ap.add_argument("-n", "--repeat", type=int, default=1, help="jumlah pengulangan (diambil minimum)")
+    args = ap.parse_args()
+    print(f"{'engine':<8} {'program':<14} {'langkah':>10} {'mode':<6} {'waktu':>11} {'per langkah':>12}")
+    for engine in args.engine or sorted(ENGINES):
+        for name, template in PROGRAMS.items():
+            for n in (SHALLOW, args.steps):
+                source = template.format(n=n)
+                label = "dangkal" if n == SHALLOW else f"{n}"
+                for mode, tail_calls in (("lama", False), ("ekor", True)):
+                    repeat = max(args.repeat, 20) if n == SHALLOW else args.repeat
+                    elapsed, error = min(run_once(engine, source, tail_calls) for _ in range(repeat))
+                    if error is not None:
+                        print(f"{engine:<8} {name:<14} {label:>10} {mode:<6}      gagal: {error}")
+                        continue
+                    print(f"{engine:<8} {name:<14} {label:>10} {mode:<6} {elapsed * 1000:9.1f}ms {elapsed / n * 1e6:9.2f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+
+__version__ = "0.2.0"
+
+from .engine import Engine, Program
+from .limits import Limits
@@ -1,125 +1,181 @@
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
+# Node memakai __slots__ (tanpa __dict__ per instance): skrip besar menghasilkan
+# jutaan node, jadi base class juga harus kosong slot-nya.
+
 # Expressions
-class Expr: pass
+class Expr:
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expr):
     value: object
 
-@dataclass
+@dataclass(slots=True)
 class Variable(Expr):
     name: str
+    depth: Optional[int] = None  # diisi Resolver; -1 = global
+    slot: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     name: str
     value: Expr
+    depth: Optional[int] = None
+    slot: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Grouping(Expr):
     expr: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Unary(Expr):
     op: str
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Binary(Expr):
     left: Expr
     op: str
     right: Expr
+    num: bool = False  # diisi typecheck: kedua operand terbukti angka
+    # site quickening (quicken.Site) milik lokasi ini, dibuat engine tree
+    site: object = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Logical(Expr):
     left: Expr
     op: str  # 'dan' / 'atau'
     right: Expr
 
-@dataclass
+@dataclass(slots=True)
 class Call(Expr):
     callee: Expr
     args: List[Expr]
+    tail: bool = False  # diisi Resolver: `kembalikan f(...)` di badan tugas
+    site: object = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class This(Expr):
-    pass
+    depth: Optional[int] = None
+    slot: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Get(Expr):
     obj: Expr
     name: str
+    # inline cache (runtime.AttrCache) milik lokasi ini, dibuat saat pertama dievaluasi
+    cache: object = field(default=None, repr=False, compare=False)
+    site: object = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Set(Expr):
     obj: Expr
     name: str
     value: Expr
+    cache: object = field(default=None, repr=False, compare=False)
+
+@dataclass(slots=True)
+class ListExpr(Expr):
+    elements: List[Expr]
+
+@dataclass(slots=True)
+class DictExpr(Expr):
+    entries: List[tuple[Expr, Expr]]  # list of (kunci, nilai)
+
+@dataclass(slots=True)
+class Index(Expr):
+    obj: Expr
+    index: Expr
+
+@dataclass(slots=True)
+class SetIndex(Expr):
+    obj: Expr
+    index: Expr
+    value: Expr
 
-@dataclass
+@dataclass(slots=True)
 class NewExpr(Expr):
     class_name: str
     args: List[Expr]
 
-@dataclass
+@dataclass(slots=True)
 class SuperGet(Expr):
     name: str
 
 # Statements
-class Stmt: pass
+@dataclass(slots=True)
+class Stmt:
+    # baris sumber (diisi Parser; 0 = tidak diketahui), dipakai profiler
+    line: int = field(default=0, kw_only=True, repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     expr: Expr
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Stmt):
     name: str
     init: Optional[Expr]
+    slot: Optional[int] = None  # None = disimpan di dict (global)
+    type: Optional[str] = None  # tipe yang ditulis (bilangan/desimal/teks/boolean)
 
-@dataclass
+@dataclass(slots=True)
 class Block(Stmt):
     statements: List[Stmt]
+    layout: Optional[dict[str, int]] = None  # nama -> slot, diisi Resolver
+    scoped: bool = True  # False: tanpa deklarasi langsung, dijalankan di lingkup luar
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Stmt):
     branches: List[tuple[Expr, Block]]  # list of (cond, block)
     else_branch: Optional[Block]
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Stmt):
     condition: Expr
     body: Block
 
-@dataclass
+@dataclass(slots=True)
 class ForRangeStmt(Stmt):
     var: str
     args: List[Expr]
     body: Block
+    slot: Optional[int] = None
+    reuse_env: bool = False  # badan berlingkup tanpa closure: satu Environment untuk semua iterasi
+    iterable: Optional[Expr] = None  # `untuk x dalam <koleksi>`; None = rentang(args)
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(Stmt):
     value: Optional[Expr]
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDecl(Stmt):
     name: str
     params: List[str]
     body: Block
+    slot: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class PropertyDecl(Stmt):
     name: str
     getter: Optional[Block]
     setter_param: Optional[str]
     setter: Optional[Block]
 
-@dataclass
+@dataclass(slots=True)
 class ClassDecl(Stmt):
     name: str
     methods: List[FunctionDecl | PropertyDecl]
     superclass: Optional[str] = None
+    slot: Optional[int] = None
+
+@dataclass(slots=True)
+class ImportStmt(Stmt):
+    # `impor a.b;` (path "a.b" -> a/b.ice, nama "b") atau `impor "x.ice" sebagai x;`
+    path: str
+    name: str
+    slot: Optional[int] = None
@@ -0,0 +1,178 @@
+
+from __future__ import annotations
+import argparse, contextlib, io, json, os, sys, time
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from .cache import CACHE_DIR
+from .cli import run_file, add_limit_arguments, limits_from_args
+from .engine import ENGINES
+from .errors import IceSyntaxError, IceRuntimeError
+from .output import Output
+
+# `ice run-many`: menjalankan banyak berkas .ice independen di pool proses.
+# Worker berumur panjang (ice_lang sudah diimpor sekali per worker) menerima
+# path lewat pipe dan mengirim balik hasilnya: keluaran, stderr, status dan
+# waktu. Script yang melewati --timeout dihentikan bersama worker-nya, lalu
+# worker baru dibuat. Hasil dicetak begitu selesai, ringkasan di akhir.
+
+TIMEOUT_EXIT = 124  # seperti timeout(1)
+
+def collect(paths: list[str]) -> list[Path]:
+    files = []
+    for p in paths:
+        root = Path(p)
+        if root.is_file():
+            files.append(root)
+        else:
+            files.extend(f for f in sorted(root.rglob("*.ice")) if CACHE_DIR not in f.parts)
+    return files
+
+def run_one(path: str, opts: dict) -> dict:
+    out, err = io.StringIO(), io.StringIO()
+    interp = ENGINES[opts["engine"]](limits=opts["limits"])
+    interp.output = Output(out)
+    status, code, error = "ok", 0, None
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            run_file(Path(path), use_cache=opts["use_cache"], use_env=interp, optimize=opts["optimize"],
+                     check_types=opts["check_types"])
+    except (IceSyntaxError, IceRuntimeError) as e:
+        status, code, error = "galat", 1, str(e)
+    except Exception as e:
+        status, code, error = "galat", 1, f"{type(e).__name__}: {e}"
+    return {"file": path, "status": status, "exit": code, "time": time.perf_counter() - t0,
+            "output": out.getvalue(), "stderr": err.getvalue(), "error": error}
+
+def _worker(conn, opts: dict):
+    while True:
+        path = conn.recv()
+        if path is None:
+            return
+        conn.send(run_one(path, opts))
+
+class _Slot:
+    # satu worker di pool beserta tugas yang sedang dijalankannya
+    __slots__ = ('process', 'conn', 'task', 'started')
+
+    def __init__(self, ctx, opts: dict):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(child, opts), daemon=True)
+        self.process.start()
+        child.close()
+        self.task: tuple[int, str] | None = None
+        self.started = 0.0
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+def run_many(files: list[str], jobs: int, timeout: float | None, opts: dict, on_result=None) -> list[dict]:
+    ctx = mp.get_context()
+    pending = deque(enumerate(files))
+    results: list[dict | None] = [None] * len(files)
+    slots = [_Slot(ctx, opts) for _ in range(min(jobs, len(files)))]
+    try:
+        while True:
+            for s in slots:
+                if s.task is None and pending:
+                    s.task = pending.popleft()
+                    s.started = time.monotonic()
+                    s.conn.send(s.task[1])
+            busy = [s for s in slots if s.task is not None]
+            if not busy:
+                break
+            limit = None
+            if timeout is not None:
+                limit = max(0.0, min(s.started for s in busy) + timeout - time.monotonic())
+            ready = wait([s.conn for s in busy], limit)
+            for i, s in enumerate(slots):
+                if s.task is None:
+                    continue
+                index, path = s.task
+                elapsed = time.monotonic() - s.started
+                if s.conn in ready:
+                    try:
+                        result = s.conn.recv()
+                    except EOFError:
+                        # worker mati (mis. kehabisan memori): ganti dengan yang baru
+                        s.process.join()
+                        result = {"file": path, "status": "crash", "exit": s.process.exitcode, "time": elapsed,
+                                  "output": "", "stderr": "", "error": f"worker berhenti (kode {s.process.exitcode})"}
+                        s.conn.close()
+                        slots[i] = _Slot(ctx, opts)
+                elif timeout is not None and elapsed >= timeout:
+                    s.kill()
+                    result = {"file": path, "status": "timeout", "exit": TIMEOUT_EXIT, "time": elapsed,
+                              "output": "", "stderr": "", "error": f"melewati batas waktu {timeout:g}s"}
+                    slots[i] = _Slot(ctx, opts)
+                else:
+                    continue
+                s.task = None
+                results[index] = result
+                if on_result is not None:
+                    on_result(result)
+    finally:
+        for s in slots:
+            if s.task is None and s.process.is_alive():
+                try:
+                    s.conn.send(None)
+                except OSError:
+                    pass
+            else:
+                s.process.kill()
+        for s in slots:
+            s.process.join()
+    return results
+
+def summary_table(results: list[dict], wall: float) -> str:
+    width = max([len(r["file"]) for r in results] + [5])
+    lines = [f"{'berkas':<{width}}  {'status':<8} {'exit':>4} {'waktu':>9}"]
+    for r in results:
+        lines.append(f"{r['file']:<{width}}  {r['status']:<8} {r['exit'] if r['exit'] is not None else '-':>4} "
+                     f"{r['time']:8.3f}s")
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    lines.append(f"{len(results)} berkas: " + ", ".join(f"{n} {k}" for k, n in sorted(counts.items()))
+                 + f"; total {sum(r['time'] for r in results):.3f}s, waktu dinding {wall:.3f}s")
+    return "\n".join(lines)
+
+def main(argv: list[str] | None = None):
+    ap = argparse.ArgumentParser(prog="ice run-many", description="Jalankan banyak berkas .ice secara paralel")
+    ap.add_argument("paths", nargs="+", help="berkas .ice atau direktori (dicari rekursif)")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="jumlah proses worker")
+    ap.add_argument("--timeout", type=float, help="batas waktu per script (detik)")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="tree", help="backend eksekusi (default: tree)")
+    ap.add_argument("-O", "--optimize", action="store_true", help="jalankan optimizer AST")
+    ap.add_argument("--check-types", action="store_true", help="periksa tipe sebelum eksekusi (lihat ice -h)")
+    ap.add_argument("--no-cache", action="store_true", help="jangan baca/tulis cache __icecache__/*.icec")
+    ap.add_argument("--json", metavar="FILE", help="tulis ringkasan (termasuk keluaran tiap script) ke JSON")
+    ap.add_argument("--show-output", action="store_true", help="cetak keluaran tiap script saat selesai")
+    add_limit_arguments(ap)
+    args = ap.parse_args(argv)
+
+    files = [str(f) for f in collect(args.paths)]
+    if not files:
+        print("Tidak ada berkas .ice yang ditemukan.", file=sys.stderr)
+        sys.exit(2)
+    opts = {"engine": args.engine, "optimize": args.optimize, "use_cache": not args.no_cache,
+            "check_types": args.check_types, "limits": limits_from_args(args)}
+
+    def report(r: dict):
+        print(f"{r['status']:<8} {r['time']:8.3f}s  {r['file']}" + (f"  ({r['error']})" if r["error"] else ""),
+              flush=True)
+        if args.show_output and r["output"]:
+            print(r["output"], end="" if r["output"].endswith("\n") else "\n", flush=True)
+
+    t0 = time.perf_counter()
+    results = run_many(files, max(1, args.jobs), args.timeout, opts, report)
+    wall = time.perf_counter() - t0
+    print(summary_table(results, wall))
+    if args.json:
+        data = {"jobs": args.jobs, "timeout": args.timeout, "engine": args.engine, "wall": wall, "results": results}
+        Path(args.json).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    sys.exit(0 if all(r["status"] == "ok" for r in results) else 1)
@@ -1,11 +1,15 @@
 
 from __future__ import annotations
+from collections import OrderedDict
 from typing import Any
-from .runtime import IceCallable
+from .runtime import IceCallable, IceClass, Rope
+from .errors import IceRuntimeError
+from .limits import SIZE_REF, SIZE_ENTRY, allocated
+from . import ops
 
 class BuiltinTampilkan(IceCallable):
     def call(self, interpreter, args: list[Any]) -> Any:
-        print(*args)
+        interpreter.output.write_line(args)
         return None
 
 class BuiltinRentang(IceCallable):
@@ -20,32 +24,190 @@ class BuiltinPanjang(IceCallable):
             raise Exception("panjang(x) membutuhkan 1 argumen")
         return len(args[0])
 
+def type_name(x: Any) -> str:
+    if x is None: return "kosong"
+    if isinstance(x, bool): return "boolean"
+    if isinstance(x, int): return "bilangan"
+    if isinstance(x, float): return "desimal"
+    if isinstance(x, (str, Rope)): return "teks"
+    if isinstance(x, list): return "daftar"
+    if isinstance(x, dict): return "peta"
+    return type(x).__name__
+
 class BuiltinTipe(IceCallable):
     def call(self, interpreter, args: list[Any]) -> Any:
         if len(args) != 1:
             raise Exception("tipe(x) membutuhkan 1 argumen")
-        x = args[0]
-        if x is None: return "kosong"
-        if isinstance(x, bool): return "boolean"
-        if isinstance(x, int): return "bilangan"
-        if isinstance(x, float): return "desimal"
-        if isinstance(x, str): return "teks"
-        return type(x).__name__
+        return type_name(args[0])
 
 class BuiltinInt(IceCallable):
     def call(self, interpreter, args: list[Any]) -> Any:
         if len(args) != 1:
             raise Exception("int(x) membutuhkan 1 argumen")
-        return int(args[0])
+        return int(ops.flat(args[0]))
 
 class BuiltinFloat(IceCallable):
     def call(self, interpreter, args: list[Any]) -> Any:
         if len(args) != 1:
             raise Exception("float(x) membutuhkan 1 argumen")
-        return float(args[0])
+        return float(ops.flat(args[0]))
 
 class BuiltinStr(IceCallable):
     def call(self, interpreter, args: list[Any]) -> Any:
         if len(args) != 1:
             raise Exception("str(x) membutuhkan 1 argumen")
         return str(args[0])
+
+class BuiltinTambah(IceCallable):
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        daftar, nilai = args
+        if type(daftar) is not list:
+            raise IceRuntimeError("tambah(daftar, nilai) membutuhkan daftar.")
+        if interpreter.limits is not None:
+            interpreter.limits.grow(SIZE_REF)
+        daftar.append(nilai)
+        return daftar
+
+class BuiltinHapus(IceCallable):
+    # hapus(daftar, indeks) / hapus(peta, kunci): mengembalikan nilai yang dihapus
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        koleksi, kunci = args
+        if type(koleksi) is not list and type(koleksi) is not dict:
+            raise IceRuntimeError("hapus membutuhkan daftar atau peta.")
+        value = ops.op_index(koleksi, kunci)
+        del koleksi[kunci]
+        return value
+
+class BuiltinKunci(IceCallable):
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        if type(args[0]) is not dict:
+            raise IceRuntimeError("kunci(peta) membutuhkan peta.")
+        return list(args[0])
+
+class BuiltinBerisi(IceCallable):
+    # berisi(peta, kunci) O(1); berisi(daftar/teks, nilai) mencari linear
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        koleksi, x = ops.flat(args[0]), ops.flat(args[1])
+        if type(koleksi) not in (list, dict, str):
+            raise IceRuntimeError("berisi membutuhkan daftar, peta, atau teks.")
+        try:
+            return x in koleksi
+        except TypeError:
+            return False
+
+# Memoisasi: ingat(f[, ukuran]) membungkus tugas murni; hasilnya disimpan per
+# tuple argumen dalam cache LRU berisi paling banyak `ukuran` entri (default
+# MEMO_SIZE; kosong = tanpa batas). Argumen harus skalar (bilangan, desimal,
+# boolean, teks, kosong): daftar, peta, instance dan tugas ditolak karena bisa
+# berubah atau tidak bisa di-hash. Pemanggilan yang melempar galat tidak
+# disimpan. Untuk rekursi, ikat ulang namanya (`fib = ingat(fib);`) agar
+# panggilan di badan tugas juga lewat cache.
+# statistik_ingat(f) -> peta {hit, miss, eviksi, isi, kapasitas}; dari
+# embedding: IceMemo.stats() pada nilai global hasil Program.run.
+
+MEMO_SIZE = 1000
+
+def memo_key(args: list[Any]) -> tuple:
+    # bool/float diberi tag tipe agar 1, 1.0 dan benar tidak berbagi entri
+    key = []
+    for a in args:
+        t = type(a)
+        if t is int or t is str or a is None:
+            key.append(a)
+        elif t is bool or t is float:
+            key.append((t, a))
+        elif t is Rope:
+            key.append(str(a))
+        else:
+            raise IceRuntimeError(f"Argumen bertipe {type_name(a)} tidak bisa dipakai sebagai kunci ingat().")
+    return tuple(key)
+
+class IceMemo(IceCallable):
+    def __init__(self, fn: IceCallable, size: int | None):
+        self.fn = fn
+        self.size = size
+        self.cache: OrderedDict[tuple, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def arity(self) -> int:
+        return self.fn.arity()
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        key = memo_key(args)
+        cache = self.cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+        self.misses += 1
+        value = self.fn.call(interpreter, args)
+        if interpreter.limits is not None:
+            interpreter.limits.grow(SIZE_ENTRY)
+        cache[key] = value
+        if self.size is not None and len(cache) > self.size:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        return {"hit": self.hits, "miss": self.misses, "eviksi": self.evictions,
+                "isi": len(self.cache), "kapasitas": self.size}
+
+    def __repr__(self):
+        return f"<ingat {getattr(self.fn, 'name', type(self.fn).__name__)}>"
+
+class BuiltinIngat(IceCallable):
+    def call(self, interpreter, args: list[Any]) -> Any:
+        if not (1 <= len(args) <= 2):
+            raise IceRuntimeError("ingat(f[, ukuran]) membutuhkan 1..2 argumen.")
+        fn = args[0]
+        if not isinstance(fn, IceCallable) or type(fn) is IceClass:
+            raise IceRuntimeError("ingat(f) membutuhkan tugas.")
+        size = args[1] if len(args) == 2 else MEMO_SIZE
+        if size is not None and (type(size) is not int or size < 1):
+            raise IceRuntimeError("Ukuran ingat() harus bilangan >= 1 atau kosong.")
+        return IceMemo(fn, size)
+
+class BuiltinStatistikIngat(IceCallable):
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter, args: list[Any]) -> Any:
+        if type(args[0]) is not IceMemo:
+            raise IceRuntimeError("statistik_ingat(f) membutuhkan tugas hasil ingat().")
+        stats = args[0].stats()
+        if interpreter.limits is not None:
+            interpreter.limits.grow(allocated(stats))
+        return stats
+
+# Builtin global: didaftarkan oleh Interpreter; optimizer memakai daftar nama ini
+# (builtin tidak pernah menjalankan kode ICE).
+BUILTINS = {
+    "tampilkan": BuiltinTampilkan,
+    "rentang": BuiltinRentang,
+    "panjang": BuiltinPanjang,
+    "tipe": BuiltinTipe,
+    "int": BuiltinInt,
+    "float": BuiltinFloat,
+    "str": BuiltinStr,
+    "tambah": BuiltinTambah,
+    "hapus": BuiltinHapus,
+    "kunci": BuiltinKunci,
+    "berisi": BuiltinBerisi,
+    "ingat": BuiltinIngat,
+    "statistik_ingat": BuiltinStatistikIngat,
+}
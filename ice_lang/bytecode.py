@@ -0,0 +1,397 @@
+
+from __future__ import annotations
+from array import array
+from typing import Any, Optional
+from .ast import *
+from .runtime import AttrCache, frame_layout
+
+# Bytecode ICE: setiap instruksi dua kata (opcode, argumen) di array('i').
+# Argumen menunjuk ke constant pool / tabel nama, atau berisi offset lompatan
+# (indeks kata absolut di dalam `code`).
+
+OPNAMES = [
+    "CONST", "POP",
+    "LOAD_FAST", "LOAD_LOCAL", "LOAD_GLOBAL", "LOAD_NAME",
+    "STORE_FAST", "STORE_LOCAL", "STORE_GLOBAL", "STORE_NAME",
+    "DEFINE_FAST", "DEFINE_NAME",
+    "ADD", "SUB", "MUL", "DIV", "MOD", "EQ", "NE", "LT", "LE", "GT", "GE",
+    "NEG", "NOT",
+    "JUMP", "JUMP_IF_FALSE", "JUMP_IF_FALSE_OR_POP", "JUMP_IF_TRUE_OR_POP",
+    "PUSH_SCOPE", "POP_SCOPE", "MAKE_SCOPE", "ENTER_SCOPE",
+    "RANGE", "ITER", "FOR_ITER",
+    "BUILD_LIST", "BUILD_DICT", "INDEX", "SET_INDEX",
+    "CALL", "CALL_METHOD", "NEW", "RETURN", "TAIL_CALL", "TAIL_CALL_METHOD",
+    "GET_ATTR", "SET_ATTR", "GET_METHOD", "SUPER_GET",
+    "MAKE_FUNCTION", "MAKE_CLASS", "IMPORT",
+    "FAIL",
+]
+(CONST, POP,
+ LOAD_FAST, LOAD_LOCAL, LOAD_GLOBAL, LOAD_NAME,
+ STORE_FAST, STORE_LOCAL, STORE_GLOBAL, STORE_NAME,
+ DEFINE_FAST, DEFINE_NAME,
+ ADD, SUB, MUL, DIV, MOD, EQ, NE, LT, LE, GT, GE,
+ NEG, NOT,
+ JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+ PUSH_SCOPE, POP_SCOPE, MAKE_SCOPE, ENTER_SCOPE,
+ RANGE, ITER, FOR_ITER,
+ BUILD_LIST, BUILD_DICT, INDEX, SET_INDEX,
+ CALL, CALL_METHOD, NEW, RETURN, TAIL_CALL, TAIL_CALL_METHOD,
+ GET_ATTR, SET_ATTR, GET_METHOD, SUPER_GET,
+ MAKE_FUNCTION, MAKE_CLASS, IMPORT,
+ FAIL) = range(len(OPNAMES))
+
+BINARY_OPCODES = {
+    "+": ADD, "-": SUB, "*": MUL, "/": DIV, "%": MOD,
+    "==": EQ, "!=": NE, "<": LT, "<=": LE, ">": GT, ">=": GE,
+}
+
+# LOAD_LOCAL/STORE_LOCAL mengemas alamat Resolver dalam satu argumen.
+SLOT_BITS = 16
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+class CodeObject:
+    def __init__(self, name: str):
+        self.name = name
+        self.code = array('i')
+        self.consts: list[Any] = []
+        self.names: list[str] = []
+        self.caches: list[AttrCache] = []  # inline cache per instruksi GET_ATTR/SET_ATTR
+
+    def __repr__(self):
+        return f"<code {self.name}>"
+
+class FunctionProto:
+    # Templat fungsi/method; MAKE_FUNCTION membuat IceFunction dengan closure env.
+    def __init__(self, name: str, params: list[str], layout: dict[str, int], code: CodeObject,
+                 is_method: bool = False):
+        self.name = name
+        self.params = params
+        self.layout = layout
+        self.code = code
+        self.is_method = is_method
+
+class ClassProto:
+    def __init__(self, name: str, superclass: Optional[str], methods: list[FunctionProto]):
+        self.name = name
+        self.superclass = superclass
+        self.methods = methods
+
+class BytecodeCompiler:
+    def __init__(self):
+        self.co: CodeObject | None = None
+        self.in_method = False
+
+    def compile_program(self, statements: list[Stmt]) -> CodeObject:
+        return self._code_object("<program>", statements)
+
+    def _code_object(self, name: str, statements: list[Stmt]) -> CodeObject:
+        prev, self.co = self.co, CodeObject(name)
+        try:
+            for st in statements:
+                self.stmt(st)
+            self.emit(CONST, self.const(None))
+            self.emit(RETURN)
+            return self.co
+        finally:
+            self.co = prev
+
+    # Emisi
+    def emit(self, op: int, arg: int = 0) -> int:
+        code = self.co.code
+        code.append(op)
+        code.append(arg)
+        return len(code) - 2
+
+    def here(self) -> int:
+        return len(self.co.code)
+
+    def patch(self, at: int, target: int | None = None):
+        self.co.code[at + 1] = self.here() if target is None else target
+
+    def const(self, value) -> int:
+        consts = self.co.consts
+        # literal dibandingkan berikut tipenya agar 1, 1.0 dan benar tidak tertukar
+        for i, c in enumerate(consts):
+            if type(c) is type(value) and c == value and type(value) in (int, float, str, bool, type(None)):
+                return i
+        consts.append(value)
+        return len(consts) - 1
+
+    def name(self, name: str) -> int:
+        names = self.co.names
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    # Statements
+    def stmt(self, st: Stmt):
+        if isinstance(st, ExprStmt):
+            self.expr(st.expr)
+            self.emit(POP)
+        elif isinstance(st, VarDecl):
+            if st.init is None:
+                self.emit(CONST, self.const(None))
+            else:
+                self.expr(st.init)
+            self._define(st.name, st.slot)
+        elif isinstance(st, Block):
+            self.block(st)
+        elif isinstance(st, IfStmt):
+            exits = []
+            for cond, blk in st.branches:
+                self.expr(cond)
+                skip = self.emit(JUMP_IF_FALSE)
+                self.block(blk)
+                exits.append(self.emit(JUMP))
+                self.patch(skip)
+            if st.else_branch is not None:
+                self.block(st.else_branch)
+            for at in exits:
+                self.patch(at)
+        elif isinstance(st, WhileStmt):
+            top = self.here()
+            self.expr(st.condition)
+            done = self.emit(JUMP_IF_FALSE)
+            self.block(st.body)
+            self.emit(JUMP, top)
+            self.patch(done)
+        elif isinstance(st, ForRangeStmt):
+            body = st.body
+            reuse = st.reuse_env and bool(body.statements)
+            if reuse:
+                # stack: [lingkup badan, iterator]; ENTER_SCOPE mengosongkan dan
+                # memasuki lingkup yang sama di setiap iterasi
+                self.emit(MAKE_SCOPE, self.const(body.layout))
+            if st.iterable is not None:
+                self.expr(st.iterable)
+                self.emit(ITER)
+            else:
+                for a in st.args:
+                    self.expr(a)
+                self.emit(RANGE, len(st.args))
+            top = self.emit(FOR_ITER)
+            self._define(st.var, st.slot)
+            if reuse:
+                self.emit(ENTER_SCOPE)
+                for s in body.statements:
+                    self.stmt(s)
+                self.emit(POP_SCOPE)
+            else:
+                self.block(body)
+            self.emit(JUMP, top)
+            self.patch(top)
+            if reuse:
+                self.emit(POP)
+        elif isinstance(st, ReturnStmt):
+            if st.value is None:
+                self.emit(CONST, self.const(None))
+            else:
+                self.expr(st.value)
+            self.emit(RETURN)
+        elif isinstance(st, FunctionDecl):
+            self.emit(MAKE_FUNCTION, self.const(self._function(st.name, st.params, st.body, False)))
+            self._define(st.name, st.slot)
+        elif isinstance(st, ClassDecl):
+            methods = []
+            for m in st.methods:
+                if isinstance(m, FunctionDecl):
+                    methods.append(self._function(m.name, m.params, m.body, True))
+                elif isinstance(m, PropertyDecl):
+                    if m.getter is not None:
+                        methods.append(self._function(f"get_{m.name}", [], m.getter, True))
+                    if m.setter is not None:
+                        param = [m.setter_param] if m.setter_param else []
+                        methods.append(self._function(f"set_{m.name}", param, m.setter, True))
+                else:
+                    self._fail('Anggota kelas tidak dikenal saat konstruksi.')
+                    return
+            self.emit(MAKE_CLASS, self.const(ClassProto(st.name, st.superclass, methods)))
+            self._define(st.name, st.slot)
+        elif isinstance(st, ImportStmt):
+            self.emit(IMPORT, self.const(st.path))
+            self._define(st.name, st.slot)
+        else:
+            self._fail(f"Pernyataan tidak dikenal: {st}")
+
+    def block(self, block: Block):
+        if not block.statements:
+            return
+        if not block.scoped:
+            for st in block.statements:
+                self.stmt(st)
+            return
+        self.emit(PUSH_SCOPE, self.const(block.layout))
+        for st in block.statements:
+            self.stmt(st)
+        self.emit(POP_SCOPE)
+
+    def _define(self, name: str, slot):
+        if slot is None:
+            self.emit(DEFINE_NAME, self.name(name))
+        else:
+            self.emit(DEFINE_FAST, slot)
+
+    def _function(self, name: str, params: list[str], body: Block, is_method: bool) -> FunctionProto:
+        prev = self.in_method
+        self.in_method = prev or is_method
+        try:
+            code = self._code_object(name, [body])
+        finally:
+            self.in_method = prev
+        return FunctionProto(name, params, frame_layout(params, is_method), code, is_method)
+
+    def _chain(self, e: Binary | Logical):
+        # Operand kiri (a + b + c ...) dikumpulkan iteratif lalu dikompilasi dari
+        # yang terdalam, jadi rantai panjang tidak memakan tumpukan Python.
+        spine: list[Binary | Logical] = []
+        while isinstance(e, (Binary, Logical, Grouping)):
+            if isinstance(e, Grouping):
+                e = e.expr
+            else:
+                spine.append(e)
+                e = e.left
+        self.expr(e)
+        for node in reversed(spine):
+            if isinstance(node, Logical):
+                jump = self.emit(JUMP_IF_TRUE_OR_POP if node.op == "atau" else JUMP_IF_FALSE_OR_POP)
+                self.expr(node.right)
+                self.patch(jump)
+                continue
+            self.expr(node.right)
+            op = BINARY_OPCODES.get(node.op)
+            if op is None:
+                self._fail(f"Operator biner tidak dikenal: {node.op}")
+            else:
+                # argumen 1: kedua operand terbukti angka (typecheck), VM
+                # melewati cek tipe
+                self.emit(op, 1 if node.num else 0)
+
+    def _fail(self, message: str):
+        self.emit(FAIL, self.const(message))
+
+    # Expressions
+    def expr(self, e: Expr):
+        if isinstance(e, Literal):
+            self.emit(CONST, self.const(e.value))
+        elif isinstance(e, Variable):
+            self._load(e.name, e.depth, e.slot)
+        elif isinstance(e, This):
+            self._load('ini', e.depth, e.slot)
+        elif isinstance(e, Assign):
+            self.expr(e.value)
+            self._store(e.name, e.depth, e.slot)
+        elif isinstance(e, Grouping):
+            self.expr(e.expr)
+        elif isinstance(e, Unary):
+            self.expr(e.right)
+            if e.op == "-":
+                self.emit(NEG)
+            elif e.op == "bukan":
+                self.emit(NOT)
+            else:
+                self._fail(f"Operator unary tidak didukung: {e.op}")
+        elif isinstance(e, (Binary, Logical)):
+            self._chain(e)
+        elif isinstance(e, Get):
+            self.expr(e.obj)
+            self.emit(GET_ATTR, self._attr(e.name, False))
+        elif isinstance(e, Set):
+            self.expr(e.obj)
+            self.expr(e.value)
+            self.emit(SET_ATTR, self._attr(e.name, True))
+        elif isinstance(e, Index):
+            self.expr(e.obj)
+            self.expr(e.index)
+            self.emit(INDEX)
+        elif isinstance(e, SetIndex):
+            self.expr(e.obj)
+            self.expr(e.index)
+            self.expr(e.value)
+            self.emit(SET_INDEX)
+        elif isinstance(e, ListExpr):
+            for x in e.elements:
+                self.expr(x)
+            self.emit(BUILD_LIST, len(e.elements))
+        elif isinstance(e, DictExpr):
+            for k, v in e.entries:
+                self.expr(k)
+                self.expr(v)
+            self.emit(BUILD_DICT, len(e.entries))
+        elif isinstance(e, SuperGet):
+            self.emit(SUPER_GET, self.name(e.name))
+        elif isinstance(e, NewExpr):
+            self.emit(LOAD_NAME, self.name(e.class_name))
+            for a in e.args:
+                self.expr(a)
+            self.emit(NEW, len(e.args))
+        elif isinstance(e, Call):
+            if type(e.callee) is Get:
+                # GET_METHOD menumpuk (method, instance) atau (nilai, _UNSET);
+                # CALL_METHOD memanggil method dengan 'ini' langsung di frame.
+                self.expr(e.callee.obj)
+                self.emit(GET_METHOD, self._attr(e.callee.name, False))
+                for a in e.args:
+                    self.expr(a)
+                # TAIL_*: `kembalikan f(...)` (Call.tail); selalu diikuti RETURN
+                self.emit(TAIL_CALL_METHOD if e.tail else CALL_METHOD, len(e.args))
+            else:
+                self.expr(e.callee)
+                for a in e.args:
+                    self.expr(a)
+                self.emit(TAIL_CALL if e.tail else CALL, len(e.args))
+        else:
+            self._fail(f"Ekspresi tidak didukung: {e}")
+
+    def _attr(self, name: str, setter: bool) -> int:
+        # indeks inline cache (yang menyimpan nama); bit terendah: 1 jika 'ini'
+        # mungkin ada di lingkup (cek akses butuh instance saat ini)
+        caches = self.co.caches
+        caches.append(AttrCache(name, setter))
+        return ((len(caches) - 1) << 1) | int(self.in_method)
+
+    def _load(self, name: str, depth, slot: int):
+        if depth is None:
+            self.emit(LOAD_NAME, self.name(name))
+        elif depth < 0:
+            self.emit(LOAD_GLOBAL, self.name(name))
+        elif depth == 0:
+            self.emit(LOAD_FAST, slot)
+        else:
+            self.emit(LOAD_LOCAL, (depth << SLOT_BITS) | slot)
+
+    def _store(self, name: str, depth, slot: int):
+        if depth is None:
+            self.emit(STORE_NAME, self.name(name))
+        elif depth < 0:
+            self.emit(STORE_GLOBAL, self.name(name))
+        elif depth == 0:
+            self.emit(STORE_FAST, slot)
+        else:
+            self.emit(STORE_LOCAL, (depth << SLOT_BITS) | slot)
+
+def disassemble(co: CodeObject) -> str:
+    lines = [f"== {co.name} =="]
+    nested = []
+    code = co.code
+    for pc in range(0, len(code), 2):
+        op, arg = code[pc], code[pc + 1]
+        name = OPNAMES[op]
+        note = ""
+        if op in (CONST, MAKE_FUNCTION, MAKE_CLASS, PUSH_SCOPE, MAKE_SCOPE, IMPORT, FAIL):
+            c = co.consts[arg]
+            note = repr(c)
+            if isinstance(c, FunctionProto):
+                nested.append(c.code); note = f"<tugas {c.name}>"
+            elif isinstance(c, ClassProto):
+                nested.extend(m.code for m in c.methods); note = f"<kelas {c.name}>"
+        elif op in (LOAD_GLOBAL, LOAD_NAME, STORE_GLOBAL, STORE_NAME, DEFINE_NAME, SUPER_GET):
+            note = co.names[arg]
+        elif op in (GET_ATTR, SET_ATTR, GET_METHOD):
+            note = co.caches[arg >> 1].name
+        elif op in (LOAD_LOCAL, STORE_LOCAL):
+            note = f"depth={arg >> SLOT_BITS} slot={arg & SLOT_MASK}"
+        lines.append(f"{pc:5d} {name:<22}{arg:<6d}{note}")
+    for sub in nested:
+        lines.append("")
+        lines.append(disassemble(sub))
+    return "\n".join(lines)
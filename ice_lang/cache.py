@@ -0,0 +1,106 @@
+
+from __future__ import annotations
+import hashlib, os, pickle, sys
+from pathlib import Path
+from . import __version__
+from .lexer import FastLexer
+from .parser import Parser
+from .resolver import Resolver
+from .optimizer import Optimizer
+from .typecheck import infer
+from .errors import IceSyntaxError
+
+# Cache hasil front-end (AST yang sudah di-resolve) di disk, mirip __pycache__.
+# Berkas <nama>.icec disimpan di folder __icecache__ di samping sumbernya:
+#   MAGIC (4 byte) | sha256(kunci versi + sumber) (32 byte) | pickle AST
+# AST hasil `-O` disimpan terpisah sebagai <nama>.opt.icec.
+# Kunci mencakup versi interpreter, versi format AST dan versi Python, jadi
+# berkas lama otomatis dianggap basi setelah upgrade. Berkas cache dipercaya
+# setara dengan sumbernya (isinya pickle), jadi jangan memuat cache asing.
+
+CACHE_DIR = "__icecache__"
+CACHE_SUFFIX = ".icec"
+MAGIC = b"ICEC"
+# naikkan jika bentuk node AST / anotasi Resolver berubah
+FORMAT_VERSION = 11
+
+def cache_path(source_path: Path, optimize: bool = False) -> Path:
+    return source_path.parent / CACHE_DIR / (source_path.stem + (".opt" if optimize else "") + CACHE_SUFFIX)
+
+def source_digest(source: str, optimize: bool = False) -> bytes:
+    h = hashlib.sha256()
+    h.update(f"{__version__}:{FORMAT_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:{int(optimize)}\0".encode())
+    h.update(source.encode("utf-8"))
+    return h.digest()
+
+def compile_source(source: str, optimizer: Optimizer | None = None, tail_calls: bool = True) -> list:
+    # tail_calls=False: tanpa panggilan ekor (hanya untuk benchmark pembanding)
+    program = Parser(FastLexer(source).iter_tokens()).parse()
+    if optimizer is not None:
+        program = optimizer.optimize(program)
+    Resolver(tail_calls=tail_calls).resolve(program)
+    infer(program)
+    return program
+
+def load(path: Path, source: str, optimize: bool = False):
+    # None jika cache tidak ada, rusak, atau kuncinya tidak cocok dengan sumber.
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    header = len(MAGIC) + 32
+    if len(data) < header or data[:len(MAGIC)] != MAGIC:
+        return None
+    if data[len(MAGIC):header] != source_digest(source, optimize):
+        return None
+    try:
+        return pickle.loads(data[header:])
+    except Exception:
+        return None
+
+def store(path: Path, source: str, program, optimize: bool = False) -> bool:
+    try:
+        payload = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError, TypeError):
+        return False
+    try:
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(MAGIC + source_digest(source, optimize) + payload)
+        os.replace(tmp, path)  # atomik: pembaca tidak pernah melihat berkas setengah jadi
+    except OSError:
+        return False
+    return True
+
+def load_or_compile(source_path: Path, source: str, use_cache: bool = True,
+                    optimizer: Optimizer | None = None) -> list:
+    # optimizer: jalankan optimizer AST (-O); tidak dijalankan bila AST dari cache
+    if not use_cache:
+        return compile_source(source, optimizer)
+    optimize = optimizer is not None
+    path = cache_path(source_path, optimize)
+    program = load(path, source, optimize)
+    if program is None:
+        program = compile_source(source, optimizer)
+        store(path, source, program, optimize)
+    return program
+
+def compile_tree(root: Path, force: bool = False, optimize: bool = False):
+    # Prakompilasi semua .ice di bawah root; hasil: list (path, status, error).
+    results = []
+    files = [root] if root.is_file() else sorted(root.rglob("*.ice"))
+    for src in files:
+        if CACHE_DIR in src.parts:
+            continue
+        source = src.read_text(encoding="utf-8")
+        path = cache_path(src, optimize)
+        if not force and load(path, source, optimize) is not None:
+            results.append((src, "segar", None))
+            continue
+        try:
+            program = compile_source(source, Optimizer() if optimize else None)
+        except IceSyntaxError as e:
+            results.append((src, "galat", e))
+            continue
+        results.append((src, "dikompilasi" if store(path, source, program, optimize) else "gagal-tulis", None))
+    return results
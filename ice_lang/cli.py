@@ -2,45 +2,115 @@
 #!/usr/bin/env python3
 import sys, argparse, time, re
 from pathlib import Path
-from .lexer import Lexer
+from .lexer import FastLexer
 from .parser import Parser
-from .interpreter import Interpreter
+from .resolver import Resolver
+from .optimizer import Optimizer, is_temp
+from .engine import ENGINES
+from .profiler import ProfilingInterpreter, MODES as PROFILE_MODES
+from .output import DEFAULT_BUFFER
+from .limits import Limits
+from .modules import ModuleLoader
+from .bytecode import BytecodeCompiler, disassemble
 from .errors import IceSyntaxError, IceRuntimeError
+from . import __version__, cache, typecheck, quicken
 
-VERSION = "0.2.0"
+VERSION = __version__
 
-def run_source(source: str, show_tokens=False, show_ast=False, use_env=None):
-    lexer = Lexer(source)
-    tokens = lexer.scan_tokens()
+def run_source(source: str, show_tokens=False, show_ast=False, use_env=None, engine="tree", show_bytecode=False,
+               optimize=False, profile=None, profile_out=None, output_buffer=None, limits=None, path=None, imports=None,
+               check_types=False, quicken_stats=False, trust_globals=None):
+    # trust_globals: global hanya ditulis program ini (default: bila bukan REPL)
+    lexer = FastLexer(source)
     if show_tokens:
+        tokens = lexer.scan_tokens()
         for t in tokens:
             print(t)
+    else:
+        tokens = lexer.iter_tokens()
     parser = Parser(tokens)
     program = parser.parse()
+    if optimize:
+        optimizer = Optimizer()
+        program = optimizer.optimize(program)
+        print(optimizer.report(), file=sys.stderr)
     if show_ast:
         for node in program:
             print(repr(node))
-    interp = use_env or Interpreter()
-    interp.interpret(program)
+    Resolver().resolve(program)
+    # REPL (use_env): global bisa ditulis input sebelumnya, tipenya tidak disimpulkan
+    if trust_globals is None:
+        trust_globals = use_env is None
+    (typecheck.check if check_types else typecheck.infer)(program, trust_globals=trust_globals)
+    return run_program(program, use_env=use_env, engine=engine, show_bytecode=show_bytecode,
+                       profile=profile, profile_out=profile_out, output_buffer=output_buffer, limits=limits,
+                       path=path, imports=imports, quicken_stats=quicken_stats)
+
+def run_program(program, use_env=None, engine="tree", show_bytecode=False, profile=None, profile_out=None,
+                output_buffer=None, limits=None, path=None, imports=None, quicken_stats=False):
+    # path: berkas program (basis path `impor`); imports: opsi ModuleLoader
+    if show_bytecode:
+        print(disassemble(BytecodeCompiler().compile_program(program)))
+    # profiler menggantikan interpreter biasa hanya bila diminta
+    interp = use_env or (ProfilingInterpreter(profile, limits=limits) if profile else ENGINES[engine](limits=limits))
+    if output_buffer is not None:
+        interp.output.buffer_size = output_buffer
+    if path is not None:
+        interp.path = path
+    if imports is not None:
+        interp.loader = ModuleLoader(interp, **imports)
+    if profile:
+        try:
+            interp.interpret(program)
+        finally:
+            interp.write_report(profile_out or "ice.collapsed")
+        return interp
+    try:
+        interp.interpret(program)
+    finally:
+        if quicken_stats:
+            interp.output.flush()
+            print(quicken.report(program), file=sys.stderr)
     return interp
 
-def run_file(path: Path, **opts):
+def run_file(path: Path, use_cache=True, lazy_imports=False, check_types=False, **opts):
     source = path.read_text(encoding="utf-8")
-    return run_source(source, **opts)
+    # modul yang diimpor mengikuti cache, -O dan --check-types program utamanya
+    opts["path"] = path.resolve()
+    opts["imports"] = {"lazy": lazy_imports, "use_cache": use_cache, "optimize": opts.get("optimize", False),
+                       "check_types": check_types}
+    if use_cache and not (opts.get("show_tokens") or opts.get("show_ast")):
+        optimizer = Optimizer() if opts.pop("optimize", False) else None
+        program = cache.load_or_compile(path, source, optimizer=optimizer)
+        if optimizer is not None:
+            print(optimizer.report(), file=sys.stderr)
+        if check_types:
+            typecheck.check(program)
+        opts.pop("show_tokens", None); opts.pop("show_ast", None)
+        return run_program(program, **opts)
+    # seluruh berkas dijalankan dari awal (juga dengan use_env dari run-many):
+    # global dipercaya, sama seperti AST dari cache (cache.compile_source)
+    opts["check_types"] = check_types
+    return run_source(source, trust_globals=True, **opts)
 
 def brace_delta(s: str) -> int:
     # Hapus literal string supaya brace di dalam string diabaikan
     s2 = re.sub(r"'(?:\\.|[^'])*'|\\\"(?:\\\\.|[^\\\"])*\\\"", "", s)
     return s2.count('{') - s2.count('}')
 
-def repl():
+def repl(engine="tree", optimize=False, output_buffer=None, limits=None, lazy_imports=False, check_types=False):
     print("ICE REPL — ketik 'keluar' untuk berhenti. Baris kosong mengeksekusi buffer.")
-    interp = Interpreter()
+    # batas eksekusi berlaku per input (dihitung ulang tiap interpret)
+    interp = ENGINES[engine](limits=limits)
+    interp.loader = ModuleLoader(interp, lazy=lazy_imports, optimize=optimize, check_types=check_types)
+    if output_buffer is not None:
+        interp.output.buffer_size = output_buffer
     buf = []
     depth = 0
     while True:
         try:
             prompt = "... " if depth > 0 or buf else "ice> "
+            interp.output.flush()
             line = input(prompt)
         except EOFError:
             print()
@@ -55,30 +125,79 @@ def repl():
             if not src.strip():
                 continue
             try:
-                run_source(src, use_env=interp)
+                run_source(src, use_env=interp, optimize=optimize, check_types=check_types)
             except (IceSyntaxError, IceRuntimeError) as e:
                 print(e)
+            finally:
+                # variabel sementara `-O` hanya dipakai input ini
+                values = interp.globals.values
+                for name in [k for k in values if is_temp(k)]:
+                    del values[name]
+
+def add_limit_arguments(ap: argparse.ArgumentParser):
+    ap.add_argument("--max-steps", type=int, metavar="N", help="batas langkah (iterasi loop + panggilan tugas)")
+    ap.add_argument("--max-depth", type=int, metavar="N", help="batas kedalaman panggilan ICE")
+    ap.add_argument("--max-time", type=float, metavar="DETIK", help="batas waktu eksekusi")
+    ap.add_argument("--max-memory", type=int, metavar="BYTE", help="batas perkiraan total alokasi memori")
+
+def limits_from_args(args) -> Limits | None:
+    if args.max_steps is None and args.max_depth is None and args.max_time is None and args.max_memory is None:
+        return None
+    return Limits(args.max_steps, args.max_depth, args.max_time, args.max_memory)
 
 def main():
-    ap = argparse.ArgumentParser(prog="ice", description="ICE language runner")
+    if sys.argv[1:2] == ["run-many"]:
+        from .batch import main as run_many
+        run_many(sys.argv[2:]); return
+    ap = argparse.ArgumentParser(prog="ice", description="ICE language runner",
+                                 epilog="ice run-many [--jobs N] dir/: jalankan banyak berkas paralel (lihat ice run-many -h)")
     ap.add_argument("file", nargs="?", help="file .ice (atau '-' untuk stdin)")
     ap.add_argument("-t", "--show-tokens", action="store_true", help="tampilkan token hasil lexing")
     ap.add_argument("-a", "--show-ast", action="store_true", help="tampilkan AST hasil parsing")
+    ap.add_argument("-b", "--show-bytecode", action="store_true", help="tampilkan bytecode hasil kompilasi")
     ap.add_argument("--time", action="store_true", help="ukur waktu eksekusi")
+    ap.add_argument("--no-cache", action="store_true", help="jangan baca/tulis cache __icecache__/*.icec")
+    ap.add_argument("-O", "--optimize", action="store_true",
+                    help="jalankan optimizer AST (lipat konstanta, buang cabang mati, angkat invarian loop)")
     ap.add_argument("--repl", action="store_true", help="masuk mode REPL")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="tree", help="backend eksekusi (default: tree)")
+    ap.add_argument("--profile", action="store_true", help="profil tugas ICE (hanya engine tree)")
+    ap.add_argument("--quicken-stats", action="store_true",
+                    help="cetak ringkasan site Binary/Call/Get yang dispesialisasi ke stderr (hanya engine tree)")
+    ap.add_argument("--profile-mode", choices=PROFILE_MODES, default="deterministik",
+                    help="deterministik (waktu + hitungan baris tepat) atau sampel (lebih murah)")
+    ap.add_argument("--profile-out", metavar="FILE",
+                    help="berkas collapsed stack untuk flamegraph (default: <nama>.collapsed)")
+    ap.add_argument("--output-buffer", type=int, metavar="BYTE",
+                    help=f"ukuran buffer keluaran tampilkan (default: {DEFAULT_BUFFER}; 0 = tanpa buffer)")
+    ap.add_argument("--lazy-imports", action="store_true",
+                    help="jalankan badan modul yang diimpor saat namanya pertama kali diakses")
+    ap.add_argument("--check-types", action="store_true",
+                    help="periksa tipe deklarasi dan operator sebelum eksekusi (galat = TypeError)")
+    add_limit_arguments(ap)
     ap.add_argument("--version", action="store_true", help="tampilkan versi")
     args = ap.parse_args()
+    if args.profile and args.engine != "tree":
+        ap.error("--profile hanya didukung oleh engine tree")
+    if args.quicken_stats and args.engine != "tree":
+        ap.error("--quicken-stats hanya didukung oleh engine tree")
+    profile = args.profile_mode if args.profile else None
+    limits = limits_from_args(args)
 
     if args.version:
         print(VERSION); return
 
     if args.repl or not args.file:
-        repl(); return
+        repl(args.engine, args.optimize, args.output_buffer, limits, args.lazy_imports, args.check_types); return
 
     if args.file == "-":
         source = sys.stdin.read()
         t0 = time.time()
-        run_source(source, show_tokens=args.show_tokens, show_ast=args.show_ast)
+        run_source(source, show_tokens=args.show_tokens, show_ast=args.show_ast,
+                   show_bytecode=args.show_bytecode, engine=args.engine, optimize=args.optimize,
+                   profile=profile, profile_out=args.profile_out, output_buffer=args.output_buffer, limits=limits,
+                   imports={"lazy": args.lazy_imports, "optimize": args.optimize, "check_types": args.check_types},
+                   check_types=args.check_types, quicken_stats=args.quicken_stats)
         if args.time:
             print(f"Waktu: {time.time()-t0:.4f}s")
     else:
@@ -87,7 +206,12 @@ def main():
             print(f"File tidak ditemukan: {path}", file=sys.stderr)
             sys.exit(2)
         t0 = time.time()
-        run_file(path, show_tokens=args.show_tokens, show_ast=args.show_ast)
+        run_file(path, use_cache=not args.no_cache,
+                 show_tokens=args.show_tokens, show_ast=args.show_ast,
+                 show_bytecode=args.show_bytecode, engine=args.engine, optimize=args.optimize,
+                 profile=profile, profile_out=args.profile_out or path.with_suffix(".collapsed"),
+                 output_buffer=args.output_buffer, limits=limits, lazy_imports=args.lazy_imports,
+                 check_types=args.check_types, quicken_stats=args.quicken_stats)
         if args.time:
             print(f"Waktu: {time.time()-t0:.4f}s")
 
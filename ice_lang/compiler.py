@@ -0,0 +1,687 @@
+
+from __future__ import annotations
+from typing import Any, Callable
+from .ast import *
+from .errors import IceRuntimeError
+from .interpreter import Interpreter, RETURN
+from .modules import IceModule
+from .runtime import Environment, IceFunction, IceClass, IceInstance, AttrCache, TailCall, _UNSET
+from . import ops
+
+# Backend "closure": setiap node AST dikompilasi sekali menjadi fungsi Python
+# yang terspesialisasi (satu closure per jenis node / operator), sehingga
+# eksekusi tidak lagi mendispatch isinstance per node seperti Interpreter.
+# Semantik (urutan evaluasi, lingkup, pesan galat) harus sama dengan tree-walker.
+# Seperti Interpreter.execute, kode statement yang dapat memuat 'kembalikan'
+# mengembalikan None atau RETURN; statement lain hasilnya diabaikan.
+
+Code = Callable[[Environment], Any]
+
+class ClosureCompiler:
+    def __init__(self, interpreter: Interpreter):
+        self.interpreter = interpreter
+        self.in_method = False  # apakah 'ini' mungkin ada di rantai lingkup
+
+    def compile_program(self, statements: list[Stmt]) -> Code:
+        return self._sequence(statements)
+
+    # Statements
+    def _may_return(self, st: Stmt) -> bool:
+        # apakah statement dapat selesai lewat 'kembalikan' (di luar fungsi bersarang)
+        if isinstance(st, ReturnStmt):
+            return True
+        if isinstance(st, Block):
+            return any(self._may_return(s) for s in st.statements)
+        if isinstance(st, IfStmt):
+            return (any(self._may_return(b) for _, b in st.branches)
+                    or (st.else_branch is not None and self._may_return(st.else_branch)))
+        if isinstance(st, (WhileStmt, ForRangeStmt)):
+            return self._may_return(st.body)
+        return False
+
+    def _sequence(self, statements: list[Stmt]) -> Code:
+        codes = [self.stmt(st) for st in statements]
+        flags = [self._may_return(st) for st in statements]
+        if not any(flags):
+            if len(codes) == 1:
+                return codes[0]
+            if len(codes) == 2:
+                a, b = codes
+                def seq2(env):
+                    a(env); b(env)
+                return seq2
+            codes = tuple(codes)
+            def seq(env):
+                for c in codes:
+                    c(env)
+            return seq
+        if len(codes) == 1:
+            return codes[0]
+        steps = tuple(zip(codes, flags))
+        def seq_status(env):
+            for c, may_return in steps:
+                if may_return:
+                    status = c(env)
+                    if status is not None:
+                        return status
+                else:
+                    c(env)
+            return None
+        return seq_status
+
+    def block(self, block: Block) -> Code:
+        layout = block.layout
+        if not block.statements:
+            return lambda env: None
+        body = self._sequence(block.statements)
+        if not block.scoped:
+            # tanpa deklarasi: langsung di lingkup luar (nilai ekspresi tunggal dibuang)
+            if self._may_return(block) or len(block.statements) > 1:
+                return body
+            def run_inline(env):
+                body(env)
+            return run_inline
+        if not self._may_return(block):
+            def run_block(env):
+                body(Environment(env, layout))
+        else:
+            def run_block(env):
+                return body(Environment(env, layout))
+        return run_block
+
+    def _definer(self, name: str, slot) -> Callable[[Environment, Any], None]:
+        if slot is None:
+            def define(env, value):
+                env.define(name, value)
+        else:
+            def define(env, value):
+                env.slots[slot] = value
+        return define
+
+    def stmt(self, st: Stmt) -> Code:
+        if isinstance(st, ExprStmt):
+            return self.expr(st.expr)
+        if isinstance(st, VarDecl):
+            define = self._definer(st.name, st.slot)
+            if st.init is None:
+                return lambda env: define(env, None)
+            init = self.expr(st.init)
+            return lambda env: define(env, init(env))
+        if isinstance(st, Block):
+            return self.block(st)
+        if isinstance(st, IfStmt):
+            return self._if(st)
+        if isinstance(st, WhileStmt):
+            cond = self.expr(st.condition)
+            body = self._counted(self.block(st.body))
+            if self._may_return(st.body):
+                def run_while(env):
+                    while cond(env):
+                        status = body(env)
+                        if status is not None:
+                            return status
+            else:
+                def run_while(env):
+                    while cond(env):
+                        body(env)
+            return run_while
+        if isinstance(st, ForRangeStmt):
+            if st.reuse_env and st.body.statements:
+                return self._for_reuse(st)
+            source = self._loop_source(st)
+            define = self._definer(st.var, st.slot)
+            body = self._counted(self.block(st.body))
+            if self._may_return(st.body):
+                def run_for(env):
+                    for v in source(env):
+                        define(env, v)
+                        status = body(env)
+                        if status is not None:
+                            return status
+            else:
+                def run_for(env):
+                    for v in source(env):
+                        define(env, v)
+                        body(env)
+            return run_for
+        if isinstance(st, ReturnStmt):
+            interp = self.interpreter
+            if st.value is None:
+                def run_return_none(env):
+                    interp.return_value = None
+                    return RETURN
+                return run_return_none
+            value = self.expr(st.value)
+            def run_return(env):
+                interp.return_value = value(env)
+                return RETURN
+            return run_return
+        if isinstance(st, FunctionDecl):
+            return self._function_decl(st)
+        if isinstance(st, ClassDecl):
+            return self._class_decl(st)
+        if isinstance(st, ImportStmt):
+            define, path, interp = self._definer(st.name, st.slot), st.path, self.interpreter
+            return lambda env: define(env, interp.import_module(path))
+        def unknown(env):
+            raise IceRuntimeError(f"Pernyataan tidak dikenal: {st}")
+        return unknown
+
+    def _if(self, st: IfStmt) -> Code:
+        branches = tuple((self.expr(c), self.block(b)) for c, b in st.branches)
+        else_branch = self.block(st.else_branch) if st.else_branch else None
+        if len(branches) == 1:
+            (cond, then), = branches
+            if else_branch is None:
+                def run_if(env):
+                    if cond(env):
+                        return then(env)
+            else:
+                def run_if(env):
+                    if cond(env):
+                        return then(env)
+                    return else_branch(env)
+            return run_if
+        def run_if_chain(env):
+            for cond, blk in branches:
+                if cond(env):
+                    return blk(env)
+            if else_branch is not None:
+                return else_branch(env)
+        return run_if_chain
+
+    def _for_reuse(self, st: ForRangeStmt) -> Code:
+        # Badan berlingkup tanpa closure: satu Environment per eksekusi loop,
+        # slot-nya dikosongkan di awal tiap iterasi.
+        source = self._loop_source(st)
+        define = self._definer(st.var, st.slot)
+        layout = st.body.layout
+        body = self._counted(self._sequence(st.body.statements))
+        if self._may_return(st.body):
+            def run_for(env):
+                rng = source(env)
+                inner = Environment(env, layout)
+                slots = inner.slots
+                fresh = list(slots)
+                for v in rng:
+                    define(env, v)
+                    slots[:] = fresh
+                    status = body(inner)
+                    if status is not None:
+                        return status
+        else:
+            def run_for(env):
+                rng = source(env)
+                inner = Environment(env, layout)
+                slots = inner.slots
+                fresh = list(slots)
+                for v in rng:
+                    define(env, v)
+                    slots[:] = fresh
+                    body(inner)
+        return run_for
+
+    def _counted(self, body: Code) -> Code:
+        # batas eksekusi: tiap iterasi loop menghabiskan satu langkah. Tanpa
+        # Limits badan loop dipakai apa adanya (tanpa overhead).
+        limits = self.interpreter.limits
+        if limits is None:
+            return body
+        tick = limits.tick
+        def counted(env):
+            tick()
+            return body(env)
+        return counted
+
+    def _charged(self, code: Code) -> Code:
+        # batas memori: nilai baru (teks, daftar, peta) dihitung ke kuota alokasi
+        limits = self.interpreter.limits
+        if limits is None:
+            return code
+        alloc = limits.alloc
+        def charged(env):
+            value = code(env)
+            alloc(value)
+            return value
+        return charged
+
+    def _loop_source(self, st: ForRangeStmt) -> Code:
+        if st.iterable is not None:
+            iterable = self.expr(st.iterable)
+            return lambda env: ops.iterate(iterable(env))
+        args = [self.expr(a) for a in st.args]
+        return lambda env: ops.range_from_values([a(env) for a in args])
+
+    def _method_body(self, body: Block, is_method: bool) -> Code:
+        # Kode badan fungsi untuk IceFunction.code: mengembalikan nilai 'kembalikan'.
+        prev = self.in_method
+        self.in_method = prev or is_method
+        try:
+            run = self.block(body)
+        finally:
+            self.in_method = prev
+        if not self._may_return(body):
+            def run_function(env):
+                run(env)
+            return run_function
+        interp = self.interpreter
+        def run_returning(env):
+            if run(env) is not None:
+                return interp.take_return()
+            return None
+        return run_returning
+
+    def _function_decl(self, st: FunctionDecl) -> Code:
+        name, params, body = st.name, st.params, st.body
+        code = self._method_body(body, False)
+        define = self._definer(name, st.slot)
+        def declare(env):
+            define(env, IceFunction(name, params, body, env, code=code))
+        return declare
+
+    def _class_decl(self, st: ClassDecl) -> Code:
+        # (nama, parameter, blok, kode) untuk tiap method; getter/setter properti
+        # dipetakan ke get_<nama>/set_<nama> seperti di Interpreter.
+        members = []
+        for m in st.methods:
+            if isinstance(m, FunctionDecl):
+                members.append((m.name, m.params, m.body, self._method_body(m.body, True)))
+            elif isinstance(m, PropertyDecl):
+                if m.getter is not None:
+                    members.append((f"get_{m.name}", [], m.getter, self._method_body(m.getter, True)))
+                if m.setter is not None:
+                    param = [m.setter_param] if m.setter_param else []
+                    members.append((f"set_{m.name}", param, m.setter, self._method_body(m.setter, True)))
+            else:
+                def bad_member(env):
+                    raise IceRuntimeError('Anggota kelas tidak dikenal saat konstruksi.')
+                return bad_member
+        name, superclass_name = st.name, st.superclass
+        define = self._definer(name, st.slot)
+        def declare(env):
+            methods = {mname: IceFunction(mname, params, body, env, code=code, is_method=True)
+                       for mname, params, body, code in members}
+            superclass = None
+            if superclass_name is not None:
+                sc = env.get(superclass_name)
+                if not isinstance(sc, IceClass):
+                    raise IceRuntimeError('Superclass harus berupa kelas.')
+                superclass = sc
+            klass = IceClass(name, methods, superclass)
+            for fn in methods.values():
+                fn.owner = klass
+            define(env, klass)
+        return declare
+
+    # Expressions
+    def expr(self, e: Expr) -> Code:
+        if isinstance(e, Literal):
+            value = e.value
+            return lambda env: value
+        if isinstance(e, Variable):
+            return self._variable(e.name, e.depth, e.slot)
+        if isinstance(e, This):
+            return self._variable('ini', e.depth, e.slot)
+        if isinstance(e, Assign):
+            return self._assign(e)
+        if isinstance(e, Grouping):
+            return self.expr(e.expr)
+        if isinstance(e, Unary):
+            return self._unary(e)
+        if isinstance(e, Binary):
+            return self._binary(e)
+        if isinstance(e, Logical):
+            left, right = self.expr(e.left), self.expr(e.right)
+            if e.op == "atau":
+                def run_or(env):
+                    v = left(env)
+                    return v if v else right(env)
+                return run_or
+            def run_and(env):
+                v = left(env)
+                return right(env) if v else v
+            return run_and
+        if isinstance(e, Get):
+            return self._get(e)
+        if isinstance(e, Set):
+            return self._set(e)
+        if isinstance(e, SuperGet):
+            return self._super_get(e)
+        if isinstance(e, NewExpr):
+            return self._new(e)
+        if isinstance(e, Index):
+            return self._index(e)
+        if isinstance(e, SetIndex):
+            obj, index, value = self.expr(e.obj), self.expr(e.index), self.expr(e.value)
+            limits = self.interpreter.limits
+            if limits is None:
+                return lambda env: ops.op_set_index(obj(env), index(env), value(env))
+            def set_index(env):
+                o, k, v = obj(env), index(env), value(env)
+                limits.set_index(o, k)
+                return ops.op_set_index(o, k, v)
+            return set_index
+        if isinstance(e, ListExpr):
+            elements = [self.expr(x) for x in e.elements]
+            return self._charged(lambda env: [x(env) for x in elements])
+        if isinstance(e, DictExpr):
+            entries = [(self.expr(k), self.expr(v)) for k, v in e.entries]
+            return self._charged(lambda env: ops.build_dict([(k(env), v(env)) for k, v in entries]))
+        if isinstance(e, Call):
+            return self._call(e)
+        def unknown(env):
+            raise IceRuntimeError(f"Ekspresi tidak didukung: {e}")
+        return unknown
+
+    def _variable(self, name: str, depth, slot: int) -> Code:
+        interp = self.interpreter
+        if depth is None:
+            return lambda env: env.get(name)
+        if depth < 0:
+            return lambda env: interp.globals.get(name)
+        if depth == 0:
+            def local0(env):
+                v = env.slots[slot]
+                return env.get_at(0, slot, name) if v is _UNSET else v
+            return local0
+        if depth == 1:
+            def local1(env):
+                v = env.enclosing.slots[slot]
+                return env.get_at(1, slot, name) if v is _UNSET else v
+            return local1
+        return lambda env: env.get_at(depth, slot, name)
+
+    def _assign(self, e: Assign) -> Code:
+        value, name, depth, slot = self.expr(e.value), e.name, e.depth, e.slot
+        interp = self.interpreter
+        if depth is None:
+            def assign_dynamic(env):
+                v = value(env)
+                env.assign(name, v)
+                return v
+            return assign_dynamic
+        if depth < 0:
+            def assign_global(env):
+                v = value(env)
+                interp.globals.assign(name, v)
+                return v
+            return assign_global
+        def assign_local(env):
+            v = value(env)
+            env.assign_at(depth, slot, name, v)
+            return v
+        return assign_local
+
+    def _unary(self, e: Unary) -> Code:
+        right = self.expr(e.right)
+        if e.op == "-":
+            def neg(env):
+                v = right(env)
+                if isinstance(v, (int, float)):
+                    return -v
+                return ops.op_neg(v)
+            return neg
+        if e.op == "bukan":
+            return lambda env: not right(env)
+        def unknown(env):
+            right(env)
+            raise IceRuntimeError(f"Operator unary tidak didukung: {e.op}")
+        return unknown
+
+    def _binary(self, e: Binary) -> Code:
+        left, right, op = self.expr(e.left), self.expr(e.right), e.op
+        if e.num and op in _NUM_FACTORIES:
+            return _NUM_FACTORIES[op](left, right)
+        factory = _BINARY_FACTORIES.get(op)
+        if factory is not None:
+            return self._charged(factory(left, right)) if op == "+" else factory(left, right)
+        def unknown(env):
+            left(env); right(env)
+            raise IceRuntimeError(f"Operator biner tidak dikenal: {op}")
+        return unknown
+
+    def _current_instance(self) -> Code:
+        # 'ini' hanya ada di frame method; di luar method
+        # pencarian pasti gagal sehingga bisa dilewati.
+        if not self.in_method:
+            return lambda env: None
+        def current(env):
+            try:
+                return env.get('ini')
+            except Exception:
+                return None
+        return current
+
+    def _get(self, e: Get) -> Code:
+        obj, name, interp = self.expr(e.obj), e.name, self.interpreter
+        current = self._current_instance()
+        cache = AttrCache(name)
+        def get(env):
+            o = obj(env)
+            if isinstance(o, IceInstance):
+                return o.get(name, current(env), interp, cache)
+            if type(o) is IceModule:
+                return o.get(name)
+            raise IceRuntimeError('Akses properti pada non-objek.')
+        return get
+
+    def _set(self, e: Set) -> Code:
+        obj, value, name, interp = self.expr(e.obj), self.expr(e.value), e.name, self.interpreter
+        current = self._current_instance()
+        cache = AttrCache(name, True)
+        def set_(env):
+            o = obj(env)
+            v = value(env)
+            if isinstance(o, IceInstance):
+                return o.set(name, v, current(env), interp, cache)
+            raise IceRuntimeError('Penetapan properti pada non-objek.')
+        return set_
+
+    def _index(self, e: Index) -> Code:
+        obj, index = self.expr(e.obj), self.expr(e.index)
+        def index_(env):
+            o = obj(env)
+            k = index(env)
+            if type(o) is list and type(k) is int and -len(o) <= k < len(o):
+                return o[k]
+            return ops.op_index(o, k)
+        return index_
+
+    def _super_get(self, e: SuperGet) -> Code:
+        name = e.name
+        def super_get(env):
+            inst = env.get('ini')
+            try:
+                klass = env.get('__class__')
+            except Exception:
+                klass = inst.klass
+            if klass.superclass is None:
+                raise IceRuntimeError("Tidak ada superclass untuk 'super'.")
+            m = klass.superclass.find_method(name)
+            if not m:
+                raise IceRuntimeError(f"Method '{name}' tidak ditemukan pada superclass.")
+            return m.bind(inst)
+        return super_get
+
+    def _new(self, e: NewExpr) -> Code:
+        class_name, interp = e.class_name, self.interpreter
+        args = tuple(self.expr(a) for a in e.args)
+        def new(env):
+            klass = env.get(class_name)
+            values = [a(env) for a in args]
+            if hasattr(klass, 'call'):
+                return klass.call(interp, values)
+            raise IceRuntimeError('Target "baru" bukan kelas yang dapat diinstansiasi.')
+        return new
+
+    def _invoke(self, e: Call) -> Code:
+        # `obj.m(args)`: method dipanggil langsung dengan 'ini' = obj tanpa
+        # bound method; field, properti dan galat lewat jalur get() biasa.
+        target, interp = e.callee, self.interpreter
+        obj, name = self.expr(target.obj), target.name
+        current = self._current_instance()
+        cache = AttrCache(name)
+        args = tuple(self.expr(a) for a in e.args)
+        nargs = len(args)
+        tail = e.tail
+        def invoke(env):
+            o = obj(env)
+            if isinstance(o, IceInstance):
+                inst = current(env)
+                method = o.method_for(name, inst, cache)
+                if method is not None:
+                    values = [a(env) for a in args]
+                    if len(method.params) != nargs:
+                        raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {len(method.params)}, diberi {nargs}.")
+                    if tail:
+                        return TailCall(method, method.new_frame(values, o), interp)
+                    return method.call(interp, values, o)
+                f = o.get(name, inst, interp, cache)
+            elif type(o) is IceModule:
+                f = o.get(name)
+            else:
+                raise IceRuntimeError('Akses properti pada non-objek.')
+            return _call_value(interp, f, [a(env) for a in args], tail)
+        return invoke
+
+    def _call(self, e: Call) -> Code:
+        if type(e.callee) is Get:
+            return self._invoke(e)
+        callee, interp = self.expr(e.callee), self.interpreter
+        args = tuple(self.expr(a) for a in e.args)
+        nargs = len(args)
+        if e.tail:
+            # `kembalikan f(...)`: frame f dibuat di sini, dijalankan oleh
+            # trampolin IceFunction.call pemanggil (runtime.TailCall)
+            def tail_call(env):
+                return _call_value(interp, callee(env), [a(env) for a in args], True)
+            return tail_call
+        def call(env):
+            f = callee(env)
+            values = [a(env) for a in args]
+            if type(f) is IceFunction:
+                if len(f.params) != nargs:
+                    raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {len(f.params)}, diberi {nargs}.")
+                return f.call(interp, values)
+            return _call_value(interp, f, values)
+        return call
+
+def _call_value(interp: Interpreter, f: Any, values: list[Any], tail: bool = False) -> Any:
+    # pemanggilan umum (builtin, kelas, method terikat, ...) dengan cek arity
+    if hasattr(f, "call"):
+        try:
+            arity = f.arity()
+        except Exception:
+            arity = -1
+        if arity >= 0 and len(values) != arity:
+            raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {arity}, diberi {len(values)}.")
+        if tail and type(f) is IceFunction:
+            return TailCall(f, f.new_frame(values), interp)
+        return f.call(interp, values)
+    raise IceRuntimeError("Objek tidak dapat dipanggil sebagai fungsi.")
+
+# Satu pabrik closure per operator biner. Jalur cepat angka ditulis langsung;
+# kasus lain diteruskan ke ops.* agar galat dan konversi teks tetap identik.
+_NUM = (int, float)
+
+def _make_add(left, right):
+    def add(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a + b
+        return ops.op_add(a, b)
+    return add
+
+def _make_sub(left, right):
+    def sub(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a - b
+        return ops.op_sub(a, b)
+    return sub
+
+def _make_mul(left, right):
+    def mul(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a * b
+        return ops.op_mul(a, b)
+    return mul
+
+def _make_div(left, right):
+    return lambda env: ops.op_div(left(env), right(env))
+
+def _make_mod(left, right):
+    def mod(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a % b
+        return ops.op_mod(a, b)
+    return mod
+
+def _make_eq(left, right):
+    return lambda env: left(env) == right(env)
+
+def _make_ne(left, right):
+    return lambda env: left(env) != right(env)
+
+def _make_lt(left, right):
+    def lt(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a < b
+        return ops.op_lt(a, b)
+    return lt
+
+def _make_le(left, right):
+    def le(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a <= b
+        return ops.op_le(a, b)
+    return le
+
+def _make_gt(left, right):
+    def gt(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a > b
+        return ops.op_gt(a, b)
+    return gt
+
+def _make_ge(left, right):
+    def ge(env):
+        a = left(env); b = right(env)
+        if isinstance(a, _NUM) and isinstance(b, _NUM):
+            return a >= b
+        return ops.op_ge(a, b)
+    return ge
+
+_BINARY_FACTORIES = {
+    "+": _make_add, "-": _make_sub, "*": _make_mul, "/": _make_div, "%": _make_mod,
+    "==": _make_eq, "!=": _make_ne,
+    "<": _make_lt, "<=": _make_le, ">": _make_gt, ">=": _make_ge,
+}
+
+# Operand yang terbukti angka oleh typecheck (Binary.num): tanpa cek tipe sama
+# sekali, dan tanpa beban alokasi (hasilnya angka).
+_NUM_FACTORIES = {
+    "+": lambda left, right: lambda env: left(env) + right(env),
+    "-": lambda left, right: lambda env: left(env) - right(env),
+    "*": lambda left, right: lambda env: left(env) * right(env),
+    "%": lambda left, right: lambda env: left(env) % right(env),
+    "<": lambda left, right: lambda env: left(env) < right(env),
+    "<=": lambda left, right: lambda env: left(env) <= right(env),
+    ">": lambda left, right: lambda env: left(env) > right(env),
+    ">=": lambda left, right: lambda env: left(env) >= right(env),
+}
+
+class ClosureInterpreter(Interpreter):
+    # Interpreter dengan backend closure; builtin dan globals sama dengan
+    # tree-walker sehingga REPL dan embedder dapat memakainya bergantian.
+    def run(self, statements: list[Stmt]):
+        if not statements:
+            return
+        code = ClosureCompiler(self).compile_program(statements)
+        code(self.env)
+        self.return_value = None  # 'kembalikan' di tingkat atas menghentikan program
@@ -0,0 +1,112 @@
+
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, TextIO
+from .ast import Stmt
+from .builtins import BUILTINS
+from .bytecode import BytecodeCompiler
+from .cache import compile_source
+from .typecheck import check as check_types, TYPED_BUILTINS
+from .compiler import ClosureInterpreter
+from .interpreter import Interpreter
+from .limits import Limits
+from .optimizer import Optimizer, is_temp
+from .quicken import stats as quicken_stats
+from .output import Output, DEFAULT_BUFFER
+from .vm import VMInterpreter
+
+ENGINES = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "vm": VMInterpreter,
+}
+
+# API embedding: satu Engine dipakai ulang untuk banyak eksekusi kecil.
+#   engine = Engine()
+#   program = engine.compile(source)          # di-cache (LRU) per teks sumber
+#   hasil = program.run(globals={"n": 10}, stdout=buf)
+# Setiap run mendapat Interpreter dan lingkup global baru yang berangkat dari
+# salinan tabel builtin milik Engine (instance builtin tidak dibuat ulang), jadi
+# eksekusi saling terisolasi. AST hasil kompilasi dipakai bersama dan tidak
+# diubah oleh run (kecuali inline cache-nya); untuk backend vm bytecode-nya juga
+# dikompilasi sekali per Program.
+# limits (limits.Limits) berlaku untuk setiap run dengan penghitung baru; run
+# yang melampauinya melempar ExecutionLimitError (turunan IceRuntimeError).
+# check_types=True: compile() memeriksa tipe (typecheck mode ketat) dan melempar
+# IceTypeError; program yang gagal tidak masuk cache.
+# globals tidak boleh menimpa builtin yang tipe hasilnya dipakai inferensi tipe
+# (panjang, int, str, ...): program sudah dispesialisasi dengan asumsi itu.
+
+class Program:
+    def __init__(self, engine: 'Engine', statements: list[Stmt]):
+        self.engine = engine
+        self.statements = statements
+        self.code = BytecodeCompiler().compile_program(statements) if engine.backend == "vm" else None
+
+    def run(self, globals: dict[str, Any] | None = None, stdout: TextIO | None = None,
+            limits: Limits | None = None) -> dict[str, Any]:
+        # Mengembalikan variabel global yang dibuat/diubah program (tanpa builtin
+        # dan tanpa variabel sementara `-O`).
+        # limits menggantikan batas bawaan Engine untuk run ini.
+        engine = self.engine
+        if globals:
+            clash = TYPED_BUILTINS.intersection(globals)
+            if clash:
+                raise ValueError(f"globals tidak boleh menimpa builtin: {', '.join(sorted(clash))}")
+        limits = limits if limits is not None else engine.limits
+        interp = ENGINES[engine.backend](engine.builtins, None if limits is None else limits.fresh())
+        if globals:
+            interp.globals.values.update(globals)
+        interp.output = Output(stdout, engine.output_buffer)
+        interp.interpret(self.code if self.code is not None else self.statements)
+        builtins = engine.builtins
+        return {k: v for k, v in interp.globals.values.items() if builtins.get(k) is not v and not is_temp(k)}
+
+    def quickening(self) -> dict[str, dict[str, int]]:
+        # site yang dispesialisasi selama run-run sebelumnya (backend tree; site
+        # hidup di AST yang dipakai bersama, jadi berlaku lintas run)
+        return quicken_stats(self.statements)
+
+class Engine:
+    def __init__(self, backend: str = "tree", optimize: bool = False, cache_size: int = 256,
+                 output_buffer: int = DEFAULT_BUFFER, limits: Limits | None = None, check_types: bool = False):
+        if backend not in ENGINES:
+            raise ValueError(f"backend tidak dikenal: {backend}")
+        self.backend = backend
+        self.optimize = optimize
+        self.cache_size = cache_size
+        self.output_buffer = output_buffer
+        self.limits = limits
+        self.check_types = check_types
+        self.builtins = {name: builtin() for name, builtin in BUILTINS.items()}
+        self._programs: OrderedDict[str, Program] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, source: str) -> Program:
+        with self._lock:
+            program = self._programs.get(source)
+            if program is not None:
+                self._programs.move_to_end(source)
+                self.hits += 1
+                return program
+        statements = compile_source(source, Optimizer() if self.optimize else None)
+        if self.check_types:
+            check_types(statements)
+        program = Program(self, statements)
+        with self._lock:
+            self.misses += 1
+            self._programs[source] = program
+            while len(self._programs) > self.cache_size:
+                self._programs.popitem(last=False)
+        return program
+
+    def run(self, source: str, globals: dict[str, Any] | None = None, stdout: TextIO | None = None,
+            limits: Limits | None = None) -> dict[str, Any]:
+        return self.compile(source).run(globals, stdout, limits)
+
+    def clear_cache(self):
+        with self._lock:
+            self._programs.clear()
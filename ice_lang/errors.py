@@ -5,9 +5,30 @@ class IceSyntaxError(Exception):
         self.line = line
         self.column = column
 
+class IceTypeError(IceSyntaxError):
+    # galat dari pemeriksa tipe statis (typecheck, mode ketat); semuanya
+    # dilaporkan sekaligus sebelum program dijalankan
+    def __init__(self, errors: list[tuple[int, str]]):
+        Exception.__init__(self, "\n".join(f"TypeError (baris {line}): {msg}" for line, msg in errors))
+        self.errors = errors
+        self.line, self.column = errors[0][0], 0
+
 class IceRuntimeError(Exception):
     pass
 
-class IceReturnSignal(Exception):
-    def __init__(self, value):
-        self.value = value
+# Batas eksekusi (lihat limits.Limits); semuanya IceRuntimeError sehingga
+# embedder cukup menangkap satu jenis galat.
+class ExecutionLimitError(IceRuntimeError):
+    pass
+
+class StepLimitError(ExecutionLimitError):
+    pass
+
+class DepthLimitError(ExecutionLimitError):
+    pass
+
+class TimeLimitError(ExecutionLimitError):
+    pass
+
+class MemoryLimitError(ExecutionLimitError):
+    pass
@@ -1,79 +1,169 @@
 
 from __future__ import annotations
-from typing import Any
+import sys
+from pathlib import Path
+from typing import Any, Iterable
 from .ast import *
-from .errors import IceRuntimeError, IceReturnSignal
-from .runtime import Environment, IceFunction, IceClass, IceInstance
-from .builtins import (
-    BuiltinTampilkan, BuiltinRentang,
-    BuiltinPanjang, BuiltinTipe, BuiltinInt, BuiltinFloat, BuiltinStr
-)
+from .errors import IceRuntimeError, DepthLimitError
+from .limits import Limits, PY_FRAMES_PER_CALL, MAX_RECURSION_LIMIT
+from .runtime import Environment, IceFunction, IceClass, IceInstance, AttrCache, TailCall
+from .quicken import Site, observe_binary, observe_call, observe_method, observe_get
+from .builtins import BUILTINS
+from .modules import ModuleLoader, IceModule
+from .output import Output
+from . import ops
+
+# Status penyelesaian statement. execute() mengembalikan None bila selesai
+# normal; RETURN merambat naik lewat execute_block/loop sampai IceFunction.call
+# mengambil nilainya dari Interpreter.return_value (tanpa melempar exception).
+RETURN = "kembalikan"
 
 class Interpreter:
-    def __init__(self):
+    # kelas interpreter untuk badan modul; None = kelas yang sama
+    module_engine: type | None = None
+    # spesialisasi adaptif Binary/Call/Get (lihat quicken); False = site baru
+    # tidak dibuat
+    quickening = True
+
+    def __init__(self, builtins: dict[str, Any] | None = None, limits: Limits | None = None):
+        # builtins: tabel builtin siap pakai (mis. milik ice_lang.Engine) yang
+        # disalin, bukan dibuat ulang
         self.globals = Environment()
         self.env = self.globals
-        # builtins
-        self.globals.define("tampilkan", BuiltinTampilkan())
-        self.globals.define("rentang", BuiltinRentang())
-        self.globals.define("panjang", BuiltinPanjang())
-        self.globals.define("tipe", BuiltinTipe())
-        self.globals.define("int", BuiltinInt())
-        self.globals.define("float", BuiltinFloat())
-        self.globals.define("str", BuiltinStr())
+        self.return_value: Any = None
+        self.output = Output()
+        # batas eksekusi; ditetapkan sekali di sini (backend closure membaca
+        # nilainya saat kompilasi)
+        self.limits = limits
+        # sistem modul: path berkas yang sedang dijalankan (basis path `impor`;
+        # None = direktori kerja), loader dibuat saat impor pertama
+        self.path: Path | None = None
+        self.loader: ModuleLoader | None = None
+        self.is_module = False
+        if builtins is not None:
+            self.globals.values = dict(builtins)
+        else:
+            for name, builtin in BUILTINS.items():
+                self.globals.define(name, builtin())
 
     # Execution
     def interpret(self, statements: list[Stmt]):
+        limits = self.limits
+        recursion_limit = sys.getrecursionlimit()
+        if limits is not None:
+            limits.start()
+            if limits.max_depth is not None:
+                # rekursi ICE memakai rekursi Python; beri ruang agar max_depth
+                # yang tercapai lebih dulu, tapi tidak melewati plafon yang aman
+                needed = min(limits.max_depth * PY_FRAMES_PER_CALL + 1000, MAX_RECURSION_LIMIT)
+                sys.setrecursionlimit(max(recursion_limit, needed))
+        try:
+            self.run(statements)
+        except RecursionError:
+            raise DepthLimitError("Rekursi terlalu dalam: tumpukan interpreter habis.") from None
+        finally:
+            if sys.getrecursionlimit() != recursion_limit:
+                sys.setrecursionlimit(recursion_limit)
+            self.output.flush()
+
+    def run(self, statements: list[Stmt]):
+        # dijalankan interpret(); backend lain menimpa ini
         for st in statements:
-            self.execute(st)
+            if self.execute(st) is not None:
+                # 'kembalikan' di tingkat atas menghentikan program
+                self.return_value = None
+                return
+
+    def import_module(self, spec: str):
+        if self.loader is None:
+            self.loader = ModuleLoader(self)
+        return self.loader.load(spec, self.path)
+
+    def module_interpreter(self, path: Path) -> 'Interpreter':
+        # interpreter untuk badan modul: global sendiri; keluaran, batas
+        # eksekusi dan loader dipakai bersama
+        child = (self.module_engine or type(self))(self.loader.builtins, self.limits)
+        child.output, child.loader, child.path, child.is_module = self.output, self.loader, path, True
+        return child
+
+    def _home(self, body: Block):
+        # tugas/method milik modul selalu dijalankan interpreter modulnya (yang
+        # memegang global modul), siapa pun pemanggilnya
+        if not self.is_module:
+            return None
+        def run(env: Environment) -> Any:
+            prev = self.env
+            try:
+                self.env = env
+                if self.execute(body) is not None:
+                    return self.take_return()
+            finally:
+                self.env = prev
+            return None
+        return run
+
+    def take_return(self) -> Any:
+        value, self.return_value = self.return_value, None
+        return value
 
     def execute(self, stmt: Stmt):
         if isinstance(stmt, ExprStmt):
             self.evaluate(stmt.expr)
         elif isinstance(stmt, VarDecl):
             value = None if stmt.init is None else self.evaluate(stmt.init)
-            self.env.define(stmt.name, value)
+            self._define(stmt.name, stmt.slot, value)
         elif isinstance(stmt, Block):
-            self.execute_block(stmt.statements, Environment(self.env))
+            return self.execute_block(stmt.statements, Environment(self.env, stmt.layout) if stmt.scoped else self.env)
         elif isinstance(stmt, IfStmt):
-            done = False
             for cond, blk in stmt.branches:
                 if self._is_truthy(self.evaluate(cond)):
-                    self.execute(blk)
-                    done = True
-                    break
-            if not done and stmt.else_branch:
-                self.execute(stmt.else_branch)
+                    return self.execute(blk)
+            if stmt.else_branch:
+                return self.execute(stmt.else_branch)
         elif isinstance(stmt, WhileStmt):
+            limits = self.limits
             while self._is_truthy(self.evaluate(stmt.condition)):
-                self.execute(stmt.body)
+                if limits is not None:
+                    limits.tick()
+                status = self.execute(stmt.body)
+                if status is not None:
+                    return status
         elif isinstance(stmt, ForRangeStmt):
-            rng = self._iterable_from_args(stmt.args)
-            first_iter = True
+            if stmt.iterable is None:
+                rng = self._iterable_from_args(stmt.args)
+            else:
+                rng = ops.iterate(self.evaluate(stmt.iterable))
+            if stmt.reuse_env or not stmt.body.scoped:
+                return self._run_for(stmt, rng)
+            limits = self.limits
             for v in rng:
-                if first_iter and stmt.var not in self.env.values:
-                    self.env.define(stmt.var, v)
-                else:
-                    self.env.assign(stmt.var, v)
-                first_iter = False
-                self.execute(stmt.body)
+                if limits is not None:
+                    limits.tick()
+                # variabel loop selalu hidup di lingkup tempat 'untuk' berada
+                self._define(stmt.var, stmt.slot, v)
+                status = self.execute(stmt.body)
+                if status is not None:
+                    return status
         elif isinstance(stmt, ReturnStmt):
-            value = None if stmt.value is None else self.evaluate(stmt.value)
-            raise IceReturnSignal(value)
+            self.return_value = None if stmt.value is None else self.evaluate(stmt.value)
+            return RETURN
         elif isinstance(stmt, FunctionDecl):
-            func = IceFunction(stmt.name, stmt.params, stmt.body, self.env)
-            self.env.define(stmt.name, func)
+            func = IceFunction(stmt.name, stmt.params, stmt.body, self.env, code=self._home(stmt.body))
+            self._define(stmt.name, stmt.slot, func)
         elif isinstance(stmt, ClassDecl):
             methods = {}
             for m in stmt.methods:
                 if isinstance(m, FunctionDecl):
-                    methods[m.name] = IceFunction(m.name, m.params, m.body, self.env)
+                    methods[m.name] = IceFunction(m.name, m.params, m.body, self.env,
+                                                  code=self._home(m.body), is_method=True)
                 elif isinstance(m, PropertyDecl):
                     if m.getter is not None:
-                        methods[f"get_{m.name}"] = IceFunction(f"get_{m.name}", [], m.getter, self.env)
+                        methods[f"get_{m.name}"] = IceFunction(f"get_{m.name}", [], m.getter, self.env,
+                                                               code=self._home(m.getter), is_method=True)
                     if m.setter is not None:
                         param = [m.setter_param] if m.setter_param else []
-                        methods[f"set_{m.name}"] = IceFunction(f"set_{m.name}", param, m.setter, self.env)
+                        methods[f"set_{m.name}"] = IceFunction(f"set_{m.name}", param, m.setter, self.env,
+                                                               code=self._home(m.setter), is_method=True)
                 else:
                     raise IceRuntimeError('Anggota kelas tidak dikenal saat konstruksi.')
             superclass = None
@@ -89,7 +179,9 @@ class Interpreter:
                     fn.owner = klass
                 except Exception:
                     pass
-            self.env.define(stmt.name, klass)
+            self._define(stmt.name, stmt.slot, klass)
+        elif isinstance(stmt, ImportStmt):
+            self._define(stmt.name, stmt.slot, self.import_module(stmt.path))
         else:
             raise IceRuntimeError(f"Pernyataan tidak dikenal: {stmt}")
 
@@ -98,17 +190,50 @@ class Interpreter:
         try:
             self.env = new_env
             for st in statements:
-                self.execute(st)
+                status = self.execute(st)
+                if status is not None:
+                    return status
         finally:
             self.env = prev
 
+    def _run_for(self, stmt: ForRangeStmt, rng: Iterable[Any]):
+        # Jalur cepat 'untuk': badan tanpa lingkup langsung dijalankan di lingkup
+        # luar; badan berlingkup tanpa closure memakai satu Environment yang
+        # slot-nya dikosongkan tiap iterasi.
+        env, body, slot, var = self.env, stmt.body, stmt.slot, stmt.var
+        statements, execute = body.statements, self.execute
+        inner = Environment(env, body.layout) if body.scoped else env
+        inner_slots, fresh = inner.slots, list(inner.slots) if body.scoped else None
+        outer_slots, limits = env.slots, self.limits
+        try:
+            self.env = inner
+            for v in rng:
+                if limits is not None:
+                    limits.tick()
+                if slot is None:
+                    env.define(var, v)
+                else:
+                    outer_slots[slot] = v
+                if fresh is not None:
+                    inner_slots[:] = fresh
+                for st in statements:
+                    status = execute(st)
+                    if status is not None:
+                        return status
+        finally:
+            self.env = env
+        return None
+
     def evaluate(self, expr: Expr) -> Any:
         if isinstance(expr, Literal):
             return expr.value
         if isinstance(expr, Variable):
-            return self.env.get(expr.name)
+            depth = expr.depth
+            if depth is not None and depth >= 0:
+                return self.env.get_at(depth, expr.slot, expr.name)
+            return self._lookup(expr.name, depth, expr.slot)
         if isinstance(expr, This):
-            return self.env.get('ini')
+            return self._lookup('ini', expr.depth, expr.slot)
         if isinstance(expr, SuperGet):
             inst = self.env.get('ini')
             try:
@@ -124,29 +249,73 @@ class Interpreter:
             return m.bind(inst)
         if isinstance(expr, Assign):
             val = self.evaluate(expr.value)
-            self.env.assign(expr.name, val)
+            if expr.depth is None:
+                self.env.assign(expr.name, val)
+            elif expr.depth < 0:
+                self.globals.assign(expr.name, val)
+            else:
+                self.env.assign_at(expr.depth, expr.slot, expr.name, val)
             return val
         if isinstance(expr, Get):
             obj = self.evaluate(expr.obj)
+            site = expr.site
+            if site is not None:
+                q = site.quick
+                if q is not None and type(obj) is IceInstance:
+                    if not q:
+                        fields = obj.fields
+                        if expr.name in fields:
+                            return fields[expr.name]
+                    elif expr.name not in obj.fields:
+                        getter = obj.klass.resolve_get(expr.name)[0]
+                        if getter is not None and getter.body is q:
+                            return getter.call(self, [], obj)
+            elif self.quickening:
+                site = expr.site = Site()
             if isinstance(obj, IceInstance):
-                current = None
-                try:
-                    current = self.env.get('ini')
-                except Exception:
-                    current = None
-                return obj.get(expr.name, current, self)
+                if site is not None and site.count >= 0:
+                    observe_get(site, obj, expr.name)
+                current = self._current_instance()
+                cache = expr.cache
+                if cache is None:
+                    cache = expr.cache = AttrCache(expr.name)
+                return obj.get(expr.name, current, self, cache)
+            if type(obj) is IceModule:
+                return obj.get(expr.name)
             raise IceRuntimeError('Akses properti pada non-objek.')
         if isinstance(expr, Set):
             obj = self.evaluate(expr.obj)
             val = self.evaluate(expr.value)
             if isinstance(obj, IceInstance):
-                current = None
-                try:
-                    current = self.env.get('ini')
-                except Exception:
-                    current = None
-                return obj.set(expr.name, val, current, self)
+                current = self._current_instance()
+                cache = expr.cache
+                if cache is None:
+                    cache = expr.cache = AttrCache(expr.name, True)
+                return obj.set(expr.name, val, current, self, cache)
             raise IceRuntimeError('Penetapan properti pada non-objek.')
+        if isinstance(expr, Index):
+            obj = self.evaluate(expr.obj)
+            key = self.evaluate(expr.index)
+            if type(obj) is list and type(key) is int and -len(obj) <= key < len(obj):
+                return obj[key]
+            return ops.op_index(obj, key)
+        if isinstance(expr, SetIndex):
+            obj = self.evaluate(expr.obj)
+            key = self.evaluate(expr.index)
+            value = self.evaluate(expr.value)
+            if self.limits is not None:
+                self.limits.set_index(obj, key)
+            return ops.op_set_index(obj, key, value)
+        if isinstance(expr, ListExpr):
+            value = [self.evaluate(x) for x in expr.elements]
+            if self.limits is not None:
+                self.limits.alloc(value)
+            return value
+        if isinstance(expr, DictExpr):
+            value = ops.build_dict([(self.evaluate(k), self.evaluate(v)) for k, v in expr.entries])
+            if self.limits is not None:
+                self.limits.alloc(value)
+            return value
         if isinstance(expr, Grouping):
             return self.evaluate(expr.expr)
         if isinstance(expr, Unary):
@@ -160,12 +329,28 @@ class Interpreter:
             left = self.evaluate(expr.left)
             right = self.evaluate(expr.right)
             op = expr.op
+            if expr.num:
+                return ops.NUM_OPS[op](left, right)
+            site = expr.site
+            if site is not None:
+                q = site.quick
+                if q is not None and type(left) is q[0] and type(right) is q[1]:
+                    if q[3] and self.limits is not None:
+                        value = q[2](left, right)
+                        self.limits.alloc(value)
+                        return value
+                    return q[2](left, right)
+                if site.count >= 0:
+                    observe_binary(site, op, left, right)
+            elif self.quickening:
+                expr.site = Site()
             if op == "+":
                 if isinstance(left, (int, float)) and isinstance(right, (int, float)):
                     return left + right
-                if isinstance(left, str) or isinstance(right, str):
-                    return str(left) + str(right)
-                raise IceRuntimeError("Operator '+': tipe tidak cocok.")
+                value = ops.op_add(left, right)
+                if self.limits is not None:
+                    self.limits.alloc(value)
+                return value
             if op == "-": return self._num(left, "'-' butuh angka") - self._num(right, "'-' butuh angka")
             if op == "*": return self._num(left, "'*' butuh angka") * self._num(right, "'*' butuh angka")
             if op == "/": return self._num(left, "'/' butuh angka") / self._num(right, "'/' butuh angka")
@@ -192,7 +377,54 @@ class Interpreter:
                 return klass.call(self, args)
             raise IceRuntimeError('Target "baru" bukan kelas yang dapat diinstansiasi.')
         if isinstance(expr, Call):
-            callee = self.evaluate(expr.callee)
+            target = expr.callee
+            site = expr.site
+            if site is None and self.quickening:
+                site = expr.site = Site()
+            if type(target) is Get:
+                # `obj.m(args)`: method dipanggil langsung dengan 'ini' = obj,
+                # tanpa membuat bound method lewat Get
+                obj = self.evaluate(target.obj)
+                if site is not None:
+                    q = site.quick
+                    if q is not None and type(obj) is IceInstance and target.name not in obj.fields:
+                        getter, method = obj.klass.resolve_get(target.name)
+                        if getter is None and method is not None and method.body is q:
+                            args = [self.evaluate(a) for a in expr.args]
+                            if expr.tail:
+                                return TailCall(method, method.new_frame(args, obj), self)
+                            return method.call(self, args, obj)
+                if isinstance(obj, IceInstance):
+                    current = self._current_instance()
+                    cache = target.cache
+                    if cache is None:
+                        cache = target.cache = AttrCache(target.name)
+                    method = obj.method_for(target.name, current, cache)
+                    if site is not None and site.count >= 0:
+                        observe_method(site, obj, target.name, method, len(expr.args))
+                    if method is not None:
+                        args = [self.evaluate(a) for a in expr.args]
+                        if len(args) != len(method.params):
+                            raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {len(method.params)}, diberi {len(args)}.")
+                        if expr.tail:
+                            return TailCall(method, method.new_frame(args, obj), self)
+                        return method.call(self, args, obj)
+                    callee = obj.get(target.name, current, self, cache)
+                elif type(obj) is IceModule:
+                    callee = obj.get(target.name)
+                else:
+                    raise IceRuntimeError('Akses properti pada non-objek.')
+            else:
+                callee = self.evaluate(target)
+                if site is not None:
+                    q = site.quick
+                    if q is not None and (type(callee) is q or type(callee) is IceFunction and callee.body is q):
+                        args = [self.evaluate(a) for a in expr.args]
+                        if expr.tail and type(callee) is IceFunction:
+                            return TailCall(callee, callee.new_frame(args), self)
+                        return callee.call(self, args)
+                    if site.count >= 0:
+                        observe_call(site, callee, len(expr.args))
             args = [self.evaluate(a) for a in expr.args]
             if hasattr(callee, "call"):
                 name = getattr(callee, 'name', type(callee).__name__)
@@ -204,10 +436,34 @@ class Interpreter:
                 oname = getattr(owner, 'name', None)
                 if arity >= 0 and len(args) != arity:
                     raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {arity}, diberi {len(args)}.")
+                if expr.tail and type(callee) is IceFunction:
+                    return TailCall(callee, callee.new_frame(args), self)
                 return callee.call(self, args)
             raise IceRuntimeError("Objek tidak dapat dipanggil sebagai fungsi.")
         raise IceRuntimeError(f"Ekspresi tidak didukung: {expr}")
 
+    def _current_instance(self):
+        # instance pemilik method yang sedang berjalan (untuk cek akses), atau None
+        try:
+            return self.env.get('ini')
+        except Exception:
+            return None
+
+    # Alamat dari Resolver: depth None = belum di-resolve (cari per nama),
+    # depth < 0 = global, selain itu (depth, slot) di rantai lingkup.
+    def _lookup(self, name: str, depth, slot: int):
+        if depth is None:
+            return self.env.get(name)
+        if depth < 0:
+            return self.globals.get(name)
+        return self.env.get_at(depth, slot, name)
+
+    def _define(self, name: str, slot, value):
+        if slot is None:
+            self.env.define(name, value)
+        else:
+            self.env.slots[slot] = value
+
     def _num(self, v, msg):
         if isinstance(v, (int, float)): return v
         raise IceRuntimeError(msg)
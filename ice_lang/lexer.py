@@ -1,5 +1,6 @@
 
 from __future__ import annotations
+import re
 from .tokens import Token, TokenType, KEYWORDS
 from .errors import IceSyntaxError
 
@@ -61,6 +62,8 @@ class Lexer:
         if c == ')': self._add(TokenType.RIGHT_PAREN); return
         if c == '{': self._add(TokenType.LEFT_BRACE); return
         if c == '}': self._add(TokenType.RIGHT_BRACE); return
+        if c == '[': self._add(TokenType.LEFT_BRACKET); return
+        if c == ']': self._add(TokenType.RIGHT_BRACKET); return
         if c == ',': self._add(TokenType.COMMA); return
         if c == '.': self._add(TokenType.DOT); return
         if c == ':': self._add(TokenType.COLON); return
@@ -131,3 +134,90 @@ class Lexer:
             return
 
         raise IceSyntaxError(f"Karakter tidak dikenal: {c}", self.line, self.col)
+
+# Lexer cepat berbasis satu regex induk: whitespace, identifier, angka dan
+# string dipindai sekaligus per run, bukan per karakter. Keluaran token
+# (tipe, lexeme, literal, baris, kolom) identik dengan Lexer di atas, termasuk
+# konvensi kolom = posisi setelah akhir token.
+#
+# Whitespace di depan token ikut ditelan oleh setiap match dan grup token
+# bersifat opsional, sehingga finditer tidak pernah melompati karakter: match
+# tanpa grup berarti akhir sumber atau karakter yang tidak dikenal.
+_MASTER = re.compile(r'''
+    [ \t\r]*
+    (?:
+        (?P<ident>[^\W\d]\w*)
+      | (?P<op>==|!=|>=|<=|[(){}\[\],.:;+\-*%=!<>])
+      | (?P<nl>\n)
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<comment>//[^\n]*)
+    )?
+''', re.VERBOSE | re.DOTALL)
+
+_OPERATORS = {
+    '(': TokenType.LEFT_PAREN, ')': TokenType.RIGHT_PAREN,
+    '{': TokenType.LEFT_BRACE, '}': TokenType.RIGHT_BRACE,
+    '[': TokenType.LEFT_BRACKET, ']': TokenType.RIGHT_BRACKET,
+    ',': TokenType.COMMA, '.': TokenType.DOT, ':': TokenType.COLON,
+    ';': TokenType.SEMICOLON, '+': TokenType.PLUS, '-': TokenType.MINUS,
+    '*': TokenType.STAR, '%': TokenType.PERCENT,
+    '!': TokenType.BANG, '!=': TokenType.BANG_EQUAL,
+    '=': TokenType.EQUAL, '==': TokenType.EQUAL_EQUAL,
+    '>': TokenType.GREATER, '>=': TokenType.GREATER_EQUAL,
+    '<': TokenType.LESS, '<=': TokenType.LESS_EQUAL,
+}
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+
+def _unescape(m) -> str:
+    c = m.group(1)
+    return _ESCAPES.get(c, c)
+
+class FastLexer:
+    def __init__(self, source: str):
+        self.source = source
+
+    def scan_tokens(self) -> list[Token]:
+        return list(self.iter_tokens())
+
+    def iter_tokens(self):
+        # Generator: Parser dapat mengonsumsi token tanpa membangun list penuh.
+        source = self.source
+        keywords, operators = KEYWORDS, _OPERATORS
+        IDENT, NUMBER, STRING = TokenType.IDENT, TokenType.NUMBER, TokenType.STRING
+        line, line_start, pos = 1, 0, 0
+        for m in _MASTER.finditer(source):
+            kind = m.lastgroup
+            pos = m.end()
+            if kind == 'ident':
+                text = m.group(kind)
+                yield Token(keywords.get(text, IDENT), text, None, line, pos - line_start + 1)
+            elif kind == 'op':
+                text = m.group(kind)
+                yield Token(operators[text], text, None, line, pos - line_start + 1)
+            elif kind == 'nl':
+                line += 1
+                line_start = pos
+            elif kind == 'number':
+                text = m.group(kind)
+                yield Token(NUMBER, text, float(text) if '.' in text else int(text), line, pos - line_start + 1)
+            elif kind == 'string':
+                text = m.group(kind)
+                body = text[1:-1]
+                if '\\' in body:
+                    body = _ESCAPE_RE.sub(_unescape, body)
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = m.start(kind) + text.rindex('\n') + 1
+                yield Token(STRING, text, body, line, pos - line_start + 1)
+            elif kind is None:
+                if pos >= len(source):
+                    break
+                col = pos + 2 - line_start  # kolom setelah karakter bermasalah
+                if source[pos] == '"':
+                    raise IceSyntaxError("String tidak tertutup", line, col)
+                raise IceSyntaxError(f"Karakter tidak dikenal: {source[pos]}", line, col)
+        yield Token(TokenType.EOF, "", None, line, pos - line_start + 1)
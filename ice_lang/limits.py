@@ -0,0 +1,136 @@
+
+from __future__ import annotations
+import time
+from typing import Any
+from .errors import StepLimitError, DepthLimitError, TimeLimitError, MemoryLimitError
+from .runtime import Rope, SIZE_INSTANCE
+
+# Batas eksekusi untuk menjalankan kode yang tidak dipercaya (multi-tenant).
+#   langkah  - satu iterasi loop atau satu pemanggilan tugas/method; hanya itu
+#              yang bisa membuat program berjalan tanpa batas, jadi kode lurus
+#              tidak perlu dihitung
+#   depth    - kedalaman panggilan ICE, terlepas dari tumpukan Python
+#   waktu    - tenggat jam dinding, dicek tiap CHECK_EVERY langkah
+#   memori   - perkiraan total byte yang dialokasikan untuk teks, daftar, peta
+#              dan instance (kumulatif, bukan memori hidup; dipakai sebagai kuota)
+# Interpreter tanpa Limits (limits=None) tidak membayar apa pun selain cek None
+# di loop dan panggilan. Dengan Limits, tiap langkah cukup mengurangi `fuel`;
+# pengecekan sebenarnya hanya terjadi saat fuel habis.
+
+CHECK_EVERY = 1000
+# frame Python per panggilan ICE (perkiraan atas; bertambah dengan kedalaman
+# blok di badan tugas); dipakai untuk menaikkan sys.setrecursionlimit agar
+# max_depth bisa benar-benar dicapai
+PY_FRAMES_PER_CALL = 20
+# plafon sys.setrecursionlimit: di atas sekitar 20000 frame CPython 3.10 sudah
+# kehabisan tumpukan C (8 MB) dan crash (SIGSEGV) sebelum RecursionError.
+# max_depth yang lebih besar dari yang muat di sini tetap berakhir dengan
+# DepthLimitError di engine tree/closure (sekitar 2000 panggilan); rekursi lebih
+# dalam butuh engine vm
+MAX_RECURSION_LIMIT = 16_000
+
+# kedalaman maksimum VM bila tidak ada Limits: frame VM tidak memakai tumpukan
+# Python, jadi tanpa batas ini rekursi tak berujung baru berhenti saat memori habis
+DEFAULT_MAX_DEPTH = 1_000_000
+
+# perkiraan ukuran alokasi (byte), mendekati CPython 64-bit
+SIZE_STR = 49
+SIZE_LIST = 56
+SIZE_DICT = 64
+SIZE_REF = 8
+SIZE_ENTRY = 100
+
+def allocated(value: Any) -> int:
+    # byte baru untuk nilai hasil operasi; angka dan nilai lain dianggap gratis
+    t = type(value)
+    if t is str:
+        return SIZE_STR + len(value)
+    if t is Rope:
+        # hanya potongan yang baru ditambahkan ke buffer
+        return SIZE_REF + len(value.parts[value.count - 1])
+    if t is list:
+        return SIZE_LIST + SIZE_REF * len(value)
+    if t is dict:
+        return SIZE_DICT + SIZE_ENTRY * len(value)
+    return 0
+
+class Limits:
+    __slots__ = ('max_steps', 'max_depth', 'max_time', 'max_memory',
+                 'steps', 'depth', 'memory', 'deadline', 'fuel', '_chunk')
+
+    def __init__(self, max_steps: int | None = None, max_depth: int | None = None,
+                 max_time: float | None = None, max_memory: int | None = None):
+        self.max_steps = max_steps
+        self.max_depth = max_depth
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.start()
+
+    def fresh(self) -> 'Limits':
+        # batas yang sama dengan penghitung baru (satu per eksekusi)
+        return Limits(self.max_steps, self.max_depth, self.max_time, self.max_memory)
+
+    def start(self):
+        # dipanggil Interpreter.interpret(): setiap eksekusi mulai dari nol
+        self.steps = 0
+        self.depth = 0
+        self.memory = 0
+        self.deadline = None if self.max_time is None else time.monotonic() + self.max_time
+        self._refill()
+
+    @property
+    def used_steps(self) -> int:
+        return self.steps + self._chunk - self.fuel
+
+    def tick(self):
+        self.fuel -= 1
+        if self.fuel < 0:
+            self._checkpoint()
+
+    def enter(self):
+        # awal pemanggilan ICE; pemanggil menurunkan depth saat selesai
+        self.depth += 1
+        if self.max_depth is not None and self.depth > self.max_depth:
+            self.depth -= 1
+            raise DepthLimitError(f"Kedalaman panggilan melebihi batas ({self.max_depth}).")
+        self.fuel -= 1
+        if self.fuel < 0:
+            self._checkpoint()
+
+    def alloc(self, value: Any):
+        self.grow(allocated(value))
+
+    def grow(self, size: int):
+        self.memory += size
+        if self.max_memory is not None and self.memory > self.max_memory:
+            raise MemoryLimitError(f"Alokasi memori melebihi batas ({self.max_memory} byte).")
+
+    def set_index(self, obj: Any, key: Any):
+        # sebelum obj[key] = v: hanya kunci baru pada peta yang menambah memori
+        if type(obj) is dict:
+            try:
+                new = key not in obj
+            except TypeError:
+                return  # kunci tak valid: op_set_index yang melaporkan galatnya
+            if new:
+                self.grow(SIZE_ENTRY)
+
+    def _checkpoint(self):
+        self.steps += self._chunk + 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            self.fuel = self._chunk = 0
+            raise StepLimitError(f"Jumlah langkah melebihi batas ({self.max_steps}).")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self._refill()
+            raise TimeLimitError(f"Waktu eksekusi melebihi batas ({self.max_time:g} detik).")
+        self._refill()
+
+    def _refill(self):
+        chunk = CHECK_EVERY
+        if self.max_steps is not None:
+            chunk = max(0, min(chunk, self.max_steps - self.steps))
+        self.fuel = self._chunk = chunk
+
+    def __repr__(self):
+        return (f"Limits(langkah={self.used_steps}/{self.max_steps}, depth={self.depth}/{self.max_depth}, "
+                f"memori={self.memory}/{self.max_memory})")
@@ -1,23 +1,36 @@
 
 from pathlib import Path
-import sys
-from .lexer import Lexer
-from .parser import Parser
-from .interpreter import Interpreter
-from .errors import IceSyntaxError, IceRuntimeError
+import sys, argparse
+from . import cache
+
+# icec: prakompilasi berkas .ice (atau seluruh direktori) ke __icecache__/*.icec
+# sehingga `ice file.ice` berikutnya melewati lexer/parser.
 
 def main():
-    if len(sys.argv) < 2:
-        print("Penggunaan: python -m ice_lang.main <file.ice>")
-        sys.exit(2)
-    path = Path(sys.argv[1])
-    source = path.read_text(encoding="utf-8")
-    try:
-        lexer = Lexer(source)
-        tokens = lexer.scan_tokens()
-        parser = Parser(tokens)
-        program = parser.parse()
-        Interpreter().interpret(program)
-    except (IceSyntaxError, IceRuntimeError) as e:
-        print(e)
-        sys.exit(1)
+    ap = argparse.ArgumentParser(prog="icec", description="Prakompilasi berkas ICE ke cache .icec")
+    ap.add_argument("paths", nargs="+", help="berkas .ice atau direktori (dicari rekursif)")
+    ap.add_argument("-f", "--force", action="store_true", help="kompilasi ulang walau cache masih segar")
+    ap.add_argument("-q", "--quiet", action="store_true", help="hanya tampilkan galat")
+    ap.add_argument("-O", "--optimize", action="store_true", help="simpan AST teroptimasi (<nama>.opt.icec, untuk `ice -O`)")
+    args = ap.parse_args()
+
+    failed = 0
+    for p in args.paths:
+        root = Path(p)
+        if not root.exists():
+            print(f"File tidak ditemukan: {root}", file=sys.stderr)
+            failed += 1
+            continue
+        for src, status, err in cache.compile_tree(root, force=args.force, optimize=args.optimize):
+            if err is not None:
+                print(f"{src}: {err}", file=sys.stderr)
+                failed += 1
+            elif status == "gagal-tulis":
+                print(f"{src}: cache tidak dapat ditulis", file=sys.stderr)
+                failed += 1
+            elif not args.quiet:
+                print(f"{src}: {status}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
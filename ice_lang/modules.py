@@ -0,0 +1,139 @@
+
+from __future__ import annotations
+import os, threading
+from pathlib import Path
+from typing import Any
+from . import cache
+from .ast import Stmt
+from .builtins import BUILTINS
+from .errors import IceSyntaxError, IceRuntimeError
+from .typecheck import check as check_types
+from .optimizer import Optimizer
+from .runtime import Environment
+
+# Sistem modul (`impor`).
+#   impor util;                    -> util.ice, diikat ke nama `util`
+#   impor lib.teks;                -> lib/teks.ice, diikat ke nama `teks`
+#   impor "vendor/x.ice" sebagai x;
+# Path dicari relatif ke direktori berkas yang mengimpor, lalu direktori program
+# utama (direktori kerja untuk stdin/REPL/Engine), lalu direktori di ICE_PATH.
+# Dua tingkat cache:
+#   - AST per proses (_PROGRAMS): setiap berkas modul di-lex/parse/resolve sekali
+#     per proses (lewat cache .icec di disk bila diizinkan), dipakai bersama oleh
+#     semua interpreter;
+#   - global modul per ModuleLoader: badan modul dijalankan sekali dan Environment
+#     globalnya disimpan, jadi impor berikutnya hanya pencarian dict.
+# Badan modul dijalankan interpreter anak dengan kelas yang sama (global sendiri;
+# keluaran, batas eksekusi dan loader bersama). Tugas/kelas dari modul tetap
+# memakai global modulnya saat dipanggil dari luar.
+# lazy=True: `impor` hanya membuat objek modul; badannya baru dijalankan saat
+# salah satu namanya pertama kali diakses (m.nama). Impor melingkar yang
+# membutuhkan modul yang sedang dijalankan dilaporkan sebagai galat.
+# check_types=True: setiap modul diperiksa typecheck (mode ketat) sebelum
+# badannya dijalankan.
+
+SUFFIX = ".ice"
+
+_PROGRAMS: dict[tuple[Path, bool], list[Stmt]] = {}
+_lock = threading.Lock()
+
+def compile_module(path: Path, use_cache: bool = True, optimize: bool = False) -> list[Stmt]:
+    key = (path, optimize)
+    with _lock:
+        program = _PROGRAMS.get(key)
+        if program is None:
+            try:
+                source = path.read_text(encoding="utf-8")
+            except OSError as e:
+                raise IceRuntimeError(f"Modul tidak dapat dibaca: {path} ({e.strerror})") from None
+            try:
+                program = cache.load_or_compile(path, source, use_cache, Optimizer() if optimize else None)
+            except IceSyntaxError as e:
+                e.args = (f"{e} (modul {path})",)
+                raise
+            _PROGRAMS[key] = program
+    return program
+
+def search_path() -> list[Path]:
+    return [Path(p) for p in os.environ.get("ICE_PATH", "").split(os.pathsep) if p]
+
+class IceModule:
+    __slots__ = ('name', 'path', 'loader', 'env')
+
+    def __init__(self, name: str, path: Path, loader: 'ModuleLoader'):
+        self.name = name
+        self.path = path
+        self.loader = loader
+        self.env: Environment | None = None  # None = badan belum dijalankan (lazy)
+
+    def get(self, name: str) -> Any:
+        env = self.env
+        if env is None:
+            env = self.loader.execute(self)
+        try:
+            return env.values[name]
+        except KeyError:
+            raise IceRuntimeError(f"Modul '{self.name}' tidak memiliki '{name}'.") from None
+
+    def __str__(self):
+        return f"<modul {self.name}>"
+
+    __repr__ = __str__
+
+class ModuleLoader:
+    def __init__(self, interpreter, lazy: bool = False, use_cache: bool = True, optimize: bool = False,
+                 path: list[Path] | None = None, check_types: bool = False):
+        self.interpreter = interpreter  # interpreter akar; kelasnya dipakai untuk badan modul
+        self.lazy = lazy
+        self.use_cache = use_cache
+        self.optimize = optimize
+        self.check_types = check_types
+        self.path = search_path() if path is None else path
+        self.builtins = {name: builtin() for name, builtin in BUILTINS.items()}
+        self.modules: dict[Path, IceModule] = {}
+        self.loading: list[IceModule] = []  # modul yang badannya sedang dijalankan
+
+    def resolve(self, spec: str, importer: Path | None) -> Path:
+        rel = Path(spec) if spec.endswith(SUFFIX) else Path(*spec.split(".")).with_suffix(SUFFIX)
+        main = self.interpreter.path
+        roots = [importer.parent if importer is not None else Path.cwd(),
+                 main.parent if main is not None else Path.cwd(), *self.path]
+        for root in roots:
+            candidate = root / rel
+            if candidate.is_file():
+                return candidate.resolve()
+        raise IceRuntimeError(f"Modul tidak ditemukan: {spec}")
+
+    def load(self, spec: str, importer: Path | None) -> IceModule:
+        path = self.resolve(spec, importer)
+        module = self.modules.get(path)
+        if module is None:
+            module = self.modules[path] = IceModule(path.stem, path, self)
+        if not self.lazy:
+            self.execute(module)
+        return module
+
+    def execute(self, module: IceModule) -> Environment:
+        if module.env is not None:
+            return module.env
+        if module in self.loading:
+            self._cycle(module)
+        program = compile_module(module.path, self.use_cache, self.optimize)
+        if self.check_types:
+            try:
+                check_types(program)
+            except IceSyntaxError as e:
+                e.args = (f"{e} (modul {module.path})",)
+                raise
+        child = self.interpreter.module_interpreter(module.path)
+        self.loading.append(module)
+        try:
+            child.run(program)
+        finally:
+            self.loading.pop()
+        module.env = child.globals
+        return module.env
+
+    def _cycle(self, module: IceModule):
+        chain = self.loading[self.loading.index(module):] + [module]
+        raise IceRuntimeError("Impor melingkar: " + " -> ".join(m.path.name for m in chain))
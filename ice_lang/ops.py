@@ -0,0 +1,128 @@
+
+from __future__ import annotations
+import operator
+from typing import Any
+from .errors import IceRuntimeError
+from .runtime import Rope
+
+# Semantik operator ICE yang dipakai bersama oleh backend terkompilasi.
+# Pesan galat harus sama persis dengan Interpreter (tree-walker).
+
+def num(v, msg):
+    if isinstance(v, (int, float)): return v
+    raise IceRuntimeError(msg)
+
+def is_truthy(v) -> bool:
+    return bool(v)
+
+# Teks kiri sepanjang ini atau lebih disambung lewat Rope (lihat runtime.Rope);
+# teks pendek tetap str biasa.
+ROPE_MIN = 256
+
+def flat(v) -> Any:
+    return str(v) if type(v) is Rope else v
+
+def op_add(left, right) -> Any:
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left + right
+    if type(left) is Rope:
+        return left.append(str(right))
+    if isinstance(left, str) or isinstance(right, str) or type(right) is Rope:
+        left, right = str(left), str(right)
+        if len(left) >= ROPE_MIN:
+            return Rope([left, right], 2)
+        return left + right
+    raise IceRuntimeError("Operator '+': tipe tidak cocok.")
+
+def op_sub(left, right): return num(left, "'-' butuh angka") - num(right, "'-' butuh angka")
+def op_mul(left, right): return num(left, "'*' butuh angka") * num(right, "'*' butuh angka")
+def op_div(left, right): return num(left, "'/' butuh angka") / num(right, "'/' butuh angka")
+def op_mod(left, right): return num(left, "'%' butuh angka") % num(right, "'%' butuh angka")
+def op_eq(left, right): return left == right
+def op_ne(left, right): return left != right
+def op_gt(left, right): return num(left, "'>' butuh angka") > num(right, "'>' butuh angka")
+def op_ge(left, right): return num(left, "'>=' butuh angka") >= num(right, "'>=' butuh angka")
+def op_lt(left, right): return num(left, "'<' butuh angka") < num(right, "'<' butuh angka")
+def op_le(left, right): return num(left, "'<=' butuh angka") <= num(right, "'<=' butuh angka")
+
+BINARY_OPS = {
+    "+": op_add, "-": op_sub, "*": op_mul, "/": op_div, "%": op_mod,
+    "==": op_eq, "!=": op_ne,
+    ">": op_gt, ">=": op_ge, "<": op_lt, "<=": op_le,
+}
+
+# Operand yang terbukti angka (Binary.num dari typecheck): operator Python
+# langsung, hasilnya sama dengan jalur cepat angka di op_* di atas.
+NUM_OPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv, "%": operator.mod,
+    "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+}
+
+def op_neg(right): return -num(right, "unary '-' membutuhkan angka")
+def op_not(right): return not is_truthy(right)
+
+UNARY_OPS = {"-": op_neg, "bukan": op_not}
+
+def range_from_values(vals: list) -> range:
+    if not (1 <= len(vals) <= 3):
+        raise IceRuntimeError("rentang membutuhkan 1..3 argumen")
+    return range(*[int(a) for a in vals])
+
+# Koleksi: daftar = list, peta = dict Python (tambah/ambil amortized O(1)).
+def _check_index(obj, key):
+    if not isinstance(key, int) or isinstance(key, bool):
+        raise IceRuntimeError("Indeks daftar/teks harus bilangan bulat.")
+    if not -len(obj) <= key < len(obj):
+        raise IceRuntimeError(f"Indeks di luar jangkauan: {key}")
+
+def op_index(obj, key) -> Any:
+    if type(obj) is Rope:
+        obj = str(obj)
+    if type(obj) is dict:
+        try:
+            return obj[key]
+        except KeyError:
+            raise IceRuntimeError(f"Kunci tidak ditemukan: {key}") from None
+        except TypeError:
+            raise IceRuntimeError("Kunci peta tidak boleh daftar/peta.") from None
+    if type(obj) is list or type(obj) is str:
+        _check_index(obj, key)
+        return obj[key]
+    raise IceRuntimeError("Pengindeksan hanya untuk daftar, peta, atau teks.")
+
+def op_set_index(obj, key, value) -> Any:
+    if type(obj) is dict:
+        try:
+            obj[key] = value
+        except TypeError:
+            raise IceRuntimeError("Kunci peta tidak boleh daftar/peta.") from None
+        return value
+    if type(obj) is list:
+        _check_index(obj, key)
+        obj[key] = value
+        return value
+    raise IceRuntimeError("Penetapan indeks hanya untuk daftar atau peta.")
+
+def build_dict(pairs) -> dict:
+    d = {}
+    for k, v in pairs:
+        op_set_index(d, k, v)
+    return d
+
+def _iter_keys(d: dict):
+    try:
+        yield from d
+    except RuntimeError:
+        raise IceRuntimeError("Peta diubah selama diiterasi.") from None
+
+def iterate(value):
+    # `untuk x dalam <koleksi>`: iterator langsung atas koleksi (tanpa salinan);
+    # peta diiterasi per kunci
+    if type(value) is list or type(value) is range or type(value) is str:
+        return iter(value)
+    if type(value) is Rope:
+        return iter(str(value))
+    if type(value) is dict:
+        return _iter_keys(value)
+    raise IceRuntimeError("'untuk ... dalam' membutuhkan daftar, peta, teks, atau rentang.")
@@ -0,0 +1,408 @@
+
+from __future__ import annotations
+from .ast import *
+from .builtins import BUILTINS
+from . import ops
+
+# Optimizer AST opsional (`ice -O`), dijalankan antara Parser dan Resolver:
+# - melipat Binary/Unary/Logical yang operannya literal (lewat ops.*, jadi hasilnya
+#   identik dengan runtime; operasi yang akan gagal dibiarkan agar galatnya tetap
+#   muncul saat dieksekusi),
+# - membuang Grouping, cabang `jika` yang mati, `selagi` dengan kondisi salah dan
+#   ExprStmt literal,
+# - mengangkat ekspresi invarian keluar loop ke variabel sementara `$invN`.
+# Pengangkatan hanya untuk ekspresi yang murni dan tidak mungkin gagal
+# (==, !=, bukan, dan/atau, serta + dengan operan teks) atas variabel yang pasti
+# sudah terdefinisi dan tidak ditulis di dalam loop, dan hanya bila loop tidak
+# menjalankan kode ICE lain (tidak ada pemanggilan selain builtin, akses properti,
+# atau `baru`) yang bisa mengubah variabel tersebut. Loop yang mengubah daftar/peta
+# (penetapan indeks, tambah/hapus) juga tidak diangkat: `==` atas variabel yang
+# menunjuk koleksi yang sama bisa berubah nilainya.
+
+_FOLDABLE = (int, float, str, bool, type(None))
+_MUTATING = ("tambah", "hapus")
+
+# Rantai operator kiri (a + b + c ...) hasil generator bisa memuat puluhan ribu
+# operand; semua penelusuran di sini iteratif sepanjang rantai itu, seperti
+# Resolver dan TypeChecker.
+
+def count_nodes(node) -> int:
+    count = 0
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, (Expr, Stmt)):
+            count += 1
+            stack.extend(getattr(n, f) for f in n.__slots__)
+        elif isinstance(n, (list, tuple)):
+            stack.extend(n)
+    return count
+
+def _shape(e: Expr) -> tuple:
+    # kunci struktural ekspresi (pengganti repr yang rekursif); tipe nilai ikut
+    # agar 1, 1.0 dan benar tidak dianggap sama
+    out = []
+    stack: list = [e]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, (Expr, Stmt)):
+            out.append(type(n))
+            stack.extend(reversed([getattr(n, f) for f in n.__slots__]))
+        elif isinstance(n, (list, tuple)):
+            out.append(len(n))
+            stack.extend(reversed(n))
+        else:
+            out.append((type(n), n))
+    return tuple(out)
+
+def _walk(node):
+    # semua node Expr/Stmt di bawah node (termasuk dirinya), tidak masuk ke badan
+    # tugas/kelas bersarang
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, (list, tuple)):
+            stack.extend(n)
+        elif isinstance(n, (Expr, Stmt)):
+            yield n
+            if not isinstance(n, (FunctionDecl, ClassDecl)):
+                stack.extend(getattr(n, f) for f in n.__slots__)
+
+def is_temp(name: str) -> bool:
+    # variabel sementara hasil pengangkatan; di tingkat atas menjadi global, jadi
+    # disaring dari global yang diperlihatkan ke luar (Program.run, REPL)
+    return name.startswith("$inv")
+
+def _is_temp(st) -> bool:
+    return isinstance(st, VarDecl) and is_temp(st.name)
+
+def _is_str(e: Expr) -> bool:
+    while isinstance(e, Binary) and e.op == "+":
+        if _is_str(e.right):
+            return True
+        e = e.left
+    return isinstance(e, Literal) and isinstance(e.value, str)
+
+class Optimizer:
+    def __init__(self):
+        self.removed = 0
+        self.hoisted = 0
+        self.nodes_before: int | None = None  # None = belum dijalankan (mis. AST dari cache)
+        self.nodes_after = 0
+        self._written: set[str] = set()
+        self._defined: list[set[str]] = []
+
+    def optimize(self, statements: list[Stmt]) -> list[Stmt]:
+        # nama yang pernah ditulis di mana pun: builtin yang ditimpa tidak lagi aman
+        self._written = {n.name for n in _all_nodes(statements) if isinstance(n, (Assign, VarDecl, FunctionDecl, ClassDecl, ImportStmt))}
+        self._written |= {n.var for n in _all_nodes(statements) if isinstance(n, ForRangeStmt)}
+        self.nodes_before = count_nodes(statements)
+        statements = self._stmts(statements, set())
+        self.nodes_after = count_nodes(statements)
+        return statements
+
+    def report(self) -> str:
+        if self.nodes_before is None:
+            return "optimasi: AST teroptimasi dimuat dari cache"
+        return (f"optimasi: {self.nodes_before} -> {self.nodes_after} node "
+                f"({self.removed} dihapus, {self.hoisted} ekspresi diangkat keluar loop)")
+
+    # Statements
+    def _stmts(self, statements: list[Stmt], defined: set[str]) -> list[Stmt]:
+        self._defined.append(defined)
+        out: list[Stmt] = []
+        try:
+            for st in statements:
+                out.extend(self._stmt(st))
+                if isinstance(st, (VarDecl, FunctionDecl, ClassDecl, ImportStmt)):
+                    defined.add(st.name)
+        finally:
+            self._defined.pop()
+        return out
+
+    def _block(self, block: Block, defined: set[str] | None = None) -> Block:
+        block.statements = self._stmts(block.statements, defined or set())
+        return block
+
+    def _stmt(self, st: Stmt) -> list[Stmt]:
+        if isinstance(st, ExprStmt):
+            st.expr = self._expr(st.expr)
+            if isinstance(st.expr, Literal):
+                self.removed += 2
+                return []
+        elif isinstance(st, VarDecl):
+            if st.init is not None:
+                st.init = self._expr(st.init)
+        elif isinstance(st, Block):
+            self._block(st)
+        elif isinstance(st, IfStmt):
+            return self._if(st)
+        elif isinstance(st, WhileStmt):
+            st.condition = self._expr(st.condition)
+            if isinstance(st.condition, Literal) and not ops.is_truthy(st.condition.value):
+                self.removed += count_nodes(st)
+                return []
+            self._block(st.body)
+            return self._hoist(st, st)
+        elif isinstance(st, ForRangeStmt):
+            st.args = [self._expr(a) for a in st.args]
+            if st.iterable is not None:
+                st.iterable = self._expr(st.iterable)
+            self._block(st.body)
+            return self._hoist(st, st.body, loop_var=st.var)
+        elif isinstance(st, ReturnStmt):
+            if st.value is not None:
+                st.value = self._expr(st.value)
+        elif isinstance(st, FunctionDecl):
+            self._function(st.params, st.body)
+        elif isinstance(st, ClassDecl):
+            for m in st.methods:
+                if isinstance(m, FunctionDecl):
+                    self._function(m.params, m.body)
+                elif isinstance(m, PropertyDecl):
+                    if m.getter is not None:
+                        self._function([], m.getter)
+                    if m.setter is not None:
+                        self._function([m.setter_param] if m.setter_param else [], m.setter)
+        return [st]
+
+    def _function(self, params: list[str], body: Block):
+        self._block(body, set(params))
+
+    def _if(self, st: IfStmt) -> list[Stmt]:
+        branches = []
+        else_branch = st.else_branch
+        for i, (cond, blk) in enumerate(st.branches):
+            cond = self._expr(cond)
+            if not isinstance(cond, Literal):
+                branches.append((cond, self._block(blk)))
+                continue
+            if ops.is_truthy(cond.value):
+                # cabang ini pasti diambil: sisanya (dan else) tidak pernah jalan
+                self.removed += count_nodes(cond) + count_nodes(st.branches[i + 1:]) + count_nodes(else_branch)
+                else_branch = self._block(blk)
+                break
+            self.removed += count_nodes(cond) + count_nodes(blk)
+        else:
+            if else_branch is not None:
+                self._block(else_branch)
+        if branches:
+            st.branches, st.else_branch = branches, else_branch
+            return [st]
+        self.removed += 1
+        return [] if else_branch is None else [else_branch]
+
+    # Pengangkatan invarian loop
+    def _hoist(self, loop: Stmt, inside: Stmt, loop_var: str | None = None) -> list[Stmt]:
+        # inside: bagian yang dievaluasi tiap iterasi (selagi: kondisi + badan;
+        # untuk: badan saja, argumen rentang hanya dievaluasi sekali)
+        nodes = list(_walk(inside))
+        for n in nodes:
+            if isinstance(n, (Get, Set, SetIndex, NewExpr, SuperGet, FunctionDecl, ClassDecl, ImportStmt)):
+                return [loop]
+            if isinstance(n, Call) and (not self._builtin(n.callee) or n.callee.name in _MUTATING):
+                return [loop]
+        written = {n.name for n in nodes if isinstance(n, (Assign, VarDecl)) and not _is_temp(n)}
+        written |= {n.var for n in nodes if isinstance(n, ForRangeStmt)}
+        if loop_var is not None:
+            written.add(loop_var)
+        # variabel sementara dari loop dalam yang juga invarian di loop ini ikut
+        # dipindah keluar (bukan disalin ulang tiap iterasi)
+        body = loop.body
+        decls: list[Stmt] = []
+        for st in body.statements:
+            if _is_temp(st) and self._invariant(st.init, written):
+                decls.append(st)
+                self._defined[-1].add(st.name)
+        if decls:
+            body.statements = [st for st in body.statements if st not in decls]
+        written |= {n.name for n in nodes if _is_temp(n) and n not in decls}
+        hoisted: dict[tuple, Variable] = {}
+        memo: dict[int, bool] = {}
+        def replace(e: Expr) -> Expr:
+            if isinstance(e, (Binary, Unary, Logical)) and self._invariant(e, written, memo):
+                key = _shape(e)
+                var = hoisted.get(key)
+                if var is None:
+                    name = f"$inv{self.hoisted}"
+                    self.hoisted += 1
+                    decls.append(VarDecl(name, e, line=loop.line))
+                    var = hoisted[key] = Variable(name)
+                return Variable(var.name)
+            return e
+        _map_exprs(inside, replace)
+        for d in decls:
+            self._defined[-1].add(d.name)
+        return decls + [loop]
+
+    def _builtin(self, callee: Expr) -> bool:
+        return isinstance(callee, Variable) and callee.name in BUILTINS and callee.name not in self._written
+
+    def _is_defined(self, name: str) -> bool:
+        return any(name in scope for scope in self._defined)
+
+    def _invariant(self, e: Expr, written: set[str], memo: dict[int, bool] | None = None) -> bool:
+        # murni, tidak bisa gagal, dan nilainya sama di setiap iterasi.
+        # memo (id node -> hasil) dipakai _hoist: setiap sub-rantai dicek sekali
+        if isinstance(e, Literal):
+            return True
+        if isinstance(e, Variable):
+            return e.name not in written and self._is_defined(e.name)
+        if isinstance(e, Unary):
+            return e.op == "bukan" and self._invariant(e.right, written, memo)
+        if not isinstance(e, (Binary, Logical)):
+            return False
+        if memo is None:
+            memo = {}
+        # rantai kiri dihitung dari operand terdalam ke atas
+        spine = []
+        while isinstance(e, (Binary, Logical)) and id(e) not in memo:
+            spine.append(e)
+            e = e.left
+        ok = memo[id(e)] if id(e) in memo else self._invariant(e, written, memo)
+        if not spine:
+            return ok
+        left_str = _is_str(e)
+        for n in reversed(spine):
+            if isinstance(n, Logical):
+                ok = ok and self._invariant(n.right, written, memo)
+                left_str = False
+            else:
+                right_str = _is_str(n.right)
+                ok = (ok and n.op in ("==", "!=", "+") and (n.op != "+" or left_str or right_str)
+                      and self._invariant(n.right, written, memo))
+                left_str = n.op == "+" and (left_str or right_str)
+            memo[id(n)] = ok
+        return ok
+
+    # Expressions
+    def _expr(self, e: Expr) -> Expr:
+        if isinstance(e, (Grouping, Binary, Logical)):
+            return self._chain(e)
+        if isinstance(e, Unary):
+            e.right = self._expr(e.right)
+            if isinstance(e.right, Literal):
+                return self._fold(e, ops.UNARY_OPS.get(e.op), e.right.value)
+            return e
+        if isinstance(e, Assign):
+            e.value = self._expr(e.value)
+        elif isinstance(e, Call):
+            e.callee = self._expr(e.callee)
+            e.args = [self._expr(a) for a in e.args]
+        elif isinstance(e, Get):
+            e.obj = self._expr(e.obj)
+        elif isinstance(e, Set):
+            e.obj = self._expr(e.obj)
+            e.value = self._expr(e.value)
+        elif isinstance(e, NewExpr):
+            e.args = [self._expr(a) for a in e.args]
+        elif isinstance(e, ListExpr):
+            e.elements = [self._expr(x) for x in e.elements]
+        elif isinstance(e, DictExpr):
+            e.entries = [(self._expr(k), self._expr(v)) for k, v in e.entries]
+        elif isinstance(e, Index):
+            e.obj = self._expr(e.obj)
+            e.index = self._expr(e.index)
+        elif isinstance(e, SetIndex):
+            e.obj = self._expr(e.obj)
+            e.index = self._expr(e.index)
+            e.value = self._expr(e.value)
+        return e
+
+    def _chain(self, e: Expr) -> Expr:
+        # rantai kiri (a + b + c ...) secara iteratif: operand terdalam dulu,
+        # lalu setiap node ke atas dengan operand kiri yang sudah dioptimasi
+        spine = []
+        while isinstance(e, (Grouping, Binary, Logical)):
+            spine.append(e)
+            e = e.expr if isinstance(e, Grouping) else e.left
+        e = self._expr(e)
+        for n in reversed(spine):
+            if isinstance(n, Grouping):
+                self.removed += 1
+                continue
+            n.left = e
+            n.right = self._expr(n.right)
+            e = self._binary(n) if isinstance(n, Binary) else self._logical(n)
+        return e
+
+    def _binary(self, e: Binary) -> Expr:
+        if isinstance(e.left, Literal) and isinstance(e.right, Literal):
+            return self._fold(e, ops.BINARY_OPS.get(e.op), e.left.value, e.right.value)
+        return e
+
+    def _logical(self, e: Logical) -> Expr:
+        if isinstance(e.left, Literal):
+            # nilai Logical adalah salah satu operannya, bukan boolean
+            short = ops.is_truthy(e.left.value) == (e.op == "atau")
+            kept = e.left if short else e.right
+            self.removed += count_nodes(e) - count_nodes(kept)
+            return kept
+        return e
+
+    def _fold(self, e: Expr, fn, *values) -> Expr:
+        if fn is None:
+            return e
+        try:
+            value = fn(*values)
+        except Exception:
+            return e  # biarkan gagal saat runtime dengan pesan aslinya
+        if not isinstance(value, _FOLDABLE):
+            return e
+        self.removed += count_nodes(e) - 1
+        return Literal(value)
+
+def _all_nodes(statements: list[Stmt]):
+    # seperti _walk, tetapi juga masuk ke badan tugas/kelas
+    stack: list = [statements]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, (list, tuple)):
+            stack.extend(n)
+        elif isinstance(n, (Expr, Stmt)):
+            yield n
+            stack.extend(getattr(n, f) for f in n.__slots__)
+
+def _map_exprs(node, fn):
+    # ganti ekspresi maksimal di bawah node dengan fn(e) (fn mengembalikan e bila
+    # tidak diganti); tidak masuk ke badan tugas/kelas
+    for f in node.__slots__:
+        value = getattr(node, f)
+        if isinstance(value, Expr):
+            setattr(node, f, _map_expr(value, fn))
+        elif isinstance(value, Stmt):
+            if not isinstance(value, (FunctionDecl, ClassDecl)):
+                _map_exprs(value, fn)
+        elif isinstance(value, list):
+            setattr(node, f, [_map_item(x, fn) for x in value])
+
+def _map_item(x, fn):
+    if isinstance(x, Expr):
+        return _map_expr(x, fn)
+    if isinstance(x, tuple):
+        return tuple(_map_item(y, fn) for y in x)
+    if isinstance(x, Stmt) and not isinstance(x, (FunctionDecl, ClassDecl)):
+        _map_exprs(x, fn)
+    return x
+
+def _map_expr(e: Expr, fn) -> Expr:
+    new = fn(e)
+    if new is not e:
+        return new
+    # rantai kiri iteratif, urutan sama dengan rekursi: operand kiri dulu sampai
+    # yang terdalam, lalu operand kanan dari bawah ke atas
+    spine = []
+    node = e
+    while isinstance(node, (Binary, Logical)):
+        spine.append(node)
+        left = node.left
+        new = fn(left)
+        if new is not left:
+            node.left = new
+            break
+        node = left
+    else:
+        _map_exprs(node, fn)
+    for n in reversed(spine):
+        n.right = _map_expr(n.right, fn)
+    return e
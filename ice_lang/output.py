@@ -0,0 +1,48 @@
+
+from __future__ import annotations
+import sys
+from typing import Any, TextIO
+
+DEFAULT_BUFFER = 64 * 1024
+
+class Output:
+    # Keluaran program ICE (tampilkan), milik Interpreter. Baris dikumpulkan dan
+    # ditulis sekaligus bila buffer penuh, saat interpret() selesai atau gagal,
+    # dan sebelum prompt REPL berikutnya. buffer_size=0: tulis langsung per baris.
+    # stream=None berarti sys.stdout yang aktif saat flush (redirect_stdout tetap
+    # berlaku); selain itu objek apa pun yang punya write(), mis. io.StringIO.
+    __slots__ = ('stream', 'buffer_size', '_parts', '_size')
+
+    def __init__(self, stream: TextIO | None = None, buffer_size: int = DEFAULT_BUFFER):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write_line(self, args: list[Any]):
+        # format sama dengan print(*args)
+        self.write(" ".join([str(a) for a in args]) + "\n")
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        flush = getattr(stream, "flush", None)
+        if flush is not None:
+            flush()
+
+    def redirect(self, stream: TextIO | None) -> TextIO | None:
+        # ganti tujuan keluaran; sisa buffer ditulis ke tujuan lama dulu
+        self.flush()
+        old, self.stream = self.stream, stream
+        return old
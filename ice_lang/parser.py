@@ -1,13 +1,17 @@
 
 from __future__ import annotations
+from typing import Iterable
 from .tokens import Token, TokenType
 from .errors import IceSyntaxError
 from .ast import *
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
-        self.tokens = tokens
-        self.current = 0
+    def __init__(self, tokens: Iterable[Token]):
+        # Cukup satu token lookahead, jadi token bisa berupa list atau generator
+        # (mis. FastLexer.iter_tokens) yang dikonsumsi secara lazy.
+        self._tokens = iter(tokens)
+        self._current: Token = next(self._tokens)
+        self._prev: Token | None = None
 
     def parse(self) -> list[Stmt]:
         statements = []
@@ -17,18 +21,19 @@ class Parser:
 
     # Utilities
     def _peek(self) -> Token:
-        return self.tokens[self.current]
+        return self._current
 
     def _previous(self) -> Token:
-        return self.tokens[self.current - 1]
+        return self._prev
 
     def _is_at_end(self) -> bool:
-        return self._peek().type == TokenType.EOF
+        return self._current.type == TokenType.EOF
 
     def _advance(self) -> Token:
         if not self._is_at_end():
-            self.current += 1
-        return self._previous()
+            self._prev = self._current
+            self._current = next(self._tokens)
+        return self._prev
 
     def _check(self, t: TokenType) -> bool:
         if self._is_at_end():
@@ -50,17 +55,26 @@ class Parser:
 
     # Grammar
     def declaration(self) -> Stmt:
+        line = self._current.line
+        st = self._declaration()
+        st.line = line
+        return st
+
+    def _declaration(self) -> Stmt:
         if self._match(TokenType.KELAS):
             return self.class_declaration()
         if self._match(TokenType.TUGAS, TokenType.FUNGSI):
             return self.function_declaration()
+        if self._match(TokenType.IMPOR):
+            return self.import_declaration()
         if self._match(TokenType.BILANGAN, TokenType.DESIMAL, TokenType.TEKS, TokenType.BOOLEAN):
+            type_name = self._previous().lexeme
             name = self._consume(TokenType.IDENT, "Nama variabel diharapkan.")
             init = None
             if self._match(TokenType.EQUAL):
                 init = self.expression()
             self._consume(TokenType.SEMICOLON, "Titik koma ';' diharapkan setelah deklarasi variabel.")
-            return VarDecl(name.lexeme, init)
+            return VarDecl(name.lexeme, init, type=type_name)
         return self.statement()
 
     def function_declaration(self) -> Stmt:
@@ -75,7 +89,23 @@ class Parser:
                     break
         self._consume(TokenType.RIGHT_PAREN, "Diharapkan ')' setelah parameter.")
         block = self.block()
-        return FunctionDecl(name.lexeme, params, block)
+        return FunctionDecl(name.lexeme, params, block, line=name.line)
+
+    def import_declaration(self) -> Stmt:
+        # impor a.b;  |  impor a.b sebagai x;  |  impor "lib/a.ice" sebagai x;
+        if self._match(TokenType.STRING):
+            path = self._previous().literal
+            self._consume(TokenType.SEBAGAI, "Diharapkan 'sebagai' setelah path modul.")
+            name = self._consume(TokenType.IDENT, "Nama modul diharapkan setelah 'sebagai'.").lexeme
+        else:
+            parts = [self._consume(TokenType.IDENT, "Nama modul diharapkan setelah 'impor'.").lexeme]
+            while self._match(TokenType.DOT):
+                parts.append(self._consume(TokenType.IDENT, "Nama modul diharapkan setelah '.'.").lexeme)
+            path, name = ".".join(parts), parts[-1]
+            if self._match(TokenType.SEBAGAI):
+                name = self._consume(TokenType.IDENT, "Nama modul diharapkan setelah 'sebagai'.").lexeme
+        self._consume(TokenType.SEMICOLON, "Titik koma ';' diharapkan setelah impor.")
+        return ImportStmt(path, name)
 
     def class_declaration(self) -> Stmt:
         name = self._consume(TokenType.IDENT, "Nama kelas diharapkan.")
@@ -114,7 +144,7 @@ class Parser:
                 token = self._peek()
                 raise IceSyntaxError("Hanya 'get' atau 'set' di dalam properti.", token.line, token.column)
         self._consume(TokenType.RIGHT_BRACE, "Diharapkan '}' untuk menutup properti.")
-        return PropertyDecl(name_tok.lexeme, getter, setter_param, setter)
+        return PropertyDecl(name_tok.lexeme, getter, setter_param, setter, line=name_tok.line)
 
     def statement(self) -> Stmt:
         if self._match(TokenType.LEFT_BRACE):
@@ -137,9 +167,9 @@ class Parser:
         return ExprStmt(expr)
 
     def block(self) -> Block:
-        self._consume(TokenType.LEFT_BRACE, "Diharapkan '{' untuk memulai blok.")
+        line = self._consume(TokenType.LEFT_BRACE, "Diharapkan '{' untuk memulai blok.").line
         stmts = self._block_inner()
-        return Block(stmts)
+        return Block(stmts, line=line)
 
     def _block_inner(self) -> list[Stmt]:
         statements = []
@@ -175,19 +205,12 @@ class Parser:
     def for_range_statement(self) -> ForRangeStmt:
         var = self._consume(TokenType.IDENT, "Nama variabel loop diharapkan.").lexeme
         self._consume(TokenType.DALAM, "Diharapkan kata 'dalam'.")
-        self._consume(TokenType.IDENT, "Diharapkan nama 'rentang'.")
-        if self._previous().lexeme != "rentang":
-            raise IceSyntaxError("Gunakan 'rentang' dalam 'untuk ... dalam rentang(...)'.", self._previous().line, self._previous().column)
-        self._consume(TokenType.LEFT_PAREN, "Diharapkan '(' setelah rentang.")
-        args = []
-        if not self._check(TokenType.RIGHT_PAREN):
-            while True:
-                args.append(self.expression())
-                if not self._match(TokenType.COMMA):
-                    break
-        self._consume(TokenType.RIGHT_PAREN, "Diharapkan ')' setelah argumen rentang.")
+        source = self.expression()
         body = self.block()
-        return ForRangeStmt(var, args, body)
+        # `rentang(...)` tetap memakai jalur cepat tanpa objek range perantara
+        if isinstance(source, Call) and isinstance(source.callee, Variable) and source.callee.name == "rentang":
+            return ForRangeStmt(var, source.args, body)
+        return ForRangeStmt(var, [], body, iterable=source)
 
     # Expressions
     def expression(self) -> Expr:
@@ -202,6 +225,8 @@ class Parser:
                 return Assign(expr.name, value)
             if isinstance(expr, Get):
                 return Set(expr.obj, expr.name, value)
+            if isinstance(expr, Index):
+                return SetIndex(expr.obj, expr.index, value)
             raise IceSyntaxError("Target penugasan (assignment) tidak valid.", equals.line, equals.column)
         return expr
 
@@ -279,6 +304,10 @@ class Parser:
             elif self._match(TokenType.DOT):
                 name = self._consume(TokenType.IDENT, "Nama properti/method diharapkan setelah '.'").lexeme
                 expr = Get(expr, name)
+            elif self._match(TokenType.LEFT_BRACKET):
+                index = self.expression()
+                self._consume(TokenType.RIGHT_BRACKET, "Diharapkan ']' setelah indeks.")
+                expr = Index(expr, index)
             else:
                 break
         return expr
@@ -311,5 +340,24 @@ class Parser:
             expr = self.expression()
             self._consume(TokenType.RIGHT_PAREN, "Diharapkan ')' setelah ekspresi.")
             return Grouping(expr)
+        if self._match(TokenType.LEFT_BRACKET):
+            elements = []
+            while not self._check(TokenType.RIGHT_BRACKET):
+                elements.append(self.expression())
+                if not self._match(TokenType.COMMA):
+                    break
+            self._consume(TokenType.RIGHT_BRACKET, "Diharapkan ']' untuk menutup daftar.")
+            return ListExpr(elements)
+        if self._match(TokenType.LEFT_BRACE):
+            # '{' di posisi ekspresi selalu literal peta; blok hanya muncul sebagai statement
+            entries = []
+            while not self._check(TokenType.RIGHT_BRACE):
+                key = self.expression()
+                self._consume(TokenType.COLON, "Diharapkan ':' setelah kunci peta.")
+                entries.append((key, self.expression()))
+                if not self._match(TokenType.COMMA):
+                    break
+            self._consume(TokenType.RIGHT_BRACE, "Diharapkan '}' untuk menutup peta.")
+            return DictExpr(entries)
         token = self._peek()
         raise IceSyntaxError("Ekspresi tidak valid.", token.line, token.column)
@@ -0,0 +1,199 @@
+
+# Profiler untuk kode ICE (`ice --profile`), hanya untuk engine tree.
+# Instrumentasi hidup di subclass Interpreter sehingga eksekusi tanpa --profile
+# tidak membayar apa pun. Dua mode:
+#   deterministik - setiap masuk/keluar tugas diukur dengan perf_counter dan
+#                   setiap statement menambah hitungan barisnya;
+#   sampel        - thread terpisah mencatat tumpukan panggilan + baris aktif
+#                   tiap `interval` detik (lebih murah, hasilnya perkiraan).
+# Hasil: tabel per tugas (panggilan, waktu eksklusif/inklusif), baris terpanas,
+# dan berkas "collapsed stack" (`a;b;c N`) untuk flamegraph.pl/speedscope.
+from __future__ import annotations
+import sys, threading, time
+from collections import Counter
+from typing import Any
+from .ast import *
+from .interpreter import Interpreter
+from .limits import Limits
+from .optimizer import _all_nodes
+
+MODES = ("deterministik", "sampel")
+ROOT = ("<program>", 0)
+
+class _Node:
+    # simpul pohon panggilan; value = waktu eksklusif (detik) atau jumlah sampel
+    __slots__ = ('key', 'children', 'calls', 'value')
+
+    def __init__(self, key):
+        self.key = key
+        self.children: dict[tuple, _Node] = {}
+        self.calls = 0
+        self.value = 0
+
+def function_bodies(statements: list[Stmt]) -> dict[int, tuple[str, int]]:
+    # id(badan Block) -> (nama, baris); method diberi nama Kelas.metode
+    bodies: dict[int, tuple[str, int]] = {}
+    for n in _all_nodes(statements):
+        if isinstance(n, ClassDecl):
+            for m in n.methods:
+                if isinstance(m, FunctionDecl):
+                    bodies[id(m.body)] = (f"{n.name}.{m.name}", m.line)
+                    continue
+                if m.getter is not None:
+                    bodies[id(m.getter)] = (f"{n.name}.get_{m.name}", m.line)
+                if m.setter is not None:
+                    bodies[id(m.setter)] = (f"{n.name}.set_{m.name}", m.line)
+        elif isinstance(n, FunctionDecl):
+            bodies.setdefault(id(n.body), (n.name, n.line))
+    return bodies
+
+class ProfilingInterpreter(Interpreter):
+    module_engine = Interpreter  # badan modul yang diimpor tidak diprofilkan
+
+    def __init__(self, mode: str = "deterministik", interval: float = 0.001, limits: Limits | None = None):
+        super().__init__(limits=limits)
+        if mode not in MODES:
+            raise ValueError(f"mode profiler tidak dikenal: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.root = _Node(ROOT)
+        self.line_hits: Counter[int] = Counter()
+        self.total = 0.0
+        self._bodies: dict[int, tuple[str, int]] = {}
+        # frame: [simpul, waktu mulai, baris pemanggil]
+        self._stack: list[list] = [[self.root, 0.0, 0]]
+        self._line = 0
+        self._timed = mode == "deterministik"
+        self._sampler: threading.Thread | None = None
+        self._running = False
+
+    def interpret(self, statements: list[Stmt]):
+        self._bodies.update(function_bodies(statements))
+        self._start()
+        try:
+            super().interpret(statements)
+        finally:
+            self._stop()
+
+    def execute(self, stmt: Stmt):
+        if type(stmt) is Block:
+            key = self._bodies.get(id(stmt))
+            if key is not None:
+                self._enter(key)
+                try:
+                    return super().execute(stmt)
+                finally:
+                    self._leave()
+        else:
+            self._line = stmt.line
+            if self._timed:
+                self.line_hits[stmt.line] += 1
+        return super().execute(stmt)
+
+    # Pencatatan
+    def _enter(self, key):
+        parent = self._stack[-1][0]
+        node = parent.children.get(key)
+        if node is None:
+            node = parent.children[key] = _Node(key)
+        node.calls += 1
+        self._stack.append([node, time.perf_counter() if self._timed else 0.0, self._line])
+
+    def _leave(self):
+        node, start, line = self._stack.pop()
+        if self._timed:
+            now = time.perf_counter()
+            node.value += now - start
+            # waktu anak dikurangkan dari induk -> value menjadi eksklusif
+            self._stack[-1][0].value -= now - start
+        self._line = line
+
+    def _start(self):
+        self._running = True
+        self._t0 = time.perf_counter()
+        if not self._timed and self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def _stop(self):
+        elapsed = time.perf_counter() - self._t0
+        self.total += elapsed
+        if self._timed:
+            self.root.value += elapsed
+        self._running = False
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample_loop(self):
+        while self._running:
+            time.sleep(self.interval)
+            try:
+                node = self._stack[-1][0]
+            except IndexError:
+                continue
+            node.value += 1
+            self.line_hits[self._line] += 1
+
+    # Laporan
+    def stats(self) -> dict[tuple, list]:
+        # kunci -> [panggilan, eksklusif, inklusif]; rekursi dihitung sekali
+        # dalam inklusif (hanya di kemunculan terluar pada tumpukan)
+        result: dict[tuple, list] = {}
+
+        def visit(node: _Node, on_path: frozenset) -> Any:
+            total = node.value
+            for child in node.children.values():
+                total += visit(child, on_path | {node.key})
+            row = result.setdefault(node.key, [0, 0, 0])
+            row[0] += node.calls
+            row[1] += node.value
+            if node.key not in on_path:
+                row[2] += total
+            return total
+
+        visit(self.root, frozenset())
+        return result
+
+    def table(self, limit: int = 20) -> str:
+        unit = "s" if self._timed else "sampel"
+        fmt = (lambda v: f"{v:10.4f}") if self._timed else (lambda v: f"{v:10d}")
+        total = f"{self.total:.4f}s" if self._timed else f"{self.root_samples()} sampel"
+        lines = [f"profil ({self.mode}), total {total}",
+                 f"{'panggilan':>10} {'eksklusif':>10} {'inklusif':>10}  tugas ({unit})"]
+        rows = sorted(self.stats().items(), key=lambda kv: kv[1][1], reverse=True)
+        for (name, line), (calls, excl, incl) in rows[:limit]:
+            where = f" (baris {line})" if line else ""
+            lines.append(f"{calls:>10} {fmt(excl)} {fmt(incl)}  {name}{where}")
+        hits = [(l, n) for l, n in self.line_hits.most_common() if l][:10]
+        if hits:
+            label = "eksekusi" if self._timed else "sampel"
+            lines.append(f"baris terpanas ({label}): " + ", ".join(f"{l}:{n}" for l, n in hits))
+        return "\n".join(lines)
+
+    def root_samples(self) -> int:
+        return sum(row[1] for row in self.stats().values())
+
+    def collapsed(self) -> list[str]:
+        # format flamegraph: "frame;frame;frame N" (N = mikrodetik atau sampel)
+        out: list[str] = []
+        scale = 1_000_000 if self._timed else 1
+
+        def visit(node: _Node, path: str):
+            name, line = node.key
+            path = f"{path};{name}:{line}" if path else name
+            value = round(node.value * scale)
+            if value > 0:
+                out.append(f"{path} {value}")
+            for child in node.children.values():
+                visit(child, path)
+
+        visit(self.root, "")
+        return out
+
+    def write_report(self, out_path, file=sys.stderr):
+        with open(out_path, "w", encoding="utf-8") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+        print(self.table(), file=file)
+        print(f"collapsed stack ditulis ke {out_path}", file=file)
@@ -0,0 +1,175 @@
+
+from __future__ import annotations
+import operator
+from typing import Any
+from .ast import Binary, Call, Get
+from .builtins import BUILTINS
+from .optimizer import _all_nodes
+from .ops import ROPE_MIN, NUM_OPS
+from .runtime import IceFunction, Rope
+
+# Spesialisasi adaptif ("quickening") untuk engine tree.
+# Setiap node Binary, Call dan Get menyimpan Site (dibuat saat pertama
+# dievaluasi, seperti AttrCache) yang mencatat tipe/target yang diamati jalur
+# umum. Setelah WARMUP evaluasi berturut-turut dengan pengamatan yang sama,
+# site dipasangi handler khusus (`quick`) yang dicek lebih dulu oleh
+# Interpreter.evaluate dengan guard murah:
+#   Binary - pasangan tipe operand (bilangan+bilangan, teks+teks, ...)
+#   Call   - badan tugas yang dipanggil atau kelas builtin-nya (arity sudah
+#            dicek); untuk `obj.m(...)` badan method hasil resolusi kelas obj
+#   Get    - field instance (`obj.x`) atau badan getter properti
+# Site hidup di AST yang dipakai bersama oleh banyak run (Engine/Program, cache
+# modul), jadi kuncinya harus stabil lintas run: node AST (badan tugas) atau
+# kelas Python builtin, tidak pernah objek IceFunction/IceClass yang dibuat
+# ulang setiap run (itu juga akan menahan objek run lama tetap hidup).
+# Guard gagal = deopt: site kembali ke jalur umum dan mulai pemanasan lagi;
+# setelah MAX_DEOPTS kali site dianggap polimorfik dan tidak dispesialisasi
+# lagi. `quick` selalu diganti utuh (satu tuple), jadi site yang dipakai
+# bersama beberapa thread (Engine) tidak pernah terlihat setengah jadi.
+# Nama berawalan '_' tidak dispesialisasi: cek aksesnya bergantung pemanggil.
+
+WARMUP = 8
+MAX_DEOPTS = 4
+
+# handler Binary: fn(left, right); tipe operand sudah dijaga oleh guard
+_NUMERIC = (int, float, bool)
+
+def _concat(left: str, right: str):
+    if len(left) >= ROPE_MIN:
+        return Rope([left, right], 2)
+    return left + right
+
+def _rope_append(left: Rope, right: str):
+    return left.append(right)
+
+def binary_handler(op: str, left: type, right: type):
+    # (fn, dibebankan ke kuota memori) atau None bila pasangan ini tidak punya
+    # jalur khusus
+    if left in _NUMERIC and right in _NUMERIC:
+        return NUM_OPS[op], False
+    if op == "==":
+        return operator.eq, False
+    if op == "!=":
+        return operator.ne, False
+    if op == "+" and right is str:
+        if left is str:
+            return _concat, True
+        if left is Rope:
+            return _rope_append, True
+    return None
+
+class Site:
+    __slots__ = ('quick', 'seen', 'count', 'deopts')
+
+    def __init__(self):
+        self.quick: Any = None  # handler terpasang (bentuknya per jenis node)
+        self.seen: Any = None   # pengamatan selama pemanasan
+        self.count = 0          # -1 = polimorfik, tidak dispesialisasi lagi
+        self.deopts = 0
+
+    def observe(self, key: Any) -> bool:
+        # dipanggil jalur umum; True bila pemanasan selesai dan handler untuk
+        # `key` boleh dipasang
+        if self.quick is not None:
+            # jalur umum dengan handler terpasang = guard gagal
+            self.quick = None
+            self.deopts += 1
+            if self.deopts >= MAX_DEOPTS:
+                self.count = -1
+                return False
+            self.seen, self.count = None, 0
+        if self.count < 0:
+            return False
+        if key != self.seen:
+            self.seen, self.count = key, 1
+            return False
+        self.count += 1
+        return self.count >= WARMUP
+
+    def install(self, quick: Any):
+        if quick is None:
+            self.count = -1  # tidak ada jalur khusus untuk pengamatan ini
+        else:
+            self.quick = quick
+
+def observe_binary(site: Site, op: str, left: Any, right: Any):
+    key = (type(left), type(right))
+    if site.observe(key):
+        handler = binary_handler(op, *key)
+        site.install(None if handler is None else (*key, *handler))
+
+# kelas builtin: arity-nya tetap per kelas, jadi aman dijadikan kunci
+_BUILTIN_TYPES = frozenset(BUILTINS.values())
+
+# Pengamatan memakai id() badan tugas (node AST tidak dibandingkan isinya);
+# handler yang dipasang adalah badannya sendiri, dicek dengan `is`.
+def _body(fn: Any):
+    return fn.body if type(fn) is IceFunction else None
+
+def observe_call(site: Site, callee: Any, nargs: int):
+    # tugas (badan tree-walker) atau builtin; IceClass dan pemanggil lain tidak
+    t = type(callee)
+    body = _body(callee)
+    if body is not None:
+        if site.observe(id(body)):
+            site.install(body if len(callee.params) == nargs else None)
+    elif t in _BUILTIN_TYPES:
+        if site.observe(t):
+            arity = callee.arity()
+            site.install(t if arity < 0 or arity == nargs else None)
+    else:
+        site.observe(None)
+
+def observe_method(site: Site, obj: Any, name: str, method: Any, nargs: int):
+    # `obj.m(...)` yang diselesaikan ke method kelas; subclass yang mewarisi
+    # method yang sama memakai handler yang sama
+    if name[0] == '_':
+        site.count = -1
+        return
+    body = _body(method)
+    if site.observe(None if body is None else id(body)):
+        site.install(body if body is not None and len(method.params) == nargs else None)
+
+def observe_get(site: Site, obj: Any, name: str):
+    # `obj.x`: field instance (tuple kosong) atau badan getter properti
+    if name[0] == '_':
+        site.count = -1
+        return
+    if name in obj.fields:
+        if site.observe(True):
+            site.install(())
+        return
+    body = _body(obj.klass.resolve_get(name)[0])
+    if site.observe(None if body is None else id(body)):
+        site.install(body)
+
+def stats(statements: list) -> dict[str, dict[str, int]]:
+    # ringkasan site per jenis node: berapa yang dievaluasi, dispesialisasi,
+    # polimorfik, dan total deopt
+    out = {kind: {"site": 0, "cepat": 0, "polimorfik": 0, "deopt": 0} for kind in ("biner", "panggil", "properti")}
+    for node in _all_nodes(statements):
+        t = type(node)
+        if t is Binary:
+            kind = "biner"
+        elif t is Call:
+            kind = "panggil"
+        elif t is Get:
+            kind = "properti"
+        else:
+            continue
+        site = node.site
+        if site is None:
+            continue
+        row = out[kind]
+        row["site"] += 1
+        row["cepat"] += site.quick is not None
+        row["polimorfik"] += site.count < 0
+        row["deopt"] += site.deopts
+    return out
+
+def report(statements: list) -> str:
+    rows = stats(statements)
+    lines = [f"{'site':<10} {'dievaluasi':>10} {'cepat':>7} {'polimorfik':>10} {'deopt':>7}"]
+    for kind, r in rows.items():
+        lines.append(f"{kind:<10} {r['site']:>10} {r['cepat']:>7} {r['polimorfik']:>10} {r['deopt']:>7}")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+
+from __future__ import annotations
+from .ast import *
+from .runtime import frame_layout
+
+GLOBAL = -1
+
+class Resolver:
+    # Pass statis antara Parser dan Interpreter: setiap referensi variabel diberi
+    # alamat (depth, slot) sehingga Interpreter tidak menelusuri rantai
+    # Environment per nama. Susunan lingkup harus sama dengan yang dibuat
+    # Interpreter: blok -> frame parameter (method: 'ini' di slot 0 frame itu).
+    # Nama yang tidak ada di lingkup lokal mana pun dianggap global.
+    # Blok tanpa deklarasi langsung tidak mendapat lingkup (Block.scoped=False);
+    # elide_scopes=False mematikannya (dipakai benchmark pembanding).
+    # `kembalikan f(...)` di badan tugas ditandai Call.tail (panggilan ekor);
+    # tail_calls=False mematikannya (benchmarks/tailcall.py).
+
+    def __init__(self, elide_scopes: bool = True, tail_calls: bool = True):
+        self.scopes: list[dict[str, int]] = []
+        self.elide_scopes = elide_scopes
+        self.tail_calls = tail_calls
+        self.closures = 0  # jumlah tugas/kelas yang sudah di-resolve
+        self.functions = 0  # kedalaman badan tugas/method yang sedang di-resolve
+
+    def resolve(self, statements: list[Stmt]) -> list[Stmt]:
+        for st in statements:
+            self._stmt(st)
+        return statements
+
+    # Lingkup
+    def _lookup(self, name: str) -> tuple[int, int]:
+        for depth, scope in enumerate(reversed(self.scopes)):
+            slot = scope.get(name)
+            if slot is not None:
+                return depth, slot
+        return GLOBAL, 0
+
+    def _declare(self, name: str) -> int | None:
+        if not self.scopes:
+            return None
+        scope = self.scopes[-1]
+        if name not in scope:
+            scope[name] = len(scope)
+        return scope[name]
+
+    def _block(self, block: Block):
+        # Semua deklarasi langsung di blok mendapat slot lebih dulu, agar closure
+        # yang dibuat sebelum deklarasi (mis. fungsi saling rekursif) tetap
+        # menunjuk slot yang benar. Slot yang belum terisi saat runtime jatuh
+        # kembali ke pencarian dinamis, sama seperti perilaku lama.
+        layout: dict[str, int] = {}
+        self.scopes.append(layout)
+        for st in block.statements:
+            self._predeclare(st)
+        if not layout and self.elide_scopes:
+            self.scopes.pop()
+            block.scoped = False
+            for st in block.statements:
+                self._stmt(st)
+        else:
+            for st in block.statements:
+                self._stmt(st)
+            self.scopes.pop()
+        block.layout = layout
+
+    def _predeclare(self, st: Stmt):
+        if isinstance(st, (VarDecl, FunctionDecl, ClassDecl, ImportStmt)):
+            st.slot = self._declare(st.name)
+        elif isinstance(st, ForRangeStmt):
+            st.slot = self._declare(st.var)
+
+    def _function(self, params: list[str], body: Block, is_method: bool):
+        self.scopes.append(frame_layout(params, is_method))
+        self.functions += 1
+        self._block(body)
+        self.functions -= 1
+        self.scopes.pop()
+
+    # Statements
+    def _stmt(self, st: Stmt):
+        if isinstance(st, ExprStmt):
+            self._expr(st.expr)
+        elif isinstance(st, VarDecl):
+            if st.init is not None:
+                self._expr(st.init)
+            st.slot = self._declare(st.name)
+        elif isinstance(st, ImportStmt):
+            st.slot = self._declare(st.name)
+        elif isinstance(st, Block):
+            self._block(st)
+        elif isinstance(st, IfStmt):
+            for cond, blk in st.branches:
+                self._expr(cond)
+                self._block(blk)
+            if st.else_branch is not None:
+                self._block(st.else_branch)
+        elif isinstance(st, WhileStmt):
+            self._expr(st.condition)
+            self._block(st.body)
+        elif isinstance(st, ForRangeStmt):
+            for a in st.args:
+                self._expr(a)
+            if st.iterable is not None:
+                self._expr(st.iterable)
+            st.slot = self._declare(st.var)
+            closures = self.closures
+            self._block(st.body)
+            # tanpa closure yang bisa menangkap lingkup badan, Environment-nya
+            # aman dipakai ulang (dikosongkan) di setiap iterasi
+            st.reuse_env = self.elide_scopes and st.body.scoped and self.closures == closures
+        elif isinstance(st, ReturnStmt):
+            if st.value is not None:
+                self._expr(st.value)
+                # panggilan di posisi ekor: engine memakai ulang frame pemanggil
+                # (lihat runtime.TailCall); 'kembalikan' tingkat atas tidak
+                if self.functions and self.tail_calls and type(st.value) is Call:
+                    st.value.tail = True
+        elif isinstance(st, FunctionDecl):
+            st.slot = self._declare(st.name)
+            self.closures += 1
+            self._function(st.params, st.body, False)
+        elif isinstance(st, ClassDecl):
+            st.slot = self._declare(st.name)
+            self.closures += 1
+            for m in st.methods:
+                if isinstance(m, FunctionDecl):
+                    self._function(m.params, m.body, True)
+                elif isinstance(m, PropertyDecl):
+                    if m.getter is not None:
+                        self._function([], m.getter, True)
+                    if m.setter is not None:
+                        self._function([m.setter_param] if m.setter_param else [], m.setter, True)
+
+    # Expressions
+    def _expr(self, e: Expr):
+        if isinstance(e, Variable):
+            e.depth, e.slot = self._lookup(e.name)
+        elif isinstance(e, Assign):
+            self._expr(e.value)
+            e.depth, e.slot = self._lookup(e.name)
+        elif isinstance(e, This):
+            e.depth, e.slot = self._lookup('ini')
+        elif isinstance(e, Grouping):
+            self._expr(e.expr)
+        elif isinstance(e, Unary):
+            self._expr(e.right)
+        elif isinstance(e, (Binary, Logical)):
+            # rantai kiri (a + b + c ...) ditelusuri iteratif: kode hasil
+            # generator bisa memuat ribuan operand
+            rights = []
+            while isinstance(e, (Binary, Logical, Grouping)):
+                if isinstance(e, Grouping):
+                    e = e.expr
+                else:
+                    rights.append(e.right)
+                    e = e.left
+            self._expr(e)
+            for r in reversed(rights):
+                self._expr(r)
+        elif isinstance(e, Call):
+            self._expr(e.callee)
+            for a in e.args:
+                self._expr(a)
+        elif isinstance(e, Get):
+            self._expr(e.obj)
+        elif isinstance(e, Set):
+            self._expr(e.obj)
+            self._expr(e.value)
+        elif isinstance(e, NewExpr):
+            for a in e.args:
+                self._expr(a)
+        elif isinstance(e, ListExpr):
+            for x in e.elements:
+                self._expr(x)
+        elif isinstance(e, DictExpr):
+            for k, v in e.entries:
+                self._expr(k)
+                self._expr(v)
+        elif isinstance(e, Index):
+            self._expr(e.obj)
+            self._expr(e.index)
+        elif isinstance(e, SetIndex):
+            self._expr(e.obj)
+            self._expr(e.index)
+            self._expr(e.value)
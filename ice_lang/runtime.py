@@ -2,72 +2,259 @@
 from __future__ import annotations
 from typing import Any, Optional
 
+# perkiraan ukuran satu instance untuk batas memori (lihat limits.py)
+SIZE_INSTANCE = 200
+
+# Penanda slot lokal yang belum didefinisikan (deklarasi belum dieksekusi).
+_UNSET = object()
+
 class Environment:
-    def __init__(self, enclosing: 'Environment|None'=None):
+    def __init__(self, enclosing: 'Environment|None'=None, layout: 'dict[str, int]|None'=None):
         self.enclosing = enclosing
         self.values: dict[str, Any] = {}
+        # Lingkup lokal hasil Resolver menyimpan variabel di list berukuran tetap;
+        # dict `values` hanya dipakai untuk global, REPL dan nama non-statis.
+        self.layout = layout
+        self.slots: list[Any] = [_UNSET] * len(layout) if layout else []
 
     def define(self, name: str, value: Any):
+        if self.layout is not None:
+            slot = self.layout.get(name)
+            if slot is not None:
+                self.slots[slot] = value; return
         self.values[name] = value
 
     def assign(self, name: str, value: Any):
-        if name in self.values:
-            self.values[name] = value; return
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value); return
+        env = self
+        while env is not None:
+            if name in env.values:
+                env.values[name] = value; return
+            if env.layout is not None:
+                slot = env.layout.get(name)
+                if slot is not None and env.slots[slot] is not _UNSET:
+                    env.slots[slot] = value; return
+            env = env.enclosing
         raise Exception(f"Variabel tidak didefinisikan: {name}")
 
     def get(self, name: str) -> Any:
-        if name in self.values:
-            return self.values[name]
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
+        env = self
+        while env is not None:
+            if name in env.values:
+                return env.values[name]
+            if env.layout is not None:
+                slot = env.layout.get(name)
+                if slot is not None and env.slots[slot] is not _UNSET:
+                    return env.slots[slot]
+            env = env.enclosing
         raise Exception(f"Variabel tidak didefinisikan: {name}")
 
+    # Akses teralamat (depth, slot) dari Resolver: O(1) per lingkup.
+    def get_at(self, depth: int, slot: int, name: str) -> Any:
+        env = self
+        for _ in range(depth):
+            env = env.enclosing
+        value = env.slots[slot]
+        if value is _UNSET:
+            # deklarasi lokal belum dijalankan: cari dinamis di lingkup luar
+            if env.enclosing is None:
+                raise Exception(f"Variabel tidak didefinisikan: {name}")
+            return env.enclosing.get(name)
+        return value
+
+    def assign_at(self, depth: int, slot: int, name: str, value: Any):
+        env = self
+        for _ in range(depth):
+            env = env.enclosing
+        if env.slots[slot] is _UNSET:
+            if env.enclosing is None:
+                raise Exception(f"Variabel tidak didefinisikan: {name}")
+            env.enclosing.assign(name, value); return
+        env.slots[slot] = value
+
+class Rope:
+    # Nilai teks hasil `+` berulang (`s = s + x`). Potongan ditambahkan ke buffer
+    # yang dipakai bersama dan baru digabung sekali saat nilainya dibaca (dicetak,
+    # dibandingkan, panjang, str/int, indeks), sehingga membangun teks panjang
+    # berjalan linear. Setiap Rope hanya melihat `count` potongan pertama buffer:
+    # bila buffer sudah diperpanjang oleh nilai lain, append menyalin dulu.
+    __slots__ = ('parts', 'count', 'flat')
+
+    def __init__(self, parts: list[str], count: int):
+        self.parts = parts
+        self.count = count
+        self.flat: str | None = None
+
+    def append(self, s: str) -> 'Rope':
+        if self.flat is not None:
+            parts = [self.flat]
+        elif len(self.parts) == self.count:
+            parts = self.parts
+        else:
+            parts = self.parts[:self.count]
+        parts.append(s)
+        return Rope(parts, len(parts))
+
+    def __str__(self) -> str:
+        if self.flat is None:
+            parts = self.parts
+            self.flat = ''.join(parts if len(parts) == self.count else parts[:self.count])
+        return self.flat
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    def __bool__(self) -> bool:
+        return True  # hanya dibuat dari teks yang sudah panjang
+
+    def __eq__(self, other) -> bool:
+        return str(self) == (str(other) if type(other) is Rope else other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
 class IceCallable:
     def arity(self) -> int: return -1
     def call(self, interpreter, args: list[Any]) -> Any: raise NotImplementedError
 
+def frame_layout(params: list[str], is_method: bool) -> dict[str, int]:
+    # Susunan slot frame pemanggilan; harus sama dengan Resolver._function.
+    # Method menyimpan 'ini' di slot 0 frame yang sama dengan parameternya.
+    if is_method:
+        return {'ini': 0, **{p: i + 1 for i, p in enumerate(params)}}
+    return {p: i for i, p in enumerate(params)}
+
 class IceFunction(IceCallable):
-    def __init__(self, name: str, params: list[str], body, closure: Environment):
+    def __init__(self, name: str, params: list[str], body, closure: Environment,
+                 layout: 'dict[str, int]|None'=None, code=None, is_method: bool=False):
         self.name = name
         self.params = params
         self.body = body
         self.closure = closure
+        self.layout = layout if layout is not None else frame_layout(params, is_method)
+        self.code = code  # badan terkompilasi (backend closure); None = tree-walker
+        self.is_method = is_method
         self.owner = None  # akan diisi oleh interpreter saat membangun kelas
+        self.instance = None  # 'ini' untuk bound method (hasil bind)
 
     def bind(self, instance: 'IceInstance') -> 'IceFunction':
-        env = Environment(self.closure)
-        env.define('ini', instance)
-        f = IceFunction(self.name, self.params, self.body, env)
+        # Hanya dipakai bila method diambil sebagai nilai; `obj.m(...)` memanggil
+        # method langsung lewat call(..., instance) tanpa objek perantara.
+        f = IceFunction(self.name, self.params, self.body, self.closure, self.layout, self.code, self.is_method)
         f.owner = self.owner
+        f.instance = instance
         return f
 
     def arity(self) -> int:
         return len(self.params)
 
-    def call(self, interpreter, args: list[Any]) -> Any:
-        from .errors import IceReturnSignal
-        env = Environment(self.closure)
+    def new_frame(self, args: list[Any], instance: 'IceInstance|None'=None) -> Environment:
+        env = Environment(self.closure, self.layout)
         if self.owner is not None:
             env.define('__class__', self.owner)
+        if self.is_method:
+            env.slots[0] = self.instance if instance is None else instance
         for i, p in enumerate(self.params):
             env.define(p, args[i] if i < len(args) else None)
+        return env
+
+    def call(self, interpreter, args: list[Any], instance: 'IceInstance|None'=None) -> Any:
+        env = self.new_frame(args, instance)
+        if interpreter.limits is not None:
+            return self._call_limited(interpreter, env)
+        if self.code is not None:
+            # badan terkompilasi (closure/VM) langsung mengembalikan nilainya
+            value = self.code(env)
+        else:
+            # sengaja tidak lewat run_body: satu frame Python lebih sedikit per
+            # panggilan ICE (kedalaman rekursi engine tree)
+            prev = interpreter.env
+            try:
+                interpreter.env = env
+                value = interpreter.take_return() if interpreter.execute(self.body) is not None else None
+            finally:
+                interpreter.env = prev
+        if type(value) is TailCall:
+            return value.run()
+        return value
+
+    def run_body(self, interpreter, env: Environment) -> Any:
+        # badan tree-walker untuk trampolin TailCall.run; hasilnya bisa TailCall
         prev = interpreter.env
         try:
             interpreter.env = env
-            interpreter.execute(self.body)
-        except IceReturnSignal as rs:
-            return rs.value
+            if interpreter.execute(self.body) is not None:
+                return interpreter.take_return()
         finally:
             interpreter.env = prev
         return None
 
+    def _call_limited(self, interpreter, env: Environment) -> Any:
+        # jalur dengan batas eksekusi; dipisah agar call() biasa tetap ramping
+        limits = interpreter.limits
+        limits.enter()
+        try:
+            if self.code is not None:
+                value = self.code(env)
+            else:
+                prev = interpreter.env
+                try:
+                    interpreter.env = env
+                    value = interpreter.take_return() if interpreter.execute(self.body) is not None else None
+                finally:
+                    interpreter.env = prev
+            if type(value) is TailCall:
+                return value.run()
+            return value
+        finally:
+            limits.depth -= 1
+
+class TailCall:
+    # `kembalikan f(...)` di badan tugas (Call.tail, ditandai Resolver): alih-alih
+    # memanggil f, pemanggil mengembalikan objek ini sebagai nilai tugasnya.
+    # IceFunction.call yang paling luar lalu menjalankan f di loop (trampolin),
+    # jadi rekursi ekor tidak menumpuk frame Python dan tidak menambah
+    # kedalaman panggilan (tetap dihitung satu langkah untuk Limits).
+    # Badan tree-walker dijalankan interpreter yang membuat TailCall, sama
+    # seperti pemanggilan biasa.
+    __slots__ = ('fn', 'env', 'interpreter')
+
+    def __init__(self, fn: IceFunction, env: Environment, interpreter):
+        self.fn = fn
+        self.env = env
+        self.interpreter = interpreter
+
+    def run(self) -> Any:
+        call = self
+        while True:
+            fn, interpreter = call.fn, call.interpreter
+            if interpreter.limits is not None:
+                interpreter.limits.tick()
+            call = fn.code(call.env) if fn.code is not None else fn.run_body(interpreter, call.env)
+            if type(call) is not TailCall:
+                return call
+
 class IceClass(IceCallable):
+    # Epoch global naik setiap kali kelas dibuat atau diubah (mis. didefinisikan
+    # ulang di REPL). Tabel resolusi dan inline cache yang dibangun pada epoch
+    # lama dianggap basi dan dihitung ulang saat dipakai berikutnya.
+    epoch = 0
+
     def __init__(self, name: str, methods: dict[str, IceFunction], superclass: 'IceClass|None'=None):
         self.name = name
         self.methods = methods
         self.superclass = superclass
+        self._table_epoch = -1
+        self._flat: dict[str, IceFunction] = {}
+        self._get_table: dict[str, tuple] = {}
+        self._set_table: dict[str, Any] = {}
+        IceClass.invalidate()
+
+    @staticmethod
+    def invalidate():
+        IceClass.epoch += 1
 
     def __repr__(self):
         return f"<kelas {self.name}>"
@@ -80,27 +267,86 @@ class IceClass(IceCallable):
             k = k.superclass
         return False
 
+    def method_table(self) -> dict[str, IceFunction]:
+        # Semua method (termasuk warisan) diratakan ke satu dict: method subclass
+        # menimpa superclass, jadi pencarian tidak lagi menelusuri rantai.
+        if self._table_epoch != IceClass.epoch:
+            flat = dict(self.superclass.method_table()) if self.superclass is not None else {}
+            flat.update(self.methods)
+            self._flat = flat
+            self._get_table = {}
+            self._set_table = {}
+            self._table_epoch = IceClass.epoch
+        return self._flat
+
     def find_method(self, name: str):
-        if name in self.methods:
-            return self.methods[name]
-        if self.superclass is not None:
-            return self.superclass.find_method(name)
-        return None
+        return self.method_table().get(name)
+
+    def resolve_get(self, name: str) -> tuple:
+        # (getter properti, method) untuk `obj.name`; field instance dicek pemanggil
+        table = self.method_table()
+        entry = self._get_table.get(name)
+        if entry is None:
+            entry = self._get_table[name] = (table.get(f"get_{name}"), table.get(name))
+        return entry
+
+    def resolve_set(self, name: str):
+        table = self.method_table()
+        setter = self._set_table.get(name, _UNSET)
+        if setter is _UNSET:
+            setter = self._set_table[name] = table.get(f"set_{name}")
+        return setter
 
     def call(self, interpreter, args: list[Any]) -> Any:
         instance = IceInstance(self)
+        if interpreter.limits is not None:
+            interpreter.limits.grow(SIZE_INSTANCE)
         initializer = self.find_method("__init__")
         if initializer:
-            bound = initializer.bind(instance)
-            if bound.arity() != len(args) and bound.arity() >= 0:
-                raise Exception(f"Constructor __init__ mengharapkan {bound.arity()} argumen, diberi {len(args)}.")
-            bound.call(interpreter, args)
+            if initializer.arity() != len(args) and initializer.arity() >= 0:
+                raise Exception(f"Constructor __init__ mengharapkan {initializer.arity()} argumen, diberi {len(args)}.")
+            initializer.call(interpreter, args, instance)
         return instance
 
     def arity(self) -> int:
         init = self.find_method("__init__")
         return len(init.params) if init else 0
 
+class AttrCache:
+    # Inline cache satu lokasi akses properti (node Get/Set atau instruksi VM).
+    # Monomorfik dulu (satu kelas), lalu polimorfik hingga POLY_LIMIT kelas;
+    # lokasi megamorfik langsung memakai tabel resolusi kelas.
+    __slots__ = ('name', 'setter', 'klass', 'entry', 'poly', 'epoch')
+    POLY_LIMIT = 4
+
+    def __init__(self, name: str, setter: bool = False):
+        self.name = name
+        self.setter = setter
+        self.klass = None
+        self.entry = None
+        self.poly: 'dict[IceClass, Any]|None' = None
+        self.epoch = -1
+
+    def lookup(self, klass: IceClass):
+        if self.epoch != IceClass.epoch:
+            self.klass = self.poly = None
+            self.epoch = IceClass.epoch
+        elif klass is self.klass:
+            return self.entry
+        elif self.poly is not None:
+            entry = self.poly.get(klass, _UNSET)
+            if entry is not _UNSET:
+                return entry
+        entry = klass.resolve_set(self.name) if self.setter else klass.resolve_get(self.name)
+        if self.klass is None:
+            self.klass, self.entry = klass, entry
+        else:
+            if self.poly is None:
+                self.poly = {}
+            if len(self.poly) < self.POLY_LIMIT:
+                self.poly[klass] = entry
+        return entry
+
 class IceInstance:
     def __init__(self, klass: IceClass):
         self.klass = klass
@@ -116,23 +362,38 @@ class IceInstance:
             if current_instance is None or current_instance.klass is not self.klass:
                 raise Exception(f"Anggota privat '{name}' hanya boleh diakses dalam kelas {self.klass.name}.")
 
-    def get(self, name: str, current_instance: 'IceInstance|None'=None, interpreter=None):
-        self._check_access(name, current_instance)
+    def get(self, name: str, current_instance: 'IceInstance|None'=None, interpreter=None,
+            cache: 'AttrCache|None'=None):
+        if name[0] == '_':
+            self._check_access(name, current_instance)
         if name in self.fields:
             return self.fields[name]
-        getter = self.klass.find_method(f"get_{name}")
+        getter, method = cache.lookup(self.klass) if cache is not None else self.klass.resolve_get(name)
         if getter:
-            return getter.bind(self).call(interpreter, [])
-        method = self.klass.find_method(name)
+            return getter.call(interpreter, [], self)
         if method:
             return method.bind(self)
         raise Exception(f"Properti atau method tidak ditemukan: {name}")
 
-    def set(self, name: str, value: Any, current_instance: 'IceInstance|None'=None, interpreter=None):
-        self._check_access(name, current_instance)
-        setter = self.klass.find_method(f"set_{name}")
+    def method_for(self, name: str, current_instance: 'IceInstance|None'=None,
+                   cache: 'AttrCache|None'=None) -> 'IceFunction|None':
+        # Jalur `obj.name(args)`: method kelas yang bisa dipanggil langsung dengan
+        # 'ini' = self. None bila name adalah field, properti, atau tidak ada;
+        # pemanggil lalu memakai get() biasa (termasuk pesan galatnya).
+        if name[0] == '_':
+            self._check_access(name, current_instance)
+        if name in self.fields:
+            return None
+        getter, method = cache.lookup(self.klass) if cache is not None else self.klass.resolve_get(name)
+        return None if getter else method
+
+    def set(self, name: str, value: Any, current_instance: 'IceInstance|None'=None, interpreter=None,
+            cache: 'AttrCache|None'=None):
+        if name[0] == '_':
+            self._check_access(name, current_instance)
+        setter = cache.lookup(self.klass) if cache is not None else self.klass.resolve_set(name)
         if setter:
-            setter.bind(self).call(interpreter, [value])
+            setter.call(interpreter, [value], self)
             return value
         self.fields[name] = value
         return value
@@ -7,6 +7,7 @@ class TokenType(Enum):
     # single-char
     LEFT_PAREN = auto(); RIGHT_PAREN = auto()
     LEFT_BRACE = auto(); RIGHT_BRACE = auto()
+    LEFT_BRACKET = auto(); RIGHT_BRACKET = auto()
     COMMA = auto(); DOT = auto(); COLON = auto(); MINUS = auto(); PLUS = auto()
     SEMICOLON = auto(); SLASH = auto(); STAR = auto(); PERCENT = auto()
     EQUAL = auto(); BANG = auto()
@@ -26,10 +27,11 @@ class TokenType(Enum):
     BILANGAN = auto(); DESIMAL = auto(); TEKS = auto(); BOOLEAN = auto()
     KELAS = auto(); BARU = auto(); INI = auto(); SUPER = auto()
     PROPERTI = auto(); GET = auto(); SET = auto()
+    IMPOR = auto(); SEBAGAI = auto()
 
     EOF = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -66,4 +68,6 @@ KEYWORDS = {
     "properti": TokenType.PROPERTI,
     "get": TokenType.GET,
     "set": TokenType.SET,
+    "impor": TokenType.IMPOR,
+    "sebagai": TokenType.SEBAGAI,
 }
@@ -0,0 +1,369 @@
+
+from __future__ import annotations
+from typing import Optional
+from .ast import *
+from .builtins import BUILTINS
+from .errors import IceTypeError
+from .optimizer import _all_nodes
+
+# Inferensi tipe statis, dijalankan setelah Resolver.
+# Tipe = himpunan tag nilai yang mungkin (nama tag sama dengan hasil `tipe(x)`),
+# None = tidak diketahui. Setiap variabel (deklarasi, parameter, variabel
+# `untuk`) mendapat gabungan tipe semua nilai yang pernah ditulis ke sana
+# (tidak peka alur; diiterasi sampai tetap). Parameter, field, hasil tugas dan
+# pembacaan sebelum deklarasinya dijalankan selalu None.
+# Hasilnya: Binary.num = benar bila kedua operand terbukti angka; backend lalu
+# memakai operasi Python langsung tanpa cek isinstance/_num.
+# Tipe yang dideklarasikan (`bilangan x`) tidak dipercaya untuk spesialisasi
+# karena program lama memakainya bebas (`teks xs = [1]`); dengan strict=True
+# (`ice --check-types`) deklarasi diperiksa dan nilai yang terbukti tidak cocok,
+# juga operator yang pasti gagal, dilaporkan sebagai IceTypeError sebelum
+# program dijalankan. Nilai bertipe None selalu lolos (gradual).
+
+INT, FLOAT, BOOL, STR, NULL, LIST, DICT = "bilangan", "desimal", "boolean", "teks", "kosong", "daftar", "peta"
+Type = Optional[frozenset]
+NOTHING: frozenset = frozenset()
+NUMERIC = frozenset({INT, FLOAT, BOOL})
+
+# nilai yang boleh disimpan di variabel bertipe (selain kosong)
+DECLARED = {
+    "bilangan": frozenset({INT}),
+    "desimal": frozenset({INT, FLOAT}),
+    "teks": frozenset({STR}),
+    "boolean": frozenset({BOOL}),
+}
+
+_BUILTIN_RESULTS = {
+    "panjang": frozenset({INT}), "int": frozenset({INT}), "float": frozenset({FLOAT}),
+    "str": frozenset({STR}), "tipe": frozenset({STR}), "berisi": frozenset({BOOL}),
+    "kunci": frozenset({LIST}), "statistik_ingat": frozenset({DICT}),
+}
+# builtin yang tipe hasilnya diasumsikan; Program.run menolak global host
+# dengan nama ini
+TYPED_BUILTINS = frozenset(_BUILTIN_RESULTS)
+_LITERALS = {bool: BOOL, int: INT, float: FLOAT, str: STR, type(None): NULL}
+_ARITH = ("-", "*", "/", "%")
+_ORDER = ("<", "<=", ">", ">=")
+
+def join(a: Type, b: Type) -> Type:
+    if a is None or b is None:
+        return None
+    return a | b
+
+def is_numeric(t: Type) -> bool:
+    return bool(t) and t <= NUMERIC
+
+def describe(t: Type) -> str:
+    return "?" if t is None else "|".join(sorted(t))
+
+def _arith(a: frozenset, b: frozenset, op: str) -> frozenset:
+    if op == "/":
+        return frozenset({FLOAT})
+    out = set()
+    if FLOAT in a or FLOAT in b:
+        out.add(FLOAT)
+    if a - {FLOAT} and b - {FLOAT}:
+        out.add(INT)
+    return frozenset(out)
+
+class _Binding:
+    __slots__ = ('type', 'declared', 'ready', 'fixed')
+
+    def __init__(self):
+        self.type: Type = NOTHING
+        self.declared: str | None = None
+        self.ready = False  # deklarasinya sudah dilewati (urutan teks)
+        self.fixed = False  # tipe None permanen (parameter, tugas, kelas, ...)
+
+class TypeChecker:
+    def __init__(self, strict: bool = False, trust_globals: bool = True):
+        # trust_globals=False: variabel global bisa ditulis kode lain (REPL),
+        # jadi tipenya tidak disimpulkan
+        self.strict = strict
+        self.trust_globals = trust_globals
+        self.errors: list[tuple[int, str]] = []
+        self.specialized = 0  # jumlah Binary yang ditandai num
+
+    def check(self, statements: list[Stmt]) -> list[Stmt]:
+        self._shadowed = set()
+        for n in _all_nodes(statements):
+            if isinstance(n, (Assign, VarDecl, FunctionDecl, ClassDecl, ImportStmt)):
+                self._shadowed.add(n.name)
+            elif isinstance(n, ForRangeStmt):
+                self._shadowed.add(n.var)
+            if isinstance(n, FunctionDecl):
+                self._shadowed.update(n.params)
+            elif isinstance(n, PropertyDecl) and n.setter_param:
+                self._shadowed.add(n.setter_param)
+        self._bindings: dict[tuple[int, str], _Binding] = {}
+        self._final = False
+        self._changed = True
+        while self._changed:
+            self._changed = False
+            self._run(statements)
+        self._final = True
+        self._run(statements)
+        if self.strict and self.errors:
+            raise IceTypeError(self.errors)
+        return statements
+
+    def _run(self, statements: list[Stmt]):
+        self.scopes: list[dict[str, _Binding]] = []
+        self.line = 0
+        self._block(statements, id(statements), not self.trust_globals)
+
+    # Lingkup
+    def _binding(self, key: int, name: str, fixed: bool = False) -> _Binding:
+        b = self._bindings.get((key, name))
+        if b is None:
+            b = self._bindings[(key, name)] = _Binding()
+            b.type = None if fixed else NOTHING
+            b.fixed = fixed
+        return b
+
+    def _lookup(self, name: str) -> _Binding | None:
+        for scope in reversed(self.scopes):
+            b = scope.get(name)
+            if b is not None:
+                return b
+        return None
+
+    def _write(self, b: _Binding, t: Type, what: str):
+        if self.strict and self._final and b.declared is not None and t:
+            allowed = DECLARED[b.declared] | {NULL}
+            if not t <= allowed:
+                self._error(f"{what}: nilai {describe(t)} tidak cocok dengan tipe '{b.declared}'.")
+        if b.fixed:
+            return
+        new = join(b.type, t)
+        if new != b.type:
+            b.type = new
+            self._changed = True
+
+    def _pollute(self, name: str):
+        # penulisan sebelum deklarasi lokal dijalankan jatuh ke variabel luar
+        # bernama sama (pencarian dinamis): semua kandidat menjadi None
+        for scope in self.scopes:
+            b = scope.get(name)
+            if b is not None and not b.fixed and b.type is not None:
+                b.type = None
+                self._changed = True
+
+    def _error(self, msg: str):
+        self.errors.append((self.line, msg))
+
+    def _block(self, statements: list[Stmt], key: int, fixed: bool = False, frame: dict[str, _Binding] | None = None):
+        scope = dict(frame) if frame else {}
+        for st in statements:
+            name = _declared_name(st)
+            if name is not None and name not in scope:
+                b = scope[name] = self._binding(key, name, fixed)
+                b.ready = False
+        self.scopes.append(scope)
+        try:
+            for st in statements:
+                self._stmt(st)
+        finally:
+            self.scopes.pop()
+
+    def _function(self, params: list[str], body: Block, is_method: bool):
+        key = id(body)
+        frame = {p: self._binding(key, p, True) for p in params}
+        if is_method:
+            frame['ini'] = self._binding(key, 'ini', True)
+        for b in frame.values():
+            b.ready = True
+        self._block(body.statements, key, frame=frame)
+
+    # Statements
+    def _stmt(self, st: Stmt):
+        if st.line:
+            self.line = st.line
+        if isinstance(st, ExprStmt):
+            self._expr(st.expr)
+        elif isinstance(st, VarDecl):
+            t = NOTHING | {NULL} if st.init is None else self._expr(st.init)
+            b = self._declared(st.name)
+            b.declared = st.type
+            self._write(b, t, f"variabel '{st.name}'")
+        elif isinstance(st, Block):
+            self._block(st.statements, id(st))
+        elif isinstance(st, IfStmt):
+            for cond, blk in st.branches:
+                self._expr(cond)
+                self._block(blk.statements, id(blk))
+            if st.else_branch is not None:
+                self._block(st.else_branch.statements, id(st.else_branch))
+        elif isinstance(st, WhileStmt):
+            self._expr(st.condition)
+            self._block(st.body.statements, id(st.body))
+        elif isinstance(st, ForRangeStmt):
+            for a in st.args:
+                t = self._expr(a)
+                if self.strict and self._final and t and not t & NUMERIC:
+                    self._error(f"rentang butuh angka, diberi {describe(t)}.")
+            if st.iterable is None:
+                t = frozenset({INT})
+            else:
+                t = self._expr(st.iterable)
+                t = frozenset({STR}) if t and t <= {STR} else None
+            self._write(self._declared(st.var), t, f"variabel '{st.var}'")
+            self._block(st.body.statements, id(st.body))
+        elif isinstance(st, ReturnStmt):
+            if st.value is not None:
+                self._expr(st.value)
+        elif isinstance(st, FunctionDecl):
+            self._declare_opaque(st.name)
+            self._function(st.params, st.body, False)
+        elif isinstance(st, ClassDecl):
+            self._declare_opaque(st.name)
+            for m in st.methods:
+                if isinstance(m, FunctionDecl):
+                    self._function(m.params, m.body, True)
+                elif isinstance(m, PropertyDecl):
+                    if m.getter is not None:
+                        self._function([], m.getter, True)
+                    if m.setter is not None:
+                        self._function([m.setter_param] if m.setter_param else [], m.setter, True)
+        elif isinstance(st, ImportStmt):
+            self._declare_opaque(st.name)
+
+    def _declare_opaque(self, name: str):
+        self._write(self._declared(name), None, f"'{name}'")
+
+    def _declared(self, name: str) -> _Binding:
+        # deklarasi dijalankan: mulai di sini pembacaan memakai binding ini
+        b = self.scopes[-1].get(name)
+        if b is None:
+            b = self.scopes[-1][name] = _Binding()
+            b.type, b.fixed = None, True
+        b.ready = True
+        return b
+
+    # Expressions
+    def _expr(self, e: Expr) -> Type:
+        if isinstance(e, Literal):
+            tag = _LITERALS.get(type(e.value))
+            return None if tag is None else frozenset({tag})
+        if isinstance(e, Variable):
+            b = self._lookup(e.name)
+            if b is None or not b.ready:
+                return None
+            return b.type
+        if isinstance(e, (Binary, Logical, Grouping)):
+            return self._chain(e)
+        if isinstance(e, Assign):
+            t = self._expr(e.value)
+            b = self._lookup(e.name)
+            if b is not None:
+                if b.ready:
+                    self._write(b, t, f"penetapan '{e.name}'")
+                else:
+                    self._pollute(e.name)
+            return t
+        if isinstance(e, Unary):
+            t = self._expr(e.right)
+            if e.op == "-":
+                if self.strict and self._final and t and not t & NUMERIC:
+                    self._error(f"Operator unary '-' butuh angka, diberi {describe(t)}.")
+                if is_numeric(t):
+                    return frozenset(INT if x == BOOL else x for x in t)
+                return None
+            return frozenset({BOOL})
+        if isinstance(e, Call):
+            callee = e.callee
+            if isinstance(callee, Get):
+                self._expr(callee.obj)
+            else:
+                self._expr(callee)
+            for a in e.args:
+                self._expr(a)
+            # tipe hasil builtin hanya dipercaya bila tidak ada kode lain yang bisa
+            # menimpa namanya (REPL: input sebelumnya)
+            if (self.trust_globals and isinstance(callee, Variable) and callee.name in _BUILTIN_RESULTS
+                    and callee.name not in self._shadowed and self._lookup(callee.name) is None):
+                return _BUILTIN_RESULTS[callee.name]
+            return None
+        if isinstance(e, Get):
+            self._expr(e.obj)
+            return None
+        if isinstance(e, Set):
+            self._expr(e.obj)
+            return self._expr(e.value)
+        if isinstance(e, NewExpr):
+            for a in e.args:
+                self._expr(a)
+            return None
+        if isinstance(e, ListExpr):
+            for x in e.elements:
+                self._expr(x)
+            return frozenset({LIST})
+        if isinstance(e, DictExpr):
+            for k, v in e.entries:
+                self._expr(k)
+                self._expr(v)
+            return frozenset({DICT})
+        if isinstance(e, Index):
+            t = self._expr(e.obj)
+            self._expr(e.index)
+            return frozenset({STR}) if t and t <= {STR} else None
+        if isinstance(e, SetIndex):
+            self._expr(e.obj)
+            self._expr(e.index)
+            return self._expr(e.value)
+        return None
+
+    def _chain(self, e: Expr) -> Type:
+        # rantai kiri (a + b + c ...) secara iteratif, seperti Resolver
+        nodes = []
+        while isinstance(e, (Binary, Logical, Grouping)):
+            nodes.append(e)
+            e = e.expr if isinstance(e, Grouping) else e.left
+        t = self._expr(e)
+        for n in reversed(nodes):
+            if isinstance(n, Grouping):
+                continue
+            r = self._expr(n.right)
+            t = join(t, r) if isinstance(n, Logical) else self._binary(n, t, r)
+        return t
+
+    def _binary(self, e: Binary, a: Type, b: Type) -> Type:
+        op = e.op
+        num = is_numeric(a) and is_numeric(b)
+        if self._final:
+            if e.num != num:
+                e.num = num
+            if num:
+                self.specialized += 1
+            if self.strict and not num and a and b:
+                self._check_operands(op, a, b)
+        if op in ("==", "!=") or op in _ORDER:
+            return frozenset({BOOL})
+        if num:
+            return _arith(a, b, op)
+        if op == "+" and ((a and a <= {STR}) or (b and b <= {STR})):
+            return frozenset({STR})
+        return None
+
+    def _check_operands(self, op: str, a: frozenset, b: frozenset):
+        if op in _ARITH or op in _ORDER:
+            for t in (a, b):
+                if not t & NUMERIC:
+                    self._error(f"Operator '{op}' butuh angka, diberi {describe(t)}.")
+                    return
+        elif op == "+" and STR not in a and STR not in b and not (a & NUMERIC and b & NUMERIC):
+            self._error(f"Operator '+': tipe tidak cocok ({describe(a)} + {describe(b)}).")
+
+def _declared_name(st: Stmt) -> str | None:
+    if isinstance(st, (VarDecl, FunctionDecl, ClassDecl, ImportStmt)):
+        return st.name
+    if isinstance(st, ForRangeStmt):
+        return st.var
+    return None
+
+def infer(statements: list[Stmt], trust_globals: bool = True) -> list[Stmt]:
+    return TypeChecker(trust_globals=trust_globals).check(statements)
+
+def check(statements: list[Stmt], trust_globals: bool = True) -> list[Stmt]:
+    # mode ketat: IceTypeError bila ada galat tipe
+    return TypeChecker(strict=True, trust_globals=trust_globals).check(statements)
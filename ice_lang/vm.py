@@ -0,0 +1,440 @@
+
+from __future__ import annotations
+from typing import Any
+from .ast import Stmt
+from .bytecode import *
+from .errors import IceRuntimeError, DepthLimitError
+from .interpreter import Interpreter
+from .limits import Limits, DEFAULT_MAX_DEPTH
+from .modules import IceModule
+from .runtime import Environment, IceFunction, IceClass, IceInstance, SIZE_INSTANCE, _UNSET
+from . import ops
+
+_NUM = (int, float)
+
+class VMCode:
+    # Badan fungsi hasil kompilasi bytecode, disimpan di IceFunction.code.
+    # Dipanggil langsung (mis. getter lewat IceInstance.get) ia menjalankan VM;
+    # pemanggilan ICE -> ICE di dalam VM cukup menumpuk frame baru.
+    __slots__ = ('vm', 'co')
+
+    def __init__(self, vm: 'VM', co: CodeObject):
+        self.vm = vm
+        self.co = co
+
+    def __call__(self, env: Environment) -> Any:
+        return self.vm.run(self.co, env)
+
+def _slot_name(env: Environment, slot: int) -> str:
+    for name, i in env.layout.items():
+        if i == slot:
+            return name
+    return '?'
+
+def _load_unset(env: Environment, depth: int, slot: int) -> Any:
+    for _ in range(depth):
+        env = env.enclosing
+    return env.get_at(0, slot, _slot_name(env, slot))
+
+def _store_local(env: Environment, depth: int, slot: int, value: Any):
+    for _ in range(depth):
+        env = env.enclosing
+    env.assign_at(0, slot, _slot_name(env, slot), value)
+
+def _deeper(frames: list, limits):
+    # frame baru baru saja ditumpuk: cek batas kedalaman
+    if limits is not None:
+        limits.enter()
+    elif len(frames) > DEFAULT_MAX_DEPTH:
+        raise DepthLimitError(f"Kedalaman panggilan melebihi batas ({DEFAULT_MAX_DEPTH}).")
+
+def _current_instance(env: Environment):
+    try:
+        return env.get('ini')
+    except Exception:
+        return None
+
+class VM:
+    def __init__(self, interpreter: Interpreter):
+        self.interpreter = interpreter
+
+    def run(self, co: CodeObject, env: Environment) -> Any:
+        interp = self.interpreter
+        globals_, limits = interp.globals, interp.limits
+        frames: list[tuple] = []
+        code, consts, names, caches = co.code, co.consts, co.names, co.caches
+        stack: list[Any] = []
+        push, pop = stack.append, stack.pop
+        pc = 0
+        while True:
+            op = code[pc]; arg = code[pc + 1]; pc += 2
+            if op == LOAD_FAST:
+                v = env.slots[arg]
+                push(_load_unset(env, 0, arg) if v is _UNSET else v)
+            elif op == CONST:
+                push(consts[arg])
+            elif op == LOAD_LOCAL:
+                depth, slot = arg >> SLOT_BITS, arg & SLOT_MASK
+                e = env
+                for _ in range(depth):
+                    e = e.enclosing
+                v = e.slots[slot]
+                push(_load_unset(e, 0, slot) if v is _UNSET else v)
+            elif op == LOAD_GLOBAL:
+                push(globals_.get(names[arg]))
+            elif op == POP:
+                pop()
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                if arg < pc and limits is not None:
+                    # lompatan mundur = satu iterasi loop
+                    limits.tick()
+                pc = arg
+            elif op == ADD:
+                b = pop(); a = stack[-1]
+                if arg or isinstance(a, _NUM) and isinstance(b, _NUM):
+                    stack[-1] = a + b
+                else:
+                    stack[-1] = ops.op_add(a, b)
+                    if limits is not None:
+                        limits.alloc(stack[-1])
+            elif op == SUB:
+                b = pop(); a = stack[-1]
+                if arg or isinstance(a, _NUM) and isinstance(b, _NUM):
+                    stack[-1] = a - b
+                else:
+                    stack[-1] = ops.op_sub(a, b)
+            elif op == LT:
+                b = pop(); a = stack[-1]
+                if arg or isinstance(a, _NUM) and isinstance(b, _NUM):
+                    stack[-1] = a < b
+                else:
+                    stack[-1] = ops.op_lt(a, b)
+            elif op == CALL or op == CALL_METHOD:
+                args = stack[len(stack) - arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - arg:]
+                inst = pop() if op == CALL_METHOD else _UNSET
+                f = pop()
+                if type(f) is IceFunction and type(f.code) is VMCode and f.code.vm is self:
+                    if len(f.params) != arg:
+                        raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {len(f.params)}, diberi {arg}.")
+                    frames.append((code, consts, names, caches, pc, env, stack, _UNSET))
+                    _deeper(frames, limits)
+                    env = f.new_frame(args, None if inst is _UNSET else inst)
+                    callee = f.code.co
+                    code, consts, names, caches = callee.code, callee.consts, callee.names, callee.caches
+                    stack = []
+                    push, pop = stack.append, stack.pop
+                    pc = 0
+                else:
+                    push(self._call(f, args, inst))
+            elif op == RETURN:
+                value = pop()
+                if not frames:
+                    return value
+                if limits is not None:
+                    limits.depth -= 1
+                code, consts, names, caches, pc, env, stack, result = frames.pop()
+                push, pop = stack.append, stack.pop
+                # konstruktor dan setter: nilai ekspresinya bukan hasil 'kembalikan'
+                push(value if result is _UNSET else result)
+            elif op == TAIL_CALL or op == TAIL_CALL_METHOD:
+                # `kembalikan f(...)`: fungsi VM ini menggantikan frame yang
+                # sedang berjalan (tanpa menumpuk frame, kedalaman tetap);
+                # selain itu panggilan biasa yang hasilnya dikembalikan RETURN
+                args = stack[len(stack) - arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - arg:]
+                inst = pop() if op == TAIL_CALL_METHOD else _UNSET
+                f = pop()
+                if type(f) is IceFunction and type(f.code) is VMCode and f.code.vm is self:
+                    if len(f.params) != arg:
+                        raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {len(f.params)}, diberi {arg}.")
+                    if limits is not None:
+                        limits.tick()
+                    env = f.new_frame(args, None if inst is _UNSET else inst)
+                    callee = f.code.co
+                    code, consts, names, caches = callee.code, callee.consts, callee.names, callee.caches
+                    stack = []
+                    push, pop = stack.append, stack.pop
+                    pc = 0
+                else:
+                    push(self._call(f, args, inst))
+            elif op == PUSH_SCOPE:
+                env = Environment(env, consts[arg])
+            elif op == POP_SCOPE:
+                env = env.enclosing
+            elif op == ENTER_SCOPE:
+                env = stack[-2]
+                slots = env.slots
+                slots[:] = [_UNSET] * len(slots)
+            elif op == STORE_FAST:
+                if env.slots[arg] is _UNSET:
+                    _store_local(env, 0, arg, stack[-1])
+                else:
+                    env.slots[arg] = stack[-1]
+            elif op == STORE_LOCAL:
+                depth, slot = arg >> SLOT_BITS, arg & SLOT_MASK
+                e = env
+                for _ in range(depth):
+                    e = e.enclosing
+                if e.slots[slot] is _UNSET:
+                    _store_local(e, 0, slot, stack[-1])
+                else:
+                    e.slots[slot] = stack[-1]
+            elif op == STORE_GLOBAL:
+                globals_.assign(names[arg], stack[-1])
+            elif op == DEFINE_FAST:
+                env.slots[arg] = pop()
+            elif op == FOR_ITER:
+                v = next(stack[-1], _UNSET)
+                if v is _UNSET:
+                    pop()
+                    pc = arg
+                else:
+                    push(v)
+            elif op == GET_ATTR:
+                o = stack[-1]
+                if not isinstance(o, IceInstance):
+                    if type(o) is not IceModule:
+                        raise IceRuntimeError('Akses properti pada non-objek.')
+                    stack[-1] = o.get(caches[arg >> 1].name)
+                    continue
+                current = _current_instance(env) if arg & 1 else None
+                cache = caches[arg >> 1]
+                name = cache.name
+                if name[0] == '_':
+                    o._check_access(name, current)
+                if name in o.fields:
+                    stack[-1] = o.fields[name]
+                else:
+                    getter = cache.lookup(o.klass)[0]
+                    if getter and type(getter.code) is VMCode and getter.code.vm is self:
+                        # getter properti dijalankan sebagai frame VM
+                        pop()
+                        frames.append((code, consts, names, caches, pc, env, stack, _UNSET))
+                        _deeper(frames, limits)
+                        env = getter.new_frame([], o)
+                        callee = getter.code.co
+                        code, consts, names, caches = callee.code, callee.consts, callee.names, callee.caches
+                        stack = []
+                        push, pop = stack.append, stack.pop
+                        pc = 0
+                    else:
+                        stack[-1] = o.get(name, current, interp, cache)
+            elif op == GET_METHOD:
+                o = stack[-1]
+                if not isinstance(o, IceInstance):
+                    if type(o) is not IceModule:
+                        raise IceRuntimeError('Akses properti pada non-objek.')
+                    stack[-1] = o.get(caches[arg >> 1].name)
+                    push(_UNSET)
+                    continue
+                current = _current_instance(env) if arg & 1 else None
+                cache = caches[arg >> 1]
+                method = o.method_for(cache.name, current, cache)
+                if method is not None:
+                    stack[-1] = method
+                    push(o)
+                else:
+                    stack[-1] = o.get(cache.name, current, interp, cache)
+                    push(_UNSET)
+            elif op == SET_ATTR:
+                v = pop(); o = stack[-1]
+                if not isinstance(o, IceInstance):
+                    raise IceRuntimeError('Penetapan properti pada non-objek.')
+                current = _current_instance(env) if arg & 1 else None
+                cache = caches[arg >> 1]
+                name = cache.name
+                if name[0] == '_':
+                    o._check_access(name, current)
+                setter = cache.lookup(o.klass)
+                if not setter:
+                    o.fields[name] = v
+                    stack[-1] = v
+                elif type(setter.code) is VMCode and setter.code.vm is self:
+                    pop()
+                    frames.append((code, consts, names, caches, pc, env, stack, v))
+                    _deeper(frames, limits)
+                    env = setter.new_frame([v], o)
+                    callee = setter.code.co
+                    code, consts, names, caches = callee.code, callee.consts, callee.names, callee.caches
+                    stack = []
+                    push, pop = stack.append, stack.pop
+                    pc = 0
+                else:
+                    setter.call(interp, [v], o)
+                    stack[-1] = v
+            elif op == INDEX:
+                k = pop(); o = stack[-1]
+                if type(o) is list and type(k) is int and -len(o) <= k < len(o):
+                    stack[-1] = o[k]
+                else:
+                    stack[-1] = ops.op_index(o, k)
+            elif op == SET_INDEX:
+                v = pop(); k = pop()
+                if limits is not None:
+                    limits.set_index(stack[-1], k)
+                stack[-1] = ops.op_set_index(stack[-1], k, v)
+            elif op == MUL:
+                b = pop(); a = stack[-1]
+                if arg or isinstance(a, _NUM) and isinstance(b, _NUM):
+                    stack[-1] = a * b
+                else:
+                    stack[-1] = ops.op_mul(a, b)
+            elif op == EQ:
+                b = pop(); stack[-1] = stack[-1] == b
+            elif op == NE:
+                b = pop(); stack[-1] = stack[-1] != b
+            elif op == LE:
+                b = pop()
+                stack[-1] = stack[-1] <= b if arg else ops.op_le(stack[-1], b)
+            elif op == GT:
+                b = pop()
+                stack[-1] = stack[-1] > b if arg else ops.op_gt(stack[-1], b)
+            elif op == GE:
+                b = pop()
+                stack[-1] = stack[-1] >= b if arg else ops.op_ge(stack[-1], b)
+            elif op == DIV:
+                b = pop(); stack[-1] = ops.op_div(stack[-1], b)
+            elif op == MOD:
+                b = pop()
+                stack[-1] = stack[-1] % b if arg else ops.op_mod(stack[-1], b)
+            elif op == NEG:
+                stack[-1] = ops.op_neg(stack[-1])
+            elif op == NOT:
+                stack[-1] = not stack[-1]
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == LOAD_NAME:
+                push(env.get(names[arg]))
+            elif op == STORE_NAME:
+                env.assign(names[arg], stack[-1])
+            elif op == DEFINE_NAME:
+                env.define(names[arg], pop())
+            elif op == RANGE:
+                vals = stack[len(stack) - arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - arg:]
+                push(iter(ops.range_from_values(vals)))
+            elif op == ITER:
+                stack[-1] = ops.iterate(stack[-1])
+            elif op == BUILD_LIST:
+                items = stack[len(stack) - arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - arg:]
+                if limits is not None:
+                    limits.alloc(items)
+                push(items)
+            elif op == BUILD_DICT:
+                items = stack[len(stack) - 2 * arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - 2 * arg:]
+                push(ops.build_dict(zip(items[::2], items[1::2])))
+                if limits is not None:
+                    limits.alloc(stack[-1])
+            elif op == NEW:
+                args = stack[len(stack) - arg:] if arg else []
+                if arg:
+                    del stack[len(stack) - arg:]
+                klass = pop()
+                init = klass.find_method("__init__") if type(klass) is IceClass else None
+                if init is not None and type(init.code) is VMCode and init.code.vm is self:
+                    # konstruktor dijalankan sebagai frame VM; RETURN-nya mendorong
+                    # instance (urutan dan galat sama dengan IceClass.call)
+                    instance = IceInstance(klass)
+                    if limits is not None:
+                        limits.grow(SIZE_INSTANCE)
+                    if len(init.params) != arg:
+                        raise Exception(f"Constructor __init__ mengharapkan {len(init.params)} argumen, diberi {arg}.")
+                    frames.append((code, consts, names, caches, pc, env, stack, instance))
+                    _deeper(frames, limits)
+                    env = init.new_frame(args, instance)
+                    callee = init.code.co
+                    code, consts, names, caches = callee.code, callee.consts, callee.names, callee.caches
+                    stack = []
+                    push, pop = stack.append, stack.pop
+                    pc = 0
+                elif hasattr(klass, 'call'):
+                    push(klass.call(interp, args))
+                else:
+                    raise IceRuntimeError('Target "baru" bukan kelas yang dapat diinstansiasi.')
+            elif op == MAKE_SCOPE:
+                push(Environment(env, consts[arg]))
+            elif op == SUPER_GET:
+                push(self._super_get(env, names[arg]))
+            elif op == MAKE_FUNCTION:
+                push(self._make_function(consts[arg], env))
+            elif op == MAKE_CLASS:
+                push(self._make_class(consts[arg], env))
+            elif op == IMPORT:
+                push(interp.import_module(consts[arg]))
+            elif op == FAIL:
+                raise IceRuntimeError(consts[arg])
+            else:
+                raise IceRuntimeError(f"Opcode tidak dikenal: {op}")
+
+    def _make_function(self, proto: FunctionProto, env: Environment) -> IceFunction:
+        return IceFunction(proto.name, proto.params, None, env, proto.layout, VMCode(self, proto.code), proto.is_method)
+
+    def _make_class(self, proto: ClassProto, env: Environment) -> IceClass:
+        methods = {m.name: self._make_function(m, env) for m in proto.methods}
+        superclass = None
+        if proto.superclass is not None:
+            sc = env.get(proto.superclass)
+            if not isinstance(sc, IceClass):
+                raise IceRuntimeError('Superclass harus berupa kelas.')
+            superclass = sc
+        klass = IceClass(proto.name, methods, superclass)
+        for fn in methods.values():
+            fn.owner = klass
+        return klass
+
+    def _call(self, f: Any, args: list[Any], inst: Any) -> Any:
+        # panggilan di luar frame VM ini (builtin, kelas, tugas engine lain)
+        if hasattr(f, "call"):
+            try:
+                arity = f.arity()
+            except Exception:
+                arity = -1
+            if arity >= 0 and len(args) != arity:
+                raise IceRuntimeError(f"Jumlah argumen tidak cocok. Diharapkan {arity}, diberi {len(args)}.")
+            return f.call(self.interpreter, args) if inst is _UNSET else f.call(self.interpreter, args, inst)
+        raise IceRuntimeError("Objek tidak dapat dipanggil sebagai fungsi.")
+
+    def _super_get(self, env: Environment, name: str):
+        inst = env.get('ini')
+        try:
+            klass = env.get('__class__')
+        except Exception:
+            klass = inst.klass
+        if klass.superclass is None:
+            raise IceRuntimeError("Tidak ada superclass untuk 'super'.")
+        m = klass.superclass.find_method(name)
+        if not m:
+            raise IceRuntimeError(f"Method '{name}' tidak ditemukan pada superclass.")
+        return m.bind(inst)
+
+class VMInterpreter(Interpreter):
+    # Interpreter dengan backend bytecode + stack VM.
+    def __init__(self, builtins: dict[str, Any] | None = None, limits: Limits | None = None):
+        super().__init__(builtins, limits)
+        self.vm = VM(self)
+
+    def run(self, statements: list[Stmt] | CodeObject):
+        # CodeObject: bytecode yang sudah dikompilasi sebelumnya (ice_lang.Engine)
+        if not statements:
+            return
+        co = statements if isinstance(statements, CodeObject) else BytecodeCompiler().compile_program(statements)
+        self.vm.run(co, self.env)
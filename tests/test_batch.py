@@ -0,0 +1,22 @@
+import pytest
+from ice_lang import cli
+from ice_lang.ast import Binary
+from ice_lang.batch import run_one
+from ice_lang.optimizer import _all_nodes
+
+# run-many menjalankan setiap berkas utuh: dengan atau tanpa cache, global
+# dipercaya typecheck sehingga spesialisasi Binary.num sama.
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_run_one_percaya_global_dengan_dan_tanpa_cache(tmp_path, monkeypatch, use_cache):
+    path = tmp_path / "prog.ice"
+    path.write_text("bilangan a = 2;\nbilangan b = a * 3 + a;\ntampilkan(b);\n")
+    specialized = []
+    original = cli.run_program
+    def run_program(program, **kw):
+        specialized.append(sum(1 for n in _all_nodes(program) if type(n) is Binary and n.num))
+        return original(program, **kw)
+    monkeypatch.setattr(cli, "run_program", run_program)
+    result = run_one(str(path), {"engine": "tree", "limits": None, "use_cache": use_cache,
+                                 "optimize": False, "check_types": False})
+    assert result["status"] == "ok" and result["output"] == "8\n"
+    assert specialized == [2]
@@ -0,0 +1,27 @@
+import io
+import pytest
+from ice_lang import Engine
+from ice_lang.cli import run_source
+from ice_lang.engine import ENGINES
+
+# Regresi: tipe hasil builtin (panjang -> bilangan) tidak boleh diasumsikan bila
+# namanya bisa ditimpa dari luar program yang sedang diperiksa.
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_repl_builtin_ditimpa_input_sebelumnya(engine):
+    interp = ENGINES[engine]()
+    out = io.StringIO()
+    interp.output.stream = out
+    run_source('tugas panjang(x) { kembalikan "a"; }\n', use_env=interp, engine=engine)
+    run_source('tampilkan(panjang(1) + 1);\n', use_env=interp, engine=engine)
+    interp.output.flush()
+    assert out.getvalue() == "a1\n"
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engine_menolak_global_yang_menimpa_builtin(engine):
+    program = Engine(backend=engine).compile('tampilkan(panjang("ab") + n);')
+    with pytest.raises(ValueError, match="panjang"):
+        program.run(globals={"panjang": lambda *a: "a"})
+    out = io.StringIO()
+    program.run(globals={"n": 1}, stdout=out)  # nama lain tetap boleh
+    assert out.getvalue() == "3\n"
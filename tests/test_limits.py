@@ -0,0 +1,32 @@
+import subprocess, sys
+import pytest
+from ice_lang import Engine, Limits
+from ice_lang.errors import DepthLimitError
+
+DEEP = """
+tugas f(n) { jika (n < 1) { kembalikan 0; } kembalikan 1 + f(n - 1); }
+bilangan h = f(30000);
+"""
+
+# max_depth besar tidak boleh menaikkan batas rekursi Python sampai CPython
+# crash (SIGSEGV di 3.10); yang diharapkan DepthLimitError. Dijalankan di proses
+# terpisah agar crash terlihat sebagai kode keluar, bukan mematikan pytest.
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+def test_max_depth_besar_berakhir_depth_limit_error(engine):
+    code = (f"from ice_lang import Engine, Limits\n"
+            f"from ice_lang.errors import DepthLimitError\n"
+            f"try:\n"
+            f"    Engine(backend={engine!r}, limits=Limits(max_depth=200000)).run({DEEP!r})\n"
+            f"except DepthLimitError:\n"
+            f"    print('DepthLimitError')\n")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "DepthLimitError"
+
+def test_max_depth_besar_di_vm_tetap_jalan():
+    hasil = Engine(backend="vm", limits=Limits(max_depth=200000)).run(DEEP)
+    assert hasil["h"] == 30000
+
+def test_max_depth_kecil_tetap_dipakai():
+    with pytest.raises(DepthLimitError, match="50"):
+        Engine(limits=Limits(max_depth=50)).run(DEEP)
@@ -0,0 +1,56 @@
+import io
+from ice_lang import Engine, cli
+from ice_lang.cache import compile_source
+from ice_lang.engine import ENGINES
+from ice_lang.optimizer import Optimizer
+
+N = 50000
+
+def run_vm(source: str, optimize: bool) -> str:
+    program = compile_source(source, Optimizer() if optimize else None)
+    interp = ENGINES["vm"]()
+    out = io.StringIO()
+    interp.output.stream = out
+    interp.interpret(program)
+    return out.getvalue()
+
+# Rantai '+' hasil generator: `-O` tidak boleh gagal (RecursionError) di tempat
+# yang tanpa -O berjalan di engine vm.
+def test_rantai_panjang_dengan_optimizer():
+    source = "bilangan a = 1;\nbilangan h = " + " + ".join(["a"] * N) + ";\ntampilkan(h);\n"
+    assert run_vm(source, True) == run_vm(source, False) == f"{N}\n"
+
+def test_rantai_literal_dilipat():
+    source = "tampilkan(" + " + ".join(["1"] * N) + ");\n"
+    assert run_vm(source, True) == f"{N}\n"
+
+def test_rantai_panjang_invarian_di_loop():
+    chain = " + ".join(["x"] * N)
+    source = ('teks x = "q";\nbilangan t = 0;\n'
+              f'untuk i dalam rentang(3) {{ teks s = "a" + {chain}; t = t + panjang(s); }}\n'
+              'tampilkan(t);\n')
+    assert run_vm(source, True) == run_vm(source, False) == f"{3 * (N + 1)}\n"
+
+HOIST = 'teks a = "x";\nbilangan n = 0;\nuntuk i dalam rentang(5) { jika (a + "y" == "xy") { n = n + 1; } }\n'
+
+# Variabel sementara hasil pengangkatan ($invN) tidak boleh terlihat sebagai
+# global program.
+def test_variabel_sementara_tidak_diekspor():
+    engine = Engine(optimize=True)
+    assert engine.compile(HOIST).statements[2].name.startswith("$inv")
+    assert engine.run(HOIST) == Engine().run(HOIST) == {"a": "x", "n": 5, "i": 4}
+
+def test_variabel_sementara_tidak_tersisa_di_repl(monkeypatch, capsys):
+    inputs = iter([HOIST.replace("\n", " "), "tampilkan(n);", "keluar"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+    envs, hoisted = [], []
+    original = cli.run_source
+    def run_source(src, use_env=None, **kw):
+        original(src, use_env=use_env, **kw)
+        envs.append(use_env)
+        hoisted.extend(k for k in use_env.globals.values if k.startswith("$inv"))
+    monkeypatch.setattr(cli, "run_source", run_source)
+    cli.repl(optimize=True)
+    assert capsys.readouterr().out.splitlines()[-1] == "5"
+    assert hoisted  # pengangkatan memang terjadi
+    assert not any(k.startswith("$inv") for k in envs[-1].globals.values)
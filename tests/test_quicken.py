@@ -0,0 +1,32 @@
+from ice_lang import Engine
+from ice_lang.ast import Call, Get
+from ice_lang.optimizer import _all_nodes
+from ice_lang.runtime import IceClass, IceFunction
+
+SOURCE = """
+kelas A {
+    tugas __init__() { ini.x = 1; }
+    tugas m() { kembalikan ini.x; }
+    properti p { get { kembalikan ini.x; } }
+}
+tugas f(n) { kembalikan n + 1; }
+bilangan a = baru A();
+bilangan s = 0;
+untuk i dalam rentang(50) { s = s + f(i) + a.m() + a.p + panjang("ab"); }
+"""
+
+# Site hidup di AST yang dipakai bersama semua run Program: spesialisasinya harus
+# bertahan lintas run dan tidak menahan objek run sebelumnya.
+def test_site_tetap_cepat_lintas_run():
+    program = Engine(backend="tree").compile(SOURCE)
+    for _ in range(7):
+        assert program.run()["s"] == sum(i + 1 + 1 + 1 + 2 for i in range(50))
+    sites = [n.site for n in _all_nodes(program.statements)
+             if type(n) in (Call, Get) and n.site is not None and n.site.count >= 8]
+    assert sites
+    for site in sites:
+        assert site.quick is not None and site.deopts == 0
+        for held in (site.quick, site.seen):
+            assert not isinstance(held, (IceFunction, IceClass))
+    stats = program.quickening()
+    assert stats["panggil"]["deopt"] == 0 and stats["properti"]["deopt"] == 0